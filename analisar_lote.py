@@ -0,0 +1,140 @@
+"""Análise em lote, sem janela: resume todas as planilhas de uma pasta ou glob.
+
+Uso:
+    python analisar_lote.py C:\\Exportacoes --saida resumos
+    python analisar_lote.py "exportacoes/**/*.csv" --formato csv --processos 8
+
+Cada arquivo gera um resumo (JSON ou CSV, uma linha por coluna) em --saida,
+mais um índice geral (indice.json / indice.csv). Usa o mesmo motor e o
+mesmo cache da tela "Análise de Planilha".
+"""
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+EXTENSOES = ('.csv', '.xlsx', '.xls')
+
+def listar_arquivos(entradas, recursivo=False):
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            if recursivo:
+                for pasta, _, nomes in os.walk(entrada):
+                    arquivos += [os.path.join(pasta, n) for n in nomes]
+            else:
+                arquivos += [os.path.join(entrada, n) for n in os.listdir(entrada)]
+        else:
+            arquivos += glob.glob(entrada, recursive=True)
+    vistos = set()
+    unicos = []
+    for caminho in sorted(arquivos):
+        caminho = os.path.abspath(caminho)
+        if caminho.lower().endswith(EXTENSOES) and os.path.isfile(caminho) and caminho not in vistos:
+            vistos.add(caminho)
+            unicos.append(caminho)
+    return unicos
+
+def _nome_saida(caminho, base, formato):
+    # inclui o caminho relativo para não colidir (loja1/vendas.csv x loja2/vendas.csv)
+    relativo = os.path.relpath(caminho, base) if base else os.path.basename(caminho)
+    return relativo.replace(os.sep, '__').replace('/', '__') + f'.{formato}'
+
+def _gravar_resumo(relatorio, destino, formato):
+    if formato == 'json':
+        with open(destino, 'w', encoding='utf-8') as f:
+            json.dump(relatorio.para_dict(), f, ensure_ascii=False, indent=2)
+        return
+    from analise.agregados import EstatColuna
+
+    colunas = relatorio.resumo.para_dict()['colunas'] if relatorio.resumo is not None else []
+    # cabeçalho tirado do próprio para_dict: uma chave nova não quebra o CSV
+    campos = list(EstatColuna('', 'object').para_dict())
+    with open(destino, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=campos)
+        escritor.writeheader()
+        escritor.writerows(colunas)
+
+def analisar_um(caminho, destino, formato, opcoes, usar_cache):
+    """Roda no processo filho; devolve a entrada do índice (nunca levanta)."""
+    from analise import motor
+
+    inicio = time.perf_counter()
+    entrada = {'arquivo': caminho, 'saida': destino}
+    try:
+        if usar_cache:
+            relatorio = motor.analisar_com_cache(caminho, paralelo=False, **opcoes)
+        else:
+            relatorio = motor.analisar_arquivo(caminho, paralelo=False, **opcoes)
+        if relatorio.resumo is None:
+            raise ValueError(relatorio.linhas[0])
+        _gravar_resumo(relatorio, destino, formato)
+        entrada.update(status='ok', linhas=relatorio.resumo.linhas, colunas=len(relatorio.resumo.colunas),
+                       exato=relatorio.resumo.exato, do_cache=relatorio.do_cache)
+    except Exception as e:
+        entrada.update(status='erro', erro=f'{type(e).__name__}: {e}')
+    entrada['segundos'] = round(time.perf_counter() - inicio, 3)
+    return entrada
+
+def gravar_indice(entradas, pasta, formato):
+    caminho = os.path.join(pasta, f'indice.{formato}')
+    if formato == 'json':
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(entradas, f, ensure_ascii=False, indent=2)
+    else:
+        campos = ['arquivo', 'status', 'linhas', 'colunas', 'exato', 'do_cache', 'segundos', 'saida', 'erro']
+        with open(caminho, 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.DictWriter(f, fieldnames=campos)
+            escritor.writeheader()
+            escritor.writerows(entradas)
+    return caminho
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('entradas', nargs='+', help='pastas e/ou padrões glob (ex.: "dados/**/*.xlsx")')
+    parser.add_argument('--saida', default='resumos', help='pasta dos resumos e do índice')
+    parser.add_argument('--formato', choices=('json', 'csv'), default='json')
+    parser.add_argument('--processos', type=int, default=os.cpu_count(), help='padrão: todos os núcleos')
+    parser.add_argument('--recursivo', action='store_true', help='desce nas subpastas das pastas informadas')
+    parser.add_argument('--compacto', action='store_true', help='carga com tipos enxutos (ver analise.compacto)')
+    parser.add_argument('--colunas', nargs='*', help='lê apenas estas colunas')
+    parser.add_argument('--sem-cache', action='store_true', help='ignora e não alimenta o cache em disco')
+    args = parser.parse_args(argv)
+
+    arquivos = listar_arquivos(args.entradas, args.recursivo)
+    if not arquivos:
+        print('Nenhuma planilha (.csv/.xlsx/.xls) encontrada.')
+        return 1
+
+    os.makedirs(args.saida, exist_ok=True)
+    base = os.path.commonpath(arquivos) if len(arquivos) > 1 else os.path.dirname(arquivos[0])
+    opcoes = {'compacto': args.compacto, 'colunas': args.colunas or None}
+
+    inicio = time.perf_counter()
+    entradas = []
+    # um arquivo por processo; as abas de cada Excel ficam no mesmo processo
+    with ProcessPoolExecutor(max_workers=max(1, args.processos)) as executor:
+        futuros = [executor.submit(analisar_um, caminho,
+                                   os.path.join(args.saida, _nome_saida(caminho, base, args.formato)),
+                                   args.formato, opcoes, not args.sem_cache)
+                   for caminho in arquivos]
+        for i, futuro in enumerate(as_completed(futuros), 1):
+            entrada = futuro.result()
+            entradas.append(entrada)
+            marca = 'ok ' if entrada['status'] == 'ok' else 'ERRO'
+            print(f'[{i}/{len(arquivos)}] {marca} {entrada["arquivo"]} ({entrada["segundos"]} s)', flush=True)
+
+    entradas.sort(key=lambda e: e['arquivo'])
+    indice = gravar_indice(entradas, args.saida, args.formato)
+    falhas = sum(e['status'] != 'ok' for e in entradas)
+    print(f'{len(entradas) - falhas} ok, {falhas} com erro em {time.perf_counter() - inicio:.1f} s. Índice: {indice}')
+    return 1 if falhas else 0
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
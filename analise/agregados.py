@@ -0,0 +1,290 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from analise.sketches import K_QUANTIS, PRECISAO_HLL, Histograma, SketchDistintos, SketchQuantis
+
+# =====================
+# Agregados por coluna (mescláveis)
+# =====================
+def _fmt(v):
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return 'n/d'
+    return round(float(v), 2)
+
+def _eh_numerico(tipo):
+    return tipo.startswith(('int', 'uint', 'float', 'Int', 'UInt', 'Float'))
+
+def _bits(tipo):
+    digitos = ''.join(ch for ch in tipo if ch.isdigit())
+    return int(digitos) if digitos else 64
+
+def _mesclar_tipo(a, b):
+    if a == b:
+        return a
+    if a.startswith('int') and b.startswith('int') or a.startswith('uint') and b.startswith('uint'):
+        return max(a, b, key=_bits)  # blocos compactados podem sair int8 num e int16 noutro
+    if _eh_numerico(a) and _eh_numerico(b):
+        return 'float64'
+    return 'object'
+
+
+class EstatColuna:
+    """Contagem, nulos, min, max, soma e soma dos quadrados de uma coluna,
+    mais sketches de valores distintos (HLL), quantis (KLL) e histograma (se numérica)."""
+
+    __slots__ = ('nome', 'tipo', 'linhas', 'nulos', 'n_num', 'minimo', 'maximo', 'soma', 'soma_quad',
+                 'distintos', 'quantis', 'histograma')
+
+    def __init__(self, nome, tipo, k_quantis=K_QUANTIS, precisao_hll=PRECISAO_HLL):
+        self.nome = nome
+        self.tipo = tipo
+        self.linhas = 0
+        self.nulos = 0
+        self.n_num = 0
+        self.minimo = None
+        self.maximo = None
+        self.soma = 0.0
+        self.soma_quad = 0.0
+        self.distintos = SketchDistintos(precisao_hll)
+        self.quantis = SketchQuantis(k_quantis)
+        self.histograma = Histograma()
+
+    @property
+    def numerica(self):
+        return _eh_numerico(self.tipo) and self.n_num > 0
+
+    @property
+    def media(self):
+        return self.soma / self.n_num if self.n_num else None
+
+    @property
+    def desvio(self):
+        if self.n_num < 2:
+            return None
+        var = (self.soma_quad - self.soma * self.soma / self.n_num) / (self.n_num - 1)
+        return math.sqrt(max(0.0, var))
+
+    def _acumular_num(self, n, minimo, maximo, soma, soma_quad):
+        if not n:
+            return
+        self.n_num += n
+        self.soma += soma
+        self.soma_quad += soma_quad
+        self.minimo = minimo if self.minimo is None else min(self.minimo, minimo)
+        self.maximo = maximo if self.maximo is None else max(self.maximo, maximo)
+
+    def _limpar_num(self):
+        self.n_num, self.minimo, self.maximo, self.soma, self.soma_quad = 0, None, None, 0.0, 0.0
+        self.quantis = SketchQuantis(self.quantis.k)
+        self.histograma = Histograma()
+
+    def para_dict(self):
+        return {'nome': self.nome, 'tipo': self.tipo, 'linhas': self.linhas, 'nulos': self.nulos,
+                'numericos': self.n_num, 'min': self.minimo, 'max': self.maximo,
+                'media': self.media, 'desvio': self.desvio,
+                'distintos_aprox': self.distintos.estimativa(),
+                **dict(zip(('p50', 'p90', 'p99'), self.quantis.quantis((0.5, 0.9, 0.99))))}
+
+    def mesclar(self, outra):
+        self.tipo = _mesclar_tipo(self.tipo, outra.tipo)
+        self.linhas += outra.linhas
+        self.nulos += outra.nulos
+        self.distintos.mesclar(outra.distintos)
+        if _eh_numerico(self.tipo):
+            self._acumular_num(outra.n_num, outra.minimo, outra.maximo, outra.soma, outra.soma_quad)
+            self.quantis.mesclar(outra.quantis)
+            self.histograma.mesclar(outra.histograma)
+        else:
+            self._limpar_num()
+        return self
+
+
+FORMATOS_DATA = ('ISO8601', '%d/%m/%Y', '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S')
+AMOSTRA_DATA = 50   # valores testados para decidir se uma coluna de texto é de datas
+
+def formato_data(serie):
+    """Formato com que a coluna vira data (None se nativa datetime), ou False se não é data."""
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return None
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype('object')
+    if not (serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype)):
+        return False
+    amostra = serie.dropna().head(AMOSTRA_DATA).astype(str)
+    if not len(amostra) or not amostra.str.contains(r'\d[-/]\d', regex=True).all():
+        return False
+    for formato in FORMATOS_DATA:
+        if pd.to_datetime(amostra, errors='coerce', format=formato).notna().all():
+            return formato
+    return False
+
+def para_datas(serie, formato=None):
+    """Converte a coluna para datetime com o formato achado por `formato_data`."""
+    if formato is None:
+        return serie
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype('object')
+    return pd.to_datetime(serie, errors='coerce', format=formato)
+
+
+class SerieDiaria:
+    """Linhas e somas das colunas numéricas por dia de uma coluna de datas (mesclável).
+
+    Guarda uma linha por dia, então o tamanho depende do período e não do arquivo.
+    """
+
+    def __init__(self, coluna, formato=None):
+        self.coluna = coluna
+        self.formato = formato
+        self.dias = pd.DataFrame()   # índice: dia; colunas: '__linhas__' + numéricas
+
+    def atualizar(self, df, num):
+        dias = para_datas(df[self.coluna], self.formato).dt.floor('D')
+        bloco = num.astype('float64').groupby(dias).sum()
+        bloco.insert(0, '__linhas__', dias.value_counts().reindex(bloco.index, fill_value=0).astype('float64'))
+        return self._somar(bloco)
+
+    def _somar(self, bloco):
+        self.dias = bloco if self.dias.empty else self.dias.add(bloco, fill_value=0)
+        return self
+
+    def mesclar(self, outra):
+        return self._somar(outra.dias)
+
+    def series(self):
+        """[(nome, dias como datetime64, valores)] em ordem cronológica; '__linhas__' vem primeiro."""
+        dias = self.dias.sort_index()
+        colunas = ['__linhas__'] + [c for c in dias.columns if c != '__linhas__']
+        return [(col, dias.index.to_numpy(), dias[col].to_numpy()) for col in colunas if col in dias]
+
+
+class ResumoTabela:
+    """Resumo de uma tabela montado bloco a bloco, com memória fixa.
+
+    `atualizar(df)` soma um DataFrame (um bloco do CSV, uma aba inteira...)
+    aos agregados; `mesclar(outro)` junta resumos de blocos, abas ou arquivos.
+    `k_quantis` e `precisao_hll` definem o erro dos sketches (e a memória).
+    """
+
+    def __init__(self, exato=True, k_quantis=K_QUANTIS, precisao_hll=PRECISAO_HLL):
+        self.colunas = {}
+        self.linhas = 0
+        self.exato = exato
+        self.k_quantis = k_quantis
+        self.precisao_hll = precisao_hll
+        self.serie = None              # SerieDiaria da 1ª coluna de datas, se houver
+        self._data_testada = False
+
+    def _nova_coluna(self, nome, tipo):
+        return EstatColuna(nome, tipo, self.k_quantis, self.precisao_hll)
+
+    def atualizar(self, df):
+        n = len(df)
+        self.linhas += n
+        nulos = df.isna().sum()
+        num = df.select_dtypes(include='number')
+        if not num.empty:
+            contagens = num.count()
+            minimos, maximos = num.min(), num.max()
+            somas = num.sum()
+            somas_quad = (num.astype('float64') ** 2).sum()
+
+        for col, tipo in df.dtypes.astype(str).items():
+            bloco = self._nova_coluna(str(col), tipo)
+            bloco.linhas = n
+            bloco.nulos = int(nulos[col])
+            bloco.distintos.atualizar(df[col])
+            if col in num.columns:
+                bloco._acumular_num(int(contagens[col]), float(minimos[col]), float(maximos[col]),
+                                    float(somas[col]), float(somas_quad[col]))
+                valores = num[col].to_numpy(dtype='float64', na_value=np.nan)
+                bloco.quantis.atualizar(valores)
+                bloco.histograma.atualizar(valores)
+            self._mesclar_coluna(bloco)
+        self._atualizar_serie(df, num)
+        return self
+
+    def _atualizar_serie(self, df, num):
+        if not self._data_testada and len(df):
+            self._data_testada = True   # decide uma vez, no primeiro bloco com linhas
+            for col in df.columns:
+                formato = formato_data(df[col])
+                if formato is not False:
+                    self.serie = SerieDiaria(col, formato)
+                    break
+        if self.serie is not None and self.serie.coluna in df.columns and len(df):
+            self.serie.atualizar(df, num)
+
+    def _mesclar_coluna(self, estat):
+        atual = self.colunas.get(estat.nome)
+        if atual is None:
+            self.colunas[estat.nome] = estat
+        else:
+            atual.mesclar(estat)
+
+    def mesclar(self, outro):
+        self.linhas += outro.linhas
+        self.exato = self.exato and outro.exato
+        if outro.serie is not None:
+            if self.serie is None and not self.colunas:
+                self.serie = SerieDiaria(outro.serie.coluna, outro.serie.formato)
+                self._data_testada = True
+            if self.serie is not None and self.serie.coluna == outro.serie.coluna:
+                self.serie.mesclar(outro.serie)
+        for estat in outro.colunas.values():
+            copia = self._nova_coluna(estat.nome, estat.tipo)
+            copia.mesclar(estat)
+            self._mesclar_coluna(copia)
+        return self
+
+    def para_dict(self):
+        return {'linhas': self.linhas, 'exato': self.exato,
+                'colunas': [c.para_dict() for c in self.colunas.values()]}
+
+    # ---------------- Relatório ----------------
+    def linhas_relatorio(self, nome_aba=None):
+        linhas = []
+        if nome_aba:
+            linhas.append(f'🗂️  Aba analisada: {nome_aba}')
+        linhas.append(f'🔢 Dimensão: {self.linhas:,} linhas x {len(self.colunas):,} colunas'.replace(',', '.'))
+        if self.exato:
+            linhas.append('✔️ Valores exatos (arquivo completo).')
+        else:
+            linhas.append('🔎 Valores amostrados (apenas parte das linhas foi lida).')
+
+        cols = list(self.colunas)
+        linhas.append('🧾 Colunas: ' + (', '.join(cols[:8]) + ('...' if len(cols) > 8 else '')))
+
+        tipos = [(c.nome, c.tipo) for c in self.colunas.values()]
+        linhas.append('🔠 Tipos (amostra): ' + ', '.join([f'{k}:{v}' for k, v in tipos[:8]])
+                      + ('...' if len(tipos) > 8 else ''))
+
+        nulos = sorted(self.colunas.values(), key=lambda c: c.nulos, reverse=True)
+        top_nulos = [(c.nome, c.nulos) for c in nulos[:8] if c.nulos > 0]
+        if top_nulos:
+            linhas.append('⚠️ Nulos (top 8): ' + ', '.join([f'{c}:{n}' for c, n in top_nulos]))
+        else:
+            linhas.append('✅ Sem valores nulos.')
+
+        if self.colunas:
+            erro = next(iter(self.colunas.values())).distintos.erro_relativo
+            distintos = [f'{c.nome}:{c.distintos.estimativa():,}'.replace(',', '.') for c in self.colunas.values()]
+            linhas.append(f'🔑 Distintos (≈, erro ±{erro:.1%}): ' + ', '.join(distintos[:8])
+                          + ('...' if len(distintos) > 8 else ''))
+
+        numericas = [c for c in self.colunas.values() if c.numerica]
+        if numericas:
+            erro = numericas[0].quantis.erro_rank
+            linhas.append(f'📊 Numéricas (percentis ≈, erro de posição ±{erro:.1%}):')
+            for c in numericas[:5]:
+                p50, p90, p99 = (_fmt(q) for q in c.quantis.quantis((0.5, 0.9, 0.99)))
+                linhas.append(f'  • {c.nome} -> min:{_fmt(c.minimo)}, média:{_fmt(c.media)}, '
+                              f'p50:{p50}, p90:{p90}, p99:{p99}, max:{_fmt(c.maximo)}')
+
+        if self.serie is not None and not self.serie.dias.empty:
+            dias = self.serie.dias.index
+            linhas.append(f'📅 Série diária por "{self.serie.coluna}": {len(dias):,} dias '
+                          f'({dias.min():%d/%m/%Y} a {dias.max():%d/%m/%Y})'.replace(',', '.'))
+        return linhas
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import pickle
+
+# =====================
+# Cache de resultados em disco
+# =====================
+VERSAO_CACHE = 6                   # mude quando o formato do relatório mudar
+BLOCO_IMPRESSAO = 64 * 1024        # bytes lidos do início e do fim do arquivo
+LIMITE_PADRAO = 64 * 1024 * 1024   # 64 MB
+
+def pasta_padrao():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'maria_pitanga', 'analises')
+
+def impressao_digital(caminho, opcoes=None):
+    """Chave do arquivo: caminho, tamanho, mtime e hash do primeiro e último bloco."""
+    st = os.stat(caminho)
+    h = hashlib.sha1()
+    opcoes = sorted((opcoes or {}).items())
+    h.update(f'{VERSAO_CACHE}|{os.path.abspath(caminho)}|{st.st_size}|{st.st_mtime_ns}|{opcoes}'.encode())
+    with open(caminho, 'rb') as f:
+        h.update(f.read(BLOCO_IMPRESSAO))
+        if st.st_size > BLOCO_IMPRESSAO:
+            f.seek(max(BLOCO_IMPRESSAO, st.st_size - BLOCO_IMPRESSAO))
+            h.update(f.read(BLOCO_IMPRESSAO))
+    return h.hexdigest()
+
+
+class CacheResultados:
+    """Guarda resultados serializados em disco, com limite de tamanho e descarte LRU.
+
+    O mtime de cada entrada marca o último acesso; ao passar do limite, as
+    entradas usadas há mais tempo são apagadas primeiro.
+    """
+
+    def __init__(self, pasta=None, limite_bytes=LIMITE_PADRAO):
+        self.pasta = pasta or pasta_padrao()
+        self.limite_bytes = limite_bytes
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, f'{chave}.pkl')
+
+    def obter(self, chave):
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as f:
+                valor = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._remover(caminho)  # entrada corrompida ou de versão antiga
+            return None
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        return valor
+
+    def guardar(self, chave, valor):
+        try:
+            os.makedirs(self.pasta, exist_ok=True)
+            caminho = self._caminho(chave)
+            temporario = f'{caminho}.{os.getpid()}.tmp'
+            with open(temporario, 'wb') as f:
+                pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, caminho)
+            self._podar()
+        except OSError as e:
+            print(f'Cache indisponível: {e}')
+
+    def limpar(self):
+        for nome, _, _ in self._entradas():
+            self._remover(os.path.join(self.pasta, nome))
+
+    def _entradas(self):
+        try:
+            nomes = [n for n in os.listdir(self.pasta) if n.endswith('.pkl')]
+        except FileNotFoundError:
+            return []
+        entradas = []
+        for nome in nomes:
+            try:
+                st = os.stat(os.path.join(self.pasta, nome))
+            except OSError:
+                continue
+            entradas.append((nome, st.st_mtime, st.st_size))
+        return entradas
+
+    def _podar(self):
+        entradas = sorted(self._entradas(), key=lambda e: e[1])
+        total = sum(e[2] for e in entradas)
+        for nome, _, tamanho in entradas:
+            if total <= self.limite_bytes:
+                break
+            self._remover(os.path.join(self.pasta, nome))
+            total -= tamanho
+
+    @staticmethod
+    def _remover(caminho):
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
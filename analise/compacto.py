@@ -0,0 +1,79 @@
+import pandas as pd
+
+# =====================
+# Carga compacta (tipos enxutos)
+# =====================
+AMOSTRA_LINHAS = 20_000   # linhas usadas para inferir os tipos
+FRACAO_CATEGORIA = 0.5    # texto com até 50% de valores distintos vira categoria
+
+def _eh_texto(serie):
+    return (not isinstance(serie.dtype, pd.CategoricalDtype)
+            and (serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype)))
+
+def colunas_categoricas(amostra):
+    """Colunas de texto repetitivo (produto, loja, pagamento) para ler como `category`."""
+    categoricas = []
+    for col in amostra.columns:
+        serie = amostra[col]
+        if _eh_texto(serie):
+            validos = serie.count()
+            if validos and serie.nunique(dropna=True) <= max(1, FRACAO_CATEGORIA * validos):
+                categoricas.append(col)
+    return categoricas
+
+def compactar_df(df, categoricas=()):
+    """Reduz inteiros ao menor tipo que cabe e converte texto repetitivo em categoria.
+
+    Floats ficam em float64 para não perder centavos nas somas e médias.
+    """
+    for col in df.select_dtypes(include='integer').columns:
+        serie = df[col]
+        df[col] = pd.to_numeric(serie, downcast='unsigned' if len(serie) and serie.min() >= 0 else 'integer')
+    for col in categoricas:
+        if col in df.columns and _eh_texto(df[col]):
+            df[col] = df[col].astype('category')
+    return df
+
+def _bytes(df):
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+class MemoriaCarga:
+    """Memória para manter os dados carregados: padrão (estimada pela amostra) x compacta (medida).
+
+    Guarda só números, para poder voltar dos processos filhos e ir para o cache.
+    """
+
+    def __init__(self, amostra=None):
+        self.padrao_por_linha = _bytes(amostra) / len(amostra) if amostra is not None and len(amostra) else 0.0
+        self.linhas = 0
+        self.compacta = 0
+
+    def somar(self, df):
+        self.linhas += len(df)
+        self.compacta += _bytes(df)
+
+    def mesclar(self, outra):
+        padrao = self.padrao + outra.padrao
+        self.linhas += outra.linhas
+        self.compacta += outra.compacta
+        self.padrao_por_linha = padrao / self.linhas if self.linhas else 0.0
+        return self
+
+    @property
+    def padrao(self):
+        return self.padrao_por_linha * self.linhas
+
+    def linha_relatorio(self):
+        mb = 1024 * 1024
+        economia = (1 - self.compacta / self.padrao) * 100 if self.padrao else 0.0
+        return (f'🧠 Memória: padrão ≈{self.padrao / mb:.1f} MB -> compacta {self.compacta / mb:.1f} MB'
+                f' ({economia:.0f}% menos)')
+
+def preparar(ler_amostra):
+    """Lê a amostra com tipos padrão e devolve (categóricas, MemoriaCarga).
+
+    `ler_amostra(n)` devolve as n primeiras linhas, já só com as colunas pedidas.
+    """
+    amostra = ler_amostra(AMOSTRA_LINHAS)
+    return colunas_categoricas(amostra), MemoriaCarga(amostra)
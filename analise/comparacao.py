@@ -0,0 +1,201 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from analise import motor
+from analise.agregados import ResumoTabela
+from analise.tarefas import TarefaCancelada
+
+# =====================
+# Comparação de vários arquivos (resumos mescláveis lado a lado)
+# =====================
+MAX_COLUNAS_COMPARADAS = 8   # colunas listadas em nulos e em numéricas
+ROTULOS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+def _sem_progresso(etapa, fracao):
+    pass
+
+def _nunca_cancelado():
+    return False
+
+def _fmt(v):
+    return 'n/d' if v is None or v != v else round(float(v), 2)
+
+def _milhar(n):
+    return f'{n:,}'.replace(',', '.')
+
+def _variacao(base, valor):
+    if base is None or valor is None or base == 0:
+        return ''
+    return f' ({(valor - base) / abs(base):+.1%})'
+
+def _rotulo(i):
+    return ROTULOS[i] if i < len(ROTULOS) else f'#{i + 1}'
+
+
+class Comparacao:
+    """Relatórios de vários arquivos, as diferenças entre eles e o total combinado.
+
+    O total sai de `ResumoTabela.mesclar` sobre os resumos já calculados: nada
+    é relido. O primeiro arquivo é a base das variações.
+    """
+
+    def __init__(self, relatorios):
+        self.relatorios = list(relatorios)
+        self.total = ResumoTabela()
+        for r in self.relatorios:
+            if r.resumo is not None:
+                self.total.mesclar(r.resumo)
+
+    def _resumos(self):
+        return [(_rotulo(i), r.resumo) for i, r in enumerate(self.relatorios) if r.resumo is not None]
+
+    def linhas_relatorio(self):
+        linhas = [f'📑 Comparação de {len(self.relatorios)} arquivos (variações sobre A)']
+        for i, r in enumerate(self.relatorios):
+            origem = ' ⚡ cache' if r.do_cache else ''
+            erro = '' if r.resumo is not None else f' — {r.linhas[0] if r.linhas else "sem resumo"}'
+            linhas.append(f'  {_rotulo(i)} = {os.path.basename(r.caminho)}{origem}{erro}')
+        resumos = self._resumos()
+        if len(resumos) < 2:
+            return linhas + ['', 'São precisos ao menos dois arquivos com resumo para comparar.']
+
+        _, base = resumos[0]
+        linhas += ['', '🔢 Linhas: ' + ' | '.join(
+            f'{rotulo} {_milhar(r.linhas)}{_variacao(base.linhas, r.linhas) if r is not base else ""}'
+            for rotulo, r in resumos)]
+        linhas += self._linhas_colunas(resumos)
+        linhas += self._linhas_nulos(resumos)
+        linhas += self._linhas_numericas(resumos)
+
+        linhas += ['', f'📘 Total combinado ({len(resumos)} arquivos)']
+        linhas += self.total.linhas_relatorio()
+        return linhas
+
+    def _linhas_colunas(self, resumos):
+        rotulo_base, base = resumos[0]
+        linhas = ['🧾 Colunas: ' + ' | '.join(f'{rotulo} {len(r.colunas)}' for rotulo, r in resumos)]
+        for rotulo, r in resumos[1:]:
+            novas = [c for c in r.colunas if c not in base.colunas]
+            ausentes = [c for c in base.colunas if c not in r.colunas]
+            if novas:
+                linhas.append(f'  ➕ Só em {rotulo}: {", ".join(novas)}')
+            if ausentes:
+                linhas.append(f'  ➖ Faltam em {rotulo}: {", ".join(ausentes)}')
+        for nome, estat in base.colunas.items():
+            tipos = [(rotulo, r.colunas[nome].tipo) for rotulo, r in resumos if nome in r.colunas]
+            if len({tipo for _, tipo in tipos}) > 1:
+                linhas.append(f'  🔁 Tipo de "{nome}": ' + ' | '.join(f'{rotulo} {tipo}' for rotulo, tipo in tipos))
+        if len(linhas) == 1:
+            linhas.append(f'  ✅ Mesmas colunas e tipos de {rotulo_base} em todos os arquivos.')
+        return linhas
+
+    def _linhas_nulos(self, resumos):
+        def fracao(r, nome):
+            c = r.colunas.get(nome)
+            return c.nulos / c.linhas if c is not None and c.linhas else None
+
+        nomes = list(dict.fromkeys(nome for _, r in resumos for nome in r.colunas))
+        fracoes = {nome: [fracao(r, nome) for _, r in resumos] for nome in nomes}
+        com_nulos = [nome for nome in nomes if any(f for f in fracoes[nome])]
+        if not com_nulos:
+            return ['✅ Sem valores nulos em nenhum arquivo.']
+        # colunas cuja proporção de nulos mais mudou primeiro
+        def amplitude(nome):
+            valores = [f for f in fracoes[nome] if f is not None]
+            return max(valores) - min(valores)
+        com_nulos.sort(key=amplitude, reverse=True)
+
+        linhas = ['⚠️ Nulos (% das linhas):']
+        for nome in com_nulos[:MAX_COLUNAS_COMPARADAS]:
+            base = fracoes[nome][0]
+            partes = []
+            for j, ((rotulo, _), f) in enumerate(zip(resumos, fracoes[nome])):
+                if f is None:
+                    partes.append(f'{rotulo} —')
+                elif base is None or j == 0:
+                    partes.append(f'{rotulo} {f:.1%}')
+                else:
+                    partes.append(f'{rotulo} {f:.1%} ({(f - base) * 100:+.1f} p.p.)')
+            linhas.append(f'  • {nome} -> ' + ' | '.join(partes))
+        return linhas
+
+    def _linhas_numericas(self, resumos):
+        _, base = resumos[0]
+        nomes = [nome for nome, c in base.colunas.items()
+                 if c.numerica and sum(1 for _, r in resumos if nome in r.colunas and r.colunas[nome].numerica) > 1]
+        if not nomes:
+            return []
+        medidas = (('média', lambda c: c.media), ('p50', lambda c: c.quantis.quantis((0.5,))[0]),
+                   ('máx', lambda c: c.maximo), ('soma', lambda c: c.soma))
+        linhas = ['📊 Numéricas (p50 ≈):']
+        for nome in nomes[:MAX_COLUNAS_COMPARADAS]:
+            linhas.append(f'  • {nome}')
+            for medida, valor in medidas:
+                ref = valor(base.colunas[nome])
+                partes = []
+                for rotulo, r in resumos:
+                    c = r.colunas.get(nome)
+                    if c is None or not c.numerica:
+                        partes.append(f'{rotulo} —')
+                        continue
+                    v = valor(c)
+                    partes.append(f'{rotulo} {_fmt(v)}' + (_variacao(ref, v) if r is not base else ''))
+                linhas.append(f'      {medida}: ' + ' | '.join(partes))
+        return linhas
+
+
+def _analisar_um(caminho, anterior, compacto, progresso, cancelado):
+    if (anterior is not None and anterior.estado_csv is not None
+            and anterior.estado_csv.compacto == compacto):
+        # CSV já resumido nesta sessão: lê só as linhas anexadas desde então
+        return motor.atualizar_csv(anterior, progresso=progresso, cancelado=cancelado)
+    # as abas de cada arquivo ficam na mesma thread: o paralelismo aqui é entre arquivos
+    return motor.analisar_com_cache(caminho, progresso=progresso, cancelado=cancelado,
+                                    compacto=compacto, paralelo=False)
+
+def comparar_arquivos(caminhos, progresso=None, cancelado=None, anteriores=None, compacto=False,
+                      trabalhadores=None):
+    """Analisa os arquivos ao mesmo tempo (pool de threads) e devolve a `Comparacao`.
+
+    `anteriores` ({caminho: Relatorio}) evita reler o que já foi resumido. Um
+    arquivo que falha entra como `Relatorio` sem resumo, com o erro na 1ª linha.
+    """
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+    anteriores = anteriores or {}
+
+    fracoes = [0.0] * len(caminhos)
+    def progresso_de(i):
+        def _progresso(etapa, fracao):
+            fracoes[i] = fracao
+        return _progresso
+
+    resultados = [None] * len(caminhos)
+    executor = ThreadPoolExecutor(max_workers=trabalhadores or min(len(caminhos), os.cpu_count() or 1))
+    try:
+        pendentes = {executor.submit(_analisar_um, caminho, anteriores.get(caminho), compacto,
+                                     progresso_de(i), cancelado): i
+                     for i, caminho in enumerate(caminhos)}
+        while pendentes:
+            if cancelado():
+                raise TarefaCancelada()
+            prontos, _ = wait(pendentes, timeout=0.1, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                i = pendentes.pop(futuro)
+                try:
+                    resultados[i] = futuro.result()
+                except TarefaCancelada:
+                    raise
+                except Exception as e:
+                    # um arquivo ilegível não derruba a comparação: vira uma linha de erro
+                    resultados[i] = motor.Relatorio(caminhos[i], [f'Erro: {type(e).__name__}: {e}'])
+                fracoes[i] = 1.0
+            feitos = len(caminhos) - len(pendentes)
+            progresso(f'Analisando arquivos ({feitos}/{len(caminhos)})', 0.95 * sum(fracoes) / len(caminhos))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)  # as análises checam `cancelado` e param logo
+
+    progresso('Comparando resumos', 0.97)
+    comparacao = Comparacao(resultados)
+    progresso('Concluído', 1.0)
+    return comparacao
@@ -0,0 +1,345 @@
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import unicodedata
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from analise.cache import pasta_padrao
+from analise.tarefas import TarefaCancelada
+
+# =====================
+# Índice invertido de documentos (SQLite) com ranking BM25
+# =====================
+# Cada pasta tem o seu banco: docs (caminho, mtime, tamanho, nº de termos)
+# e postings (termo, doc, frequência). Atualizar compara mtime e tamanho e
+# só retokeniza o que mudou; a tokenização roda em processos separados.
+VERSAO_INDICE = 1
+EXTENSOES_DOC = ('.txt', '.csv', '.tsv', '.md', '.log', '.json', '.xml', '.html')
+TAMANHO_MAX = 64 * 1024 * 1024    # arquivos maiores são ignorados
+MIN_PARA_PROCESSOS = 8            # abaixo disso tokeniza na própria thread
+ARQUIVOS_POR_LOTE = 16            # arquivos por envio ao processo filho
+DOCS_POR_SEGMENTO = 512           # documentos gravados juntos (uma linha por termo no segmento)
+MAX_SEGMENTOS = 16                # acima disso os segmentos são compactados num só
+TIPO_DOC = np.dtype('<i8')
+TIPO_TF = np.dtype('<i4')
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_RESULTADOS = 50
+LARGURA_TRECHO = 160
+BYTES_TRECHO = 1024 * 1024        # o trecho só procura no começo do arquivo
+
+_PALAVRA = re.compile(r'\w\w+')
+
+def _sem_progresso(etapa, fracao):
+    pass
+
+def _nunca_cancelado():
+    return False
+
+def normalizar(texto):
+    """Minúsculas e sem acentos: 'Feijão' e 'feijao' viram o mesmo termo."""
+    if texto.isascii():
+        return texto.lower()
+    texto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+def tokenizar(texto):
+    return _PALAVRA.findall(normalizar(texto))
+
+def _ler_texto(caminho, limite=None):
+    with open(caminho, 'rb') as f:
+        dados = f.read() if limite is None else f.read(limite)
+    try:
+        return dados.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if limite is not None and e.start >= len(dados) - 3:
+            return dados[:e.start].decode('utf-8')  # o limite cortou um caractere ao meio
+        return dados.decode('cp1252', errors='replace')  # exportações antigas do Windows
+
+def _tokenizar_arquivos(arquivos):
+    """Roda no processo filho: [(caminho, mtime_ns, tamanho)] -> [(..., nº de termos, frequências)]."""
+    saida = []
+    for caminho, mtime_ns, tamanho in arquivos:
+        try:
+            frequencias = Counter(tokenizar(_ler_texto(caminho)))
+        except OSError:
+            continue  # sumiu ou ficou ilegível entre a listagem e a leitura
+        saida.append((caminho, mtime_ns, tamanho, sum(frequencias.values()), frequencias))
+    return saida
+
+def _juntar(linhas):
+    """(termo, docs, tfs) de vários segmentos -> arrays de ids e frequências."""
+    docs, tfs = [], []
+    for _, d, t in linhas:
+        docs.append(np.frombuffer(d, dtype=TIPO_DOC))
+        tfs.append(np.frombuffer(t, dtype=TIPO_TF))
+    return np.concatenate(docs), np.concatenate(tfs)
+
+def listar_documentos(pasta):
+    """{caminho: (mtime_ns, tamanho)} dos arquivos de texto da pasta (recursivo)."""
+    arquivos = {}
+    for raiz, _, nomes in os.walk(pasta):
+        for nome in nomes:
+            if not nome.lower().endswith(EXTENSOES_DOC):
+                continue
+            caminho = os.path.join(raiz, nome)
+            try:
+                st = os.stat(caminho)
+            except OSError:
+                continue
+            if st.st_size <= TAMANHO_MAX:
+                arquivos[caminho] = (st.st_mtime_ns, st.st_size)
+    return arquivos
+
+def caminho_banco(pasta):
+    chave = hashlib.sha1(os.path.abspath(pasta).encode()).hexdigest()[:16]
+    return os.path.join(os.path.dirname(pasta_padrao()), 'documentos', f'{chave}.sqlite')
+
+
+class Resultado:
+    def __init__(self, caminho, pontuacao, termos, mtime_ns=None):
+        self.caminho = caminho
+        self.pontuacao = pontuacao
+        self.termos = termos   # termos da consulta presentes no documento
+        self.mtime_ns = mtime_ns   # da indexação: identifica a versão do arquivo (cache de trechos)
+
+
+class IndiceDocumentos:
+    """Índice invertido persistente de uma pasta; `atualizar` é incremental, `buscar` ranqueia por BM25.
+
+    Cada gravação vira um segmento: uma linha por termo com os ids e as
+    frequências dos documentos em blobs (uma linha por posting deixaria o
+    SQLite com milhões de linhas). Documento alterado ou apagado sai só de
+    `docs`; os postings dele ficam mortos até `compactar` juntar os segmentos.
+    """
+
+    def __init__(self, pasta, banco=None):
+        self.pasta = os.path.abspath(pasta)
+        self.banco = banco or caminho_banco(self.pasta)
+        if self.banco != ':memory:':
+            os.makedirs(os.path.dirname(self.banco), exist_ok=True)
+        # criado na thread da tarefa e consultado na do pygame, nunca ao mesmo tempo
+        self.con = sqlite3.connect(self.banco, check_same_thread=False)
+        self.con.execute('PRAGMA journal_mode=WAL')
+        self.con.execute('PRAGMA synchronous=NORMAL')
+        self._criar_tabelas()
+        self._comprimentos = None   # nº de termos por id de documento (0 = apagado)
+        self._n_docs = 0            # documentos vivos e comprimento médio (BM25)
+        self._media = 0.0
+
+    def _criar_tabelas(self):
+        versao = self.con.execute('PRAGMA user_version').fetchone()[0]
+        if versao != VERSAO_INDICE:
+            self.con.executescript('DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS segmentos; '
+                                   'DROP TABLE IF EXISTS docs;')
+        # AUTOINCREMENT: id de documento apagado nunca é reaproveitado (postings mortos seguem mortos)
+        self.con.executescript(f'''
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, caminho TEXT UNIQUE NOT NULL,
+                mtime_ns INTEGER NOT NULL, tamanho INTEGER NOT NULL, comprimento INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS segmentos (id INTEGER PRIMARY KEY AUTOINCREMENT);
+            CREATE TABLE IF NOT EXISTS postings (
+                termo TEXT NOT NULL, segmento INTEGER NOT NULL, docs BLOB NOT NULL, tfs BLOB NOT NULL,
+                PRIMARY KEY (termo, segmento)) WITHOUT ROWID;
+            PRAGMA user_version = {VERSAO_INDICE};
+        ''')
+
+    def fechar(self):
+        self.con.close()
+
+    @property
+    def total_documentos(self):
+        return self.con.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+
+    @property
+    def total_segmentos(self):
+        return self.con.execute('SELECT COUNT(*) FROM segmentos').fetchone()[0]
+
+    # ---------------- Atualização ----------------
+    def _gravar_segmento(self, tokenizados):
+        """Grava os documentos como um novo segmento, numa transação."""
+        if not tokenizados:
+            return
+        with self.con:
+            self.con.executemany('DELETE FROM docs WHERE caminho = ?', [(t[0],) for t in tokenizados])
+            segmento = self.con.execute('INSERT INTO segmentos DEFAULT VALUES').lastrowid
+            por_termo = {}
+            for caminho, mtime_ns, tamanho, comprimento, frequencias in tokenizados:
+                doc = self.con.execute(
+                    'INSERT INTO docs (caminho, mtime_ns, tamanho, comprimento) VALUES (?, ?, ?, ?)',
+                    (caminho, mtime_ns, tamanho, comprimento)).lastrowid
+                for termo, tf in frequencias.items():
+                    lista = por_termo.get(termo)
+                    if lista is None:
+                        lista = por_termo[termo] = ([], [])
+                    lista[0].append(doc)
+                    lista[1].append(tf)
+            self.con.executemany(
+                'INSERT INTO postings (termo, segmento, docs, tfs) VALUES (?, ?, ?, ?)',
+                [(termo, segmento, np.array(docs, dtype=TIPO_DOC).tobytes(), np.array(tfs, dtype=TIPO_TF).tobytes())
+                 for termo, (docs, tfs) in sorted(por_termo.items())])
+        self._comprimentos = None
+
+    def compactar(self):
+        """Junta todos os segmentos num só, descartando postings de documentos apagados."""
+        self._carregar_comprimentos()
+        vivos = self._comprimentos > 0
+        with self.con:
+            linhas = self.con.execute('SELECT termo, docs, tfs FROM postings').fetchall()  # em ordem de termo
+            self.con.execute('DELETE FROM postings')
+            self.con.execute('DELETE FROM segmentos')
+            segmento = self.con.execute('INSERT INTO segmentos DEFAULT VALUES').lastrowid
+            novas = []
+            for termo, grupo in groupby(linhas, key=itemgetter(0)):
+                docs, tfs = _juntar(grupo)
+                manter = vivos[docs]
+                if manter.any():
+                    novas.append((termo, segmento, docs[manter].tobytes(), tfs[manter].tobytes()))
+            self.con.executemany('INSERT INTO postings (termo, segmento, docs, tfs) VALUES (?, ?, ?, ?)', novas)
+
+    def _tokenizados(self, pendentes, cancelado, processos):
+        """Gera (arquivos do lote, documentos tokenizados); em processos filhos quando vale a pena."""
+        lotes = [pendentes[i:i + ARQUIVOS_POR_LOTE] for i in range(0, len(pendentes), ARQUIVOS_POR_LOTE)]
+        if len(pendentes) < MIN_PARA_PROCESSOS:
+            for lote in lotes:
+                if cancelado():
+                    raise TarefaCancelada()
+                yield len(lote), _tokenizar_arquivos(lote)
+            return
+        executor = ProcessPoolExecutor(max_workers=min(len(lotes), processos or os.cpu_count() or 1))
+        try:
+            futuros = {executor.submit(_tokenizar_arquivos, lote): len(lote) for lote in lotes}
+            while futuros:
+                if cancelado():
+                    raise TarefaCancelada()
+                prontos, _ = wait(futuros, timeout=0.1, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    yield futuros.pop(futuro), futuro.result()
+        finally:
+            # no cancelamento não espera os lotes que ainda estão na fila
+            executor.shutdown(wait=not cancelado(), cancel_futures=True)
+
+    def atualizar(self, progresso=None, cancelado=None, processos=None):
+        """Reindexa só arquivos novos ou alterados (mtime/tamanho) e tira os apagados.
+
+        Devolve (novos ou alterados, removidos, inalterados).
+        """
+        progresso = progresso or _sem_progresso
+        cancelado = cancelado or _nunca_cancelado
+
+        progresso('Listando arquivos', 0.0)
+        atuais = listar_documentos(self.pasta)
+        indexados = {caminho: (doc, mtime_ns, tamanho) for doc, caminho, mtime_ns, tamanho
+                     in self.con.execute('SELECT id, caminho, mtime_ns, tamanho FROM docs')}
+        removidos = [doc for caminho, (doc, _, _) in indexados.items() if caminho not in atuais]
+        pendentes = [(caminho, mtime_ns, tamanho) for caminho, (mtime_ns, tamanho) in sorted(atuais.items())
+                     if indexados.get(caminho, (None,))[1:] != (mtime_ns, tamanho)]
+        with self.con:
+            self.con.executemany('DELETE FROM docs WHERE id = ?', [(doc,) for doc in removidos])
+        self._comprimentos = None
+
+        acumulados, feitos = [], 0
+        try:
+            if pendentes:
+                progresso(f'Indexando {len(pendentes)} arquivos', 0.05)
+            for n, tokenizados in self._tokenizados(pendentes, cancelado, processos):
+                acumulados += tokenizados
+                feitos += n
+                if len(acumulados) >= DOCS_POR_SEGMENTO:
+                    self._gravar_segmento(acumulados)
+                    acumulados = []
+                progresso(f'Indexando ({feitos}/{len(pendentes)})', 0.05 + 0.85 * feitos / len(pendentes))
+        finally:
+            self._gravar_segmento(acumulados)  # mesmo cancelado, o que já foi lido fica no índice
+        if self.total_segmentos > MAX_SEGMENTOS:
+            progresso('Compactando índice', 0.95)
+            self.compactar()
+        progresso('Concluído', 1.0)
+        return len(pendentes), len(removidos), len(atuais) - len(pendentes)
+
+    # ---------------- Busca ----------------
+    def _carregar_comprimentos(self):
+        """Comprimento de cada documento vivo, indexado pelo id (vetor para o BM25)."""
+        linhas = self.con.execute('SELECT id, comprimento FROM docs').fetchall()
+        maior = max((doc for doc, _ in linhas), default=0)
+        self._comprimentos = np.zeros(maior + 1, dtype=np.float64)
+        if linhas:
+            ids, comprimentos = np.array(linhas, dtype=np.int64).T
+            self._comprimentos[ids] = comprimentos
+        self._n_docs = len(linhas)
+        self._media = float(self._comprimentos.sum()) / max(1, len(linhas))
+
+    def buscar(self, consulta, limite=MAX_RESULTADOS):
+        """Documentos que contêm algum termo da consulta, do mais para o menos relevante (BM25)."""
+        termos = list(dict.fromkeys(tokenizar(consulta)))
+        if not termos:
+            return []
+        if self._comprimentos is None:
+            self._carregar_comprimentos()
+        if not self._n_docs:
+            return []
+        pontos = np.zeros(len(self._comprimentos))
+        presentes = np.zeros((len(termos), len(self._comprimentos)), dtype=bool)
+        normalizacao = BM25_K1 * (1 - BM25_B + BM25_B * self._comprimentos / max(self._media, 1e-9))
+        for i, termo in enumerate(termos):
+            linhas = self.con.execute('SELECT termo, docs, tfs FROM postings WHERE termo = ?', (termo,)).fetchall()
+            if not linhas:
+                continue
+            docs, tf = _juntar(linhas)
+            vivos = docs < len(self._comprimentos)
+            vivos[vivos] = self._comprimentos[docs[vivos]] > 0   # postings de apagados ficam de fora
+            docs, tf = docs[vivos], tf[vivos]
+            if not len(docs):
+                continue
+            idf = math.log(1 + (self._n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            pontos[docs] += idf * tf * (BM25_K1 + 1) / (tf + normalizacao[docs])
+            presentes[i, docs] = True
+
+        candidatos = np.flatnonzero(pontos)
+        if len(candidatos) > limite:
+            candidatos = candidatos[np.argpartition(pontos[candidatos], -limite)[-limite:]]
+        candidatos = candidatos[np.argsort(pontos[candidatos])[::-1]]
+        docs = {doc: (caminho, mtime_ns) for doc, caminho, mtime_ns in self.con.execute(
+            f'SELECT id, caminho, mtime_ns FROM docs WHERE id IN ({",".join("?" * len(candidatos))})',
+            [int(d) for d in candidatos])} if len(candidatos) else {}
+        return [Resultado(docs[d][0], float(pontos[d]), [t for i, t in enumerate(termos) if presentes[i, d]], docs[d][1])
+                for d in candidatos.tolist() if d in docs]
+
+
+def trecho(caminho, termos, largura=LARGURA_TRECHO):
+    """Primeira linha do arquivo com algum dos termos, cortada em volta da ocorrência."""
+    if not termos:
+        return ''
+    try:
+        texto = _ler_texto(caminho, limite=BYTES_TRECHO)
+    except OSError:
+        return ''
+    padrao = re.compile(r'\b(' + '|'.join(map(re.escape, termos)) + r')\b')
+    for linha in texto.splitlines():
+        if not padrao.search(normalizar(linha)):
+            continue
+        linha = ' '.join(linha.split())
+        normal = normalizar(linha)
+        achado = padrao.search(normal)
+        if len(normal) != len(linha):
+            return linha[:largura]  # a normalização mudou o comprimento: sem centralizar
+        inicio = max(0, achado.start() - largura // 3)
+        return ('…' if inicio else '') + linha[inicio:inicio + largura]
+    return ''
+
+def indexar_pasta(pasta, progresso=None, cancelado=None):
+    """Para a Tarefa: abre (ou cria) o índice da pasta e o atualiza; devolve (índice, contagens)."""
+    indice = IndiceDocumentos(pasta)
+    try:
+        contagens = indice.atualizar(progresso=progresso, cancelado=cancelado)
+    except BaseException:
+        indice.fechar()
+        raise
+    return indice, contagens
@@ -0,0 +1,141 @@
+import csv
+import io
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from analise.tarefas import TarefaCancelada
+
+# =====================
+# Explorador de linhas do CSV (índice esparso + páginas sob demanda)
+# =====================
+# O índice guarda o offset em bytes de uma linha a cada LINHAS_POR_PAGINA;
+# uma página é lida com um seek e só as páginas recentes ficam na memória.
+# Linhas com quebra de linha dentro de aspas não são suportadas no índice.
+LINHAS_POR_PAGINA = 500
+BLOCO_INDICE = 1 << 20     # bytes lidos por vez ao montar o índice
+MAX_PAGINAS = 16           # páginas no cache LRU
+
+def _sem_progresso(etapa, fracao):
+    pass
+
+def _nunca_cancelado():
+    return False
+
+
+class IndiceCSV:
+    """Offsets de início das linhas 0, N, 2N... (N = `passo`), sem contar o cabeçalho."""
+
+    def __init__(self, caminho, offsets, total_linhas, fim, colunas, passo=LINHAS_POR_PAGINA):
+        self.caminho = caminho
+        self.offsets = offsets          # np.int64, um por página
+        self.total_linhas = total_linhas
+        self.fim = fim                  # tamanho do arquivo quando o índice foi montado
+        self.colunas = colunas
+        self.passo = passo
+        self._assinatura = _assinatura(caminho)
+
+    def continua_valido(self):
+        return _assinatura(self.caminho) == self._assinatura
+
+    def faixa(self, pagina):
+        """Bytes [inicio, fim) da página."""
+        inicio = int(self.offsets[pagina])
+        fim = int(self.offsets[pagina + 1]) if pagina + 1 < len(self.offsets) else self.fim
+        return inicio, fim
+
+
+def _assinatura(caminho):
+    try:
+        st = os.stat(caminho)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+def _decodificar(dados):
+    return dados.decode('utf-8', errors='replace')
+
+def indexar_csv(caminho, passo=LINHAS_POR_PAGINA, progresso=None, cancelado=None):
+    """Varre o arquivo uma vez contando '\\n' (vetorizado) e devolve um `IndiceCSV`."""
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+
+    tamanho = os.path.getsize(caminho)
+    with open(caminho, 'rb') as f:
+        cabecalho = f.readline()
+        colunas = next(csv.reader([_decodificar(cabecalho).lstrip('﻿')]), [])
+        inicio_dados = f.tell()
+        partes = [np.array([inicio_dados], dtype=np.int64)]
+        linhas = 0           # quebras de linha vistas depois do cabeçalho
+        pos = inicio_dados
+        while True:
+            if cancelado():
+                raise TarefaCancelada()
+            bloco = f.read(BLOCO_INDICE)
+            if not bloco:
+                break
+            quebras = np.flatnonzero(np.frombuffer(bloco, dtype=np.uint8) == 10)
+            # a linha k começa logo após a quebra k-1; guardamos as que caem em múltiplos de `passo`
+            numeros = linhas + 1 + np.arange(len(quebras))
+            marcas = quebras[numeros % passo == 0]
+            if len(marcas):
+                partes.append(pos + marcas.astype(np.int64) + 1)
+            linhas += len(quebras)
+            pos += len(bloco)
+            progresso('Indexando linhas', pos / tamanho if tamanho else 1.0)
+
+    if tamanho > inicio_dados and pos > 0:
+        with open(caminho, 'rb') as f:
+            f.seek(tamanho - 1)
+            if f.read(1) != b'\n':
+                linhas += 1  # última linha sem '\n'
+    offsets = np.concatenate(partes)
+    offsets = offsets[offsets < tamanho] if linhas else offsets[:0]
+    return IndiceCSV(caminho, offsets, linhas, tamanho, colunas, passo)
+
+
+class PaginasCSV:
+    """Acesso aleatório às linhas de um CSV indexado, com cache LRU de páginas."""
+
+    def __init__(self, indice, max_paginas=MAX_PAGINAS):
+        self.indice = indice
+        self.max_paginas = max_paginas
+        self._paginas = OrderedDict()
+
+    @property
+    def colunas(self):
+        return self.indice.colunas
+
+    @property
+    def total_linhas(self):
+        return self.indice.total_linhas
+
+    def pagina(self, n):
+        linhas = self._paginas.get(n)
+        if linhas is None:
+            inicio, fim = self.indice.faixa(n)
+            with open(self.indice.caminho, 'rb') as f:
+                f.seek(inicio)
+                texto = _decodificar(f.read(fim - inicio))
+            linhas = list(csv.reader(io.StringIO(texto)))
+            self._paginas[n] = linhas
+            if len(self._paginas) > self.max_paginas:
+                self._paginas.popitem(last=False)
+        else:
+            self._paginas.move_to_end(n)
+        return linhas
+
+    def linhas(self, inicio, fim):
+        """Linhas [inicio, fim) como listas de textos (lê só as páginas necessárias)."""
+        inicio, fim = max(0, inicio), min(fim, self.total_linhas)
+        passo = self.indice.passo
+        resultado = []
+        n = inicio // passo
+        while inicio < fim:
+            pagina = self.pagina(n)
+            base = n * passo
+            resultado += pagina[inicio - base:fim - base]
+            n += 1
+            inicio = base + passo
+        return resultado
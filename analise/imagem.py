@@ -0,0 +1,195 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pygame
+
+from analise.tarefas import TarefaCancelada
+
+# =====================
+# Análise de imagem em blocos (vetorizada sobre pygame.surfarray)
+# =====================
+# Cada bloco vira um EstatImagem (mesclável, como o ResumoTabela): os
+# arrays temporários têm o tamanho do bloco e não da foto, e os blocos
+# rodam num pool de threads (o numpy solta o GIL nas contas pesadas).
+LADO_BLOCO = 512            # blocos de 512 x 512 px
+AMOSTRA_KMEANS = 20_000     # pixels (no máximo) usados no k-means
+K_CORES = 5
+ITERACOES_KMEANS = 20
+LADO_MINIATURA = 480
+LIMIAR_SOMBRA = 16          # luminância abaixo disso conta como sombra "estourada"
+LIMIAR_LUZ = 239
+PESOS_LUMA = (77, 150, 29)  # 0.299, 0.587, 0.114 em 1/256: luminância inteira, sem floats por pixel
+NIVEIS = np.arange(256, dtype=np.float64)
+
+def _sem_progresso(etapa, fracao):
+    pass
+
+def _nunca_cancelado():
+    return False
+
+
+class EstatImagem:
+    """Histogramas por canal e de luminância e uma amostra de pixels (mesclável)."""
+
+    def __init__(self, passo_amostra=1):
+        self.passo_amostra = passo_amostra
+        self.pixels = 0
+        self.hist = np.zeros((3, 256), dtype=np.int64)
+        self.hist_luma = np.zeros(256, dtype=np.int64)
+        self.amostra = np.empty((0, 3), dtype=np.uint8)
+
+    def atualizar(self, bloco):
+        """`bloco`: array (largura, altura, 3) uint8 de pygame.surfarray."""
+        px = bloco.reshape(-1, 3)
+        self.pixels += len(px)
+        luma = np.zeros(len(px), dtype=np.uint16)
+        for c in range(3):
+            canal = px[:, c]
+            self.hist[c] += np.bincount(canal, minlength=256)
+            luma += canal.astype(np.uint16) * PESOS_LUMA[c]
+        self.hist_luma += np.bincount(luma >> 8, minlength=256)
+        self.amostra = np.concatenate((self.amostra, px[::self.passo_amostra]))
+        return self
+
+    def mesclar(self, outra):
+        self.pixels += outra.pixels
+        self.hist += outra.hist
+        self.hist_luma += outra.hist_luma
+        self.amostra = np.concatenate((self.amostra, outra.amostra))
+        return self
+
+    # médias e desvios saem dos histogramas: nada de somar pixel a pixel de novo
+    @property
+    def cor_media(self):
+        return tuple(int(round(v)) for v in self.hist @ NIVEIS / max(1, self.pixels))
+
+    @property
+    def brilho(self):
+        return float(self.hist_luma @ NIVEIS) / max(1, self.pixels)
+
+    @property
+    def contraste(self):
+        """Contraste RMS: desvio padrão da luminância."""
+        if self.pixels < 2:
+            return 0.0
+        var = float(self.hist_luma @ NIVEIS ** 2) / self.pixels - self.brilho ** 2
+        return float(np.sqrt(max(0.0, var)))
+
+    def percentil_luma(self, q):
+        acumulado = np.cumsum(self.hist_luma)
+        return int(np.searchsorted(acumulado, q * acumulado[-1]))
+
+
+def kmeans(pontos, k=K_CORES, iteracoes=ITERACOES_KMEANS, semente=0):
+    """Lloyd vetorizado com início k-means++; devolve (centros, fração de pontos de cada um)."""
+    pontos = np.asarray(pontos, dtype=np.float64)
+    if not len(pontos):
+        return np.empty((0, 3)), np.empty(0)
+    rng = np.random.default_rng(semente)
+    k = min(k, len(np.unique(pontos, axis=0)))
+    centros = [pontos[rng.integers(len(pontos))]]
+    for _ in range(1, k):
+        d2 = ((pontos[:, None, :] - np.array(centros)[None]) ** 2).sum(axis=2).min(axis=1)
+        centros.append(pontos[rng.choice(len(pontos), p=d2 / d2.sum())])
+    centros = np.array(centros)
+
+    for _ in range(iteracoes):
+        rotulos = ((pontos[:, None, :] - centros[None]) ** 2).sum(axis=2).argmin(axis=1)
+        contagem = np.bincount(rotulos, minlength=k)
+        novos = np.stack([np.bincount(rotulos, weights=pontos[:, c], minlength=k) for c in range(3)], axis=1)
+        novos = np.where(contagem[:, None] > 0, novos / np.maximum(contagem, 1)[:, None], centros)
+        if np.allclose(novos, centros):
+            break
+        centros = novos
+    rotulos = ((pontos[:, None, :] - centros[None]) ** 2).sum(axis=2).argmin(axis=1)
+    fracoes = np.bincount(rotulos, minlength=k) / len(pontos)
+    ordem = np.argsort(fracoes)[::-1]
+    return centros[ordem], fracoes[ordem]
+
+
+class AnaliseImagem:
+    """Resultado da análise: estatísticas, cores dominantes e uma miniatura para a tela."""
+
+    def __init__(self, caminho, tamanho, blocos, estat, cores, fracoes, miniatura=None):
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self.blocos = blocos
+        self.estat = estat
+        self.cores = cores
+        self.fracoes = fracoes
+        self.miniatura = miniatura
+
+    def linhas_relatorio(self):
+        w, h = self.tamanho
+        e = self.estat
+        r, g, b = e.cor_media
+        linhas = [f'🖼️ Imagem: {_milhar(w)} x {_milhar(h)} px ({w * h / 1e6:.1f} MP), '
+                  f'{self.blocos} blocos de até {LADO_BLOCO}x{LADO_BLOCO}',
+                  f'🎨 Cor média: RGB({r}, {g}, {b}) #{r:02x}{g:02x}{b:02x}',
+                  f'💡 Brilho médio: {e.brilho:.1f} (0-255) | contraste (desvio): {e.contraste:.1f}',
+                  f'🌗 Faixa p5-p95 da luminância: {e.percentil_luma(0.05)}-{e.percentil_luma(0.95)} | '
+                  f'sombras (<{LIMIAR_SOMBRA}): {e.hist_luma[:LIMIAR_SOMBRA].sum() / max(1, e.pixels):.1%} | '
+                  f'luzes (>{LIMIAR_LUZ}): {e.hist_luma[LIMIAR_LUZ + 1:].sum() / max(1, e.pixels):.1%}']
+        if len(self.cores):
+            linhas.append(f'🎯 Cores dominantes (k-means, k={len(self.cores)}, '
+                          f'amostra de {_milhar(len(e.amostra))} px):')
+            for cor, fracao in zip(self.cores, self.fracoes):
+                r, g, b = (int(round(v)) for v in cor)
+                linhas.append(f'  • #{r:02x}{g:02x}{b:02x} RGB({r}, {g}, {b}) -> {fracao:.0%}')
+        return linhas
+
+
+def _milhar(n):
+    return f'{n:,}'.replace(',', '.')
+
+def _blocos(w, h, lado=LADO_BLOCO):
+    return [(x, y, min(lado, w - x), min(lado, h - y)) for y in range(0, h, lado) for x in range(0, w, lado)]
+
+def _miniatura(surface, lado=LADO_MINIATURA):
+    w, h = surface.get_size()
+    escala = min(1.0, lado / max(w, h))
+    return pygame.transform.smoothscale(surface, (max(1, int(w * escala)), max(1, int(h * escala))))
+
+def analisar_imagem(caminho, progresso=None, cancelado=None, trabalhadores=None):
+    """Carrega com pygame.image.load e analisa bloco a bloco num pool de threads."""
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+
+    progresso('Carregando imagem', 0.0)
+    surface = pygame.image.load(caminho)
+    if surface.get_bitsize() < 24:
+        rgb = pygame.Surface(surface.get_size(), 0, 24)  # paletas e tons de cinza viram RGB
+        rgb.blit(surface, (0, 0))
+        surface = rgb
+    w, h = surface.get_size()
+    miniatura = _miniatura(surface)
+
+    blocos = _blocos(w, h)
+    passo = max(1, (w * h) // AMOSTRA_KMEANS)   # mesma densidade de amostra em todos os blocos
+    pixels = pygame.surfarray.pixels3d(surface)  # visão sem cópia; cada bloco copia só o seu trecho
+
+    def _analisar_bloco(x, y, bw, bh):
+        return EstatImagem(passo).atualizar(np.ascontiguousarray(pixels[x:x + bw, y:y + bh]))
+
+    total = EstatImagem(passo)
+    executor = ThreadPoolExecutor(max_workers=trabalhadores or min(len(blocos), os.cpu_count() or 1))
+    try:
+        pendentes = {executor.submit(_analisar_bloco, *b) for b in blocos}
+        feitos = 0
+        while pendentes:
+            if cancelado():
+                raise TarefaCancelada()
+            prontos, pendentes = wait(pendentes, timeout=0.1, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                total.mesclar(futuro.result())
+                feitos += 1
+            progresso(f'Analisando blocos ({feitos}/{len(blocos)})', 0.05 + 0.85 * feitos / len(blocos))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        del pixels  # destrava a surface
+
+    progresso('Agrupando cores (k-means)', 0.92)
+    cores, fracoes = kmeans(total.amostra[:AMOSTRA_KMEANS])
+    progresso('Concluído', 1.0)
+    return AnaliseImagem(caminho, (w, h), len(blocos), total, cores, fracoes, miniatura)
@@ -0,0 +1,175 @@
+import hashlib
+import io
+import os
+
+import pandas as pd
+
+from analise import compacto as _compacto
+from analise.agregados import ResumoTabela
+from analise.tarefas import TarefaCancelada
+
+# =====================
+# Leitura de CSV em blocos (completa ou incremental)
+# =====================
+LINHAS_POR_BLOCO = 100_000   # tamanho de cada bloco lido do CSV
+BYTES_ASSINATURA = 4096      # início do arquivo que identifica "o mesmo log"
+
+def _sem_progresso(etapa, fracao):
+    pass
+
+def _nunca_cancelado():
+    return False
+
+
+class _FaixaArquivo(io.RawIOBase):
+    """Expõe só os bytes [inicio, fim) de um arquivo aberto, como um arquivo binário."""
+
+    def __init__(self, f, inicio, fim):
+        super().__init__()
+        self._f = f
+        self._restante = max(0, fim - inicio)
+        f.seek(inicio)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self._restante)
+        if n <= 0:
+            return 0
+        dados = self._f.read(n)
+        buffer[:len(dados)] = dados
+        self._restante -= len(dados)
+        return len(dados)
+
+
+class EstadoCSV:
+    """Onde a última leitura parou: offset após a última linha completa e o
+    resumo até ali. Com isso a próxima análise lê só os bytes anexados."""
+
+    def __init__(self, offset, nomes, assinatura, resumo, categoricas=(), memoria=None, colunas=None):
+        self.offset = offset
+        self.nomes = nomes
+        self.assinatura = assinatura
+        self.resumo = resumo
+        self.categoricas = list(categoricas)
+        self.memoria = memoria
+        self.colunas = colunas
+
+    @property
+    def compacto(self):
+        return self.memoria is not None
+
+    def continua_valido(self, caminho):
+        """O arquivo só cresceu? (não encolheu e o início não foi reescrito)"""
+        try:
+            tamanho = os.path.getsize(caminho)
+            with open(caminho, 'rb') as f:
+                return tamanho >= self.offset and _assinatura(f, self.offset) == self.assinatura
+        except OSError:
+            return False
+
+
+def _assinatura(f, offset):
+    f.seek(0)
+    return hashlib.sha1(f.read(min(offset, BYTES_ASSINATURA))).hexdigest()
+
+def _fim_linhas_completas(f, tamanho):
+    """Posição logo após o último '\\n' (uma linha ainda sendo gravada fica de fora)."""
+    pos = tamanho
+    while pos > 0:
+        inicio = max(0, pos - 65536)
+        f.seek(inicio)
+        i = f.read(pos - inicio).rfind(b'\n')
+        if i >= 0:
+            return inicio + i + 1
+        pos = inicio
+    return 0
+
+def _resumir_faixa(f, inicio, fim, nomes=None, colunas=None, categoricas=(), memoria=None,
+                   amostra_linhas=None, progresso=_sem_progresso, cancelado=_nunca_cancelado,
+                   etapa='Lendo e agregando blocos'):
+    resumo = ResumoTabela(exato=amostra_linhas is None)
+    if fim <= inicio:
+        return resumo
+    faixa = io.BufferedReader(_FaixaArquivo(f, inicio, fim))
+    opcoes = {'header': None, 'names': nomes} if nomes is not None else {}
+    blocos = pd.read_csv(faixa, chunksize=min(LINHAS_POR_BLOCO, amostra_linhas or LINHAS_POR_BLOCO),
+                         nrows=amostra_linhas, usecols=colunas,
+                         dtype={c: 'category' for c in categoricas} or None, **opcoes)
+    try:
+        for bloco in blocos:
+            if cancelado():
+                raise TarefaCancelada()
+            if memoria is not None:
+                bloco = _compacto.compactar_df(bloco, categoricas)
+                memoria.somar(bloco)
+            resumo.atualizar(bloco)
+            progresso(etapa, 0.95 * min(1.0, (f.tell() - inicio) / (fim - inicio)))
+    except pd.errors.EmptyDataError:
+        pass
+    finally:
+        blocos.close()
+    return resumo
+
+def _copiar_memoria(memoria):
+    return None if memoria is None else _compacto.MemoriaCarga().mesclar(memoria)
+
+def resumir_csv(caminho, progresso=None, cancelado=None, amostra_linhas=None, compacto=False, colunas=None):
+    """Agrega o CSV bloco a bloco; a memória depende só de LINHAS_POR_BLOCO.
+
+    Devolve (ResumoTabela, MemoriaCarga ou None, EstadoCSV ou None). O estado
+    permite continuar com `continuar_csv` quando o arquivo só recebe linhas
+    no fim (não vale para leituras amostradas).
+    """
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+
+    categoricas, memoria = [], None
+    if compacto:
+        progresso('Inferindo tipos compactos', 0.0)
+        categoricas, memoria = _compacto.preparar(
+            lambda n: pd.read_csv(caminho, nrows=n, usecols=colunas))
+
+    with open(caminho, 'rb') as f:
+        tamanho = os.path.getsize(caminho)
+        fim = _fim_linhas_completas(f, tamanho)
+        if amostra_linhas is not None:
+            resumo = _resumir_faixa(f, 0, tamanho, colunas=colunas, categoricas=categoricas, memoria=memoria,
+                                    amostra_linhas=amostra_linhas, progresso=progresso, cancelado=cancelado)
+            return resumo, memoria, None
+
+        nomes = list(pd.read_csv(caminho, nrows=0).columns)
+        base = _resumir_faixa(f, 0, fim, colunas=colunas, categoricas=categoricas, memoria=memoria,
+                              progresso=progresso, cancelado=cancelado)
+        estado = EstadoCSV(fim, nomes, _assinatura(f, fim), base, categoricas, _copiar_memoria(memoria), colunas)
+        # última linha sem '\n': entra no relatório, mas não no estado
+        resto = _resumir_faixa(f, fim, tamanho, nomes=nomes if fim else None, colunas=colunas,
+                               categoricas=categoricas, memoria=memoria)
+    return ResumoTabela().mesclar(base).mesclar(resto), memoria, estado
+
+def continuar_csv(caminho, estado, progresso=None, cancelado=None):
+    """Lê só o que foi anexado desde `estado`; devolve (resumo, memória, novo estado, linhas novas).
+
+    O custo depende dos dados novos, não do tamanho do arquivo. Devolve None
+    se o arquivo não é mais o mesmo log (encolheu ou o início mudou).
+    """
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+    if estado is None or not estado.continua_valido(caminho):
+        return None
+
+    memoria = _copiar_memoria(estado.memoria)
+    with open(caminho, 'rb') as f:
+        tamanho = os.path.getsize(caminho)
+        fim = _fim_linhas_completas(f, tamanho)
+        novo = _resumir_faixa(f, estado.offset, fim, nomes=estado.nomes, colunas=estado.colunas,
+                              categoricas=estado.categoricas, memoria=memoria,
+                              progresso=progresso, cancelado=cancelado, etapa='Lendo linhas novas')
+        base = ResumoTabela().mesclar(estado.resumo).mesclar(novo)
+        # o prefixo assinado cresce com o offset enquanto o arquivo tem menos de BYTES_ASSINATURA
+        novo_estado = EstadoCSV(fim, estado.nomes, _assinatura(f, fim), base, estado.categoricas,
+                                _copiar_memoria(memoria), estado.colunas)
+        resto = _resumir_faixa(f, fim, tamanho, nomes=estado.nomes, colunas=estado.colunas,
+                               categoricas=estado.categoricas, memoria=memoria)
+    return ResumoTabela().mesclar(base).mesclar(resto), memoria, novo_estado, novo.linhas
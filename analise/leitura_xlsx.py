@@ -0,0 +1,323 @@
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta
+from xml.etree import ElementTree as ET
+
+import pandas as pd
+
+from analise import compacto as _compacto
+from analise.agregados import ResumoTabela
+from analise.tarefas import TarefaCancelada
+
+# =====================
+# Leitura de XLSX em fluxo (somente leitura, memória limitada)
+# =====================
+# Um .xlsx é um zip de XMLs. Em vez de montar a aba inteira num DataFrame,
+# percorremos o XML da planilha linha a linha e agregamos em lotes.
+LINHAS_POR_LOTE = 50_000   # linhas por DataFrame entregue ao ResumoTabela
+
+_REL_OFFICE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_REL_STRICT = 'http://purl.oclc.org/ooxml/officeDocument/relationships'
+_FORMATOS_DATA = set(range(14, 23)) | {45, 46, 47}   # formatos embutidos de data/hora
+_DATA_BASE = datetime(1899, 12, 30)                   # dia 0 do Excel (sistema 1900)
+_DATA_BASE_1904 = datetime(1904, 1, 1)                # dia 0 com date1904 (pastas vindas do Mac)
+
+def _sem_progresso(etapa, fracao):
+    pass
+
+def _nunca_cancelado():
+    return False
+
+def _local(tag):
+    """Nome da tag sem o namespace (vale para OOXML transicional e estrito)."""
+    return tag.rsplit('}', 1)[-1]
+
+def _texto(elem):
+    """Texto de <si>/<is>, inclusive texto rico (<r><t>...</t></r>)."""
+    return ''.join(t.text or '' for t in elem.iter() if _local(t.tag) == 't')
+
+
+class AbaXlsx:
+    """Metadados de uma aba: nome, XML dentro do zip e dimensão declarada."""
+
+    def __init__(self, nome, parte, linhas=None, colunas=None):
+        self.nome = nome
+        self.parte = parte
+        self.linhas = linhas    # None quando a aba não declara <dimension>
+        self.colunas = colunas
+
+    def descricao(self):
+        if self.linhas is None:
+            return self.nome
+        return f'{self.nome} ({self.linhas:,}x{self.colunas})'.replace(',', '.')
+
+
+def _indice_coluna(ref):
+    """'AB12' -> 27 (base zero)."""
+    n = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        n = n * 26 + (ord(ch.upper()) - 64)
+    return n - 1
+
+def _dimensao(z, parte):
+    """Lê só o início do XML da aba, até <dimension ref="A1:G10001">."""
+    with z.open(parte) as f:
+        for _, elem in ET.iterparse(f, events=('start',)):
+            nome = _local(elem.tag)
+            if nome == 'dimension':
+                ref = elem.get('ref', '')
+                inicio, _, fim = ref.partition(':')
+                fim = fim or inicio
+                linha_ini = int(re.sub(r'\D', '', inicio) or 1)
+                linha_fim = int(re.sub(r'\D', '', fim) or 1)
+                return linha_fim - linha_ini + 1, _indice_coluna(fim) - _indice_coluna(inicio) + 1
+            if nome == 'sheetData':
+                break
+    return None, None
+
+def ler_metadados(caminho):
+    """Abas (nome e dimensão) a partir do workbook.xml, sem ler nenhuma célula."""
+    with zipfile.ZipFile(caminho) as z:
+        alvos = {}
+        with z.open('xl/_rels/workbook.xml.rels') as f:
+            for rel in ET.parse(f).getroot():
+                alvo = rel.get('Target', '')
+                alvo = alvo.lstrip('/') if alvo.startswith('/') else posixpath.normpath(posixpath.join('xl', alvo))
+                alvos[rel.get('Id')] = alvo
+        abas = []
+        with z.open('xl/workbook.xml') as f:
+            for elem in ET.parse(f).getroot().iter():
+                if _local(elem.tag) != 'sheet':
+                    continue
+                rid = elem.get(f'{{{_REL_OFFICE}}}id') or elem.get(f'{{{_REL_STRICT}}}id')
+                parte = alvos.get(rid)
+                if parte is None or parte not in z.namelist():
+                    continue
+                linhas, colunas = _dimensao(z, parte)
+                abas.append(AbaXlsx(elem.get('name'), parte, linhas, colunas))
+    return abas
+
+def _strings_compartilhadas(z):
+    if 'xl/sharedStrings.xml' not in z.namelist():
+        return []
+    strings = []
+    with z.open('xl/sharedStrings.xml') as f:
+        for _, elem in ET.iterparse(f):
+            if _local(elem.tag) == 'si':
+                strings.append(_texto(elem))
+                elem.clear()
+    return strings
+
+def _eh_formato_data(codigo):
+    codigo = re.sub(r'"[^"]*"|\[[^\]]*\]|\\.', '', codigo or '')
+    return re.search(r'[dmyhs]', codigo, re.IGNORECASE) is not None
+
+def _estilos_data(z):
+    """Índices de estilo (atributo s das células) cujo formato é de data/hora."""
+    if 'xl/styles.xml' not in z.namelist():
+        return frozenset()
+    with z.open('xl/styles.xml') as f:
+        raiz = ET.parse(f).getroot()
+    personalizados = {}
+    estilos = []
+    for elem in raiz:
+        nome = _local(elem.tag)
+        if nome == 'numFmts':
+            for fmt in elem:
+                personalizados[int(fmt.get('numFmtId'))] = fmt.get('formatCode')
+        elif nome == 'cellXfs':
+            estilos = [int(xf.get('numFmtId', 0)) for xf in elem]
+    return frozenset(i for i, fmt in enumerate(estilos)
+                     if fmt in _FORMATOS_DATA or (fmt in personalizados and _eh_formato_data(personalizados[fmt])))
+
+def _data_base(z):
+    """Dia 0 das datas seriais: <workbookPr date1904="1"> muda o sistema de datas."""
+    with z.open('xl/workbook.xml') as f:
+        for _, elem in ET.iterparse(f, events=('start',)):
+            nome = _local(elem.tag)
+            if nome == 'workbookPr':
+                return _DATA_BASE_1904 if elem.get('date1904') in ('1', 'true') else _DATA_BASE
+            if nome == 'sheets':
+                break
+    return _DATA_BASE
+
+def _data(serial, base):
+    dia, fracao = divmod(serial, 1)
+    # arredonda em milissegundos: 12:30 não vira 12:30:00.000001 pelo erro do float
+    data = base + timedelta(days=dia, milliseconds=round(fracao * 86_400_000))
+    if base is _DATA_BASE and 0 < serial < 60:
+        data += timedelta(days=1)   # antes do 29/02/1900 fictício do Excel
+    return data
+
+def _numero(texto):
+    if '.' in texto or 'E' in texto or 'e' in texto:
+        return float(texto)
+    return int(texto)
+
+def _valor(celula, strings, datas, data_base=_DATA_BASE):
+    tipo = celula.get('t', 'n')
+    if tipo == 'inlineStr':
+        for filho in celula:
+            if _local(filho.tag) == 'is':
+                return _texto(filho)
+        return None
+    v = None
+    for filho in celula:
+        if _local(filho.tag) == 'v':
+            v = filho.text
+            break
+    if v is None:
+        return None
+    if tipo == 'n':
+        numero = _numero(v)
+        if datas and int(celula.get('s', 0)) in datas:
+            return _data(numero, data_base)
+        return numero
+    if tipo == 's':
+        return strings[int(v)]
+    if tipo == 'b':
+        return v == '1'
+    if tipo == 'd':
+        return pd.Timestamp(v)
+    if tipo == 'e':
+        return None   # #N/D, #DIV/0!... contam como nulos
+    return v   # 'str': resultado de fórmula em texto
+
+def iterar_linhas(caminho, parte):
+    """Gera as linhas da aba como listas de valores, descartando o XML já lido."""
+    with zipfile.ZipFile(caminho) as z:
+        strings = _strings_compartilhadas(z)
+        datas = _estilos_data(z)
+        data_base = _data_base(z)
+        with z.open(parte) as f:
+            dados = None
+            for evento, elem in ET.iterparse(f, events=('start', 'end')):
+                nome = _local(elem.tag)
+                if evento == 'start':
+                    if nome == 'sheetData':
+                        dados = elem
+                    continue
+                if nome != 'row':
+                    continue
+                linha = []
+                for i, celula in enumerate(elem):
+                    ref = celula.get('r')
+                    col = _indice_coluna(ref) if ref else i
+                    if col >= len(linha):
+                        linha.extend([None] * (col - len(linha) + 1))
+                    linha[col] = _valor(celula, strings, datas, data_base)
+                r = elem.get('r')
+                yield (int(r) if r else None), linha
+                if dados is not None:
+                    dados.clear()   # mantém só a linha corrente na árvore
+
+def _nomes_colunas(cabecalho):
+    """Cabeçalho como o pandas faria: vazios viram 'Unnamed: i', repetidos ganham '.1'."""
+    nomes, vistos = [], {}
+    for i, valor in enumerate(cabecalho):
+        nome = f'Unnamed: {i}' if valor is None or valor == '' else str(valor)
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f'{nome}.{vistos[nome]}'
+        else:
+            vistos[nome] = 0
+        nomes.append(nome)
+    return nomes
+
+def _vazia(linha):
+    return all(v is None or v == '' for v in linha)
+
+def _lote(linhas, nomes, indices):
+    registros = [tuple(l[i] if i < len(l) else None for i in indices) for l in linhas]
+    df = pd.DataFrame.from_records(registros, columns=[nomes[i] for i in indices])
+    # coluna toda vazia no lote: float64, como no CSV, para não virar 'object' na mescla
+    for col in df.columns[df.isna().all()]:
+        df[col] = df[col].astype('float64')
+    return df
+
+def _procurar_aba(caminho, aba):
+    if isinstance(aba, AbaXlsx):
+        return aba
+    encontrada = next((a for a in ler_metadados(caminho) if a.nome == aba), None)
+    if encontrada is None:
+        raise ValueError(f'Aba não encontrada: {aba}')
+    return encontrada
+
+def iterar_lotes(caminho, aba, colunas=None, linhas_por_lote=LINHAS_POR_LOTE):
+    """Gera a aba como DataFrames de até `linhas_por_lote` linhas (a 1ª linha é o cabeçalho).
+
+    Gera também quantas linhas já foram lidas, para o progresso: (df, lidas).
+    Como no pandas, linhas vazias no meio contam e as do fim (só com estilo) não.
+    """
+    aba = _procurar_aba(caminho, aba)
+    nomes = indices = None
+    pendentes = []
+    vazias = 0   # linhas vazias que só entram se vier uma linha com dados depois
+    lidas = 0
+    anterior = None
+    for numero, linha in iterar_linhas(caminho, aba.parte):
+        if anterior is not None and numero is not None and numero > anterior + 1:
+            vazias += numero - anterior - 1   # linhas ausentes do XML
+            lidas += numero - anterior - 1
+        anterior = numero
+        if nomes is None:
+            largura = max(len(linha), aba.colunas or 0)
+            nomes = _nomes_colunas(linha + [None] * (largura - len(linha)))
+            if colunas is not None:
+                faltando = [c for c in colunas if c not in nomes]
+                if faltando:
+                    raise ValueError(f'Colunas inexistentes na aba {aba.nome}: {faltando}')
+                indices = [nomes.index(c) for c in colunas]
+            else:
+                indices = range(len(nomes))
+            continue
+        lidas += 1
+        if _vazia(linha):
+            vazias += 1
+            continue
+        if len(linha) > len(nomes) and colunas is None:
+            nomes = nomes + [f'Unnamed: {i}' for i in range(len(nomes), len(linha))]
+            indices = range(len(nomes))
+        while vazias:
+            n = min(vazias, linhas_por_lote - len(pendentes))
+            pendentes.extend([] for _ in range(n))
+            vazias -= n
+            if len(pendentes) >= linhas_por_lote:
+                yield _lote(pendentes, nomes, indices), lidas
+                pendentes.clear()
+        pendentes.append(linha)
+        if len(pendentes) >= linhas_por_lote:
+            yield _lote(pendentes, nomes, indices), lidas
+            pendentes.clear()
+    if pendentes:
+        yield _lote(pendentes, nomes, indices), lidas
+
+def resumir_aba_xlsx(caminho, aba, compacto=False, colunas=None, progresso=None, cancelado=None):
+    """Agrega uma aba de .xlsx em lotes de LINHAS_POR_LOTE; devolve (ResumoTabela, MemoriaCarga ou None).
+
+    `aba` é um `AbaXlsx` ou o nome da aba. A primeira linha é o cabeçalho.
+    No modo compacto os tipos são inferidos pelo primeiro lote.
+    """
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+    aba = _procurar_aba(caminho, aba)
+
+    resumo = ResumoTabela()
+    categoricas, memoria = [], None
+    for df, lidas in iterar_lotes(caminho, aba, colunas):
+        if cancelado():
+            raise TarefaCancelada()
+        if compacto:
+            if memoria is None:
+                categoricas, memoria = _compacto.preparar(lambda n: df.head(n))
+            df = _compacto.compactar_df(df, categoricas)
+            memoria.somar(df)
+        resumo.atualizar(df)
+        if aba.linhas:
+            progresso(f'Lendo aba {aba.nome}', 0.95 * min(1.0, lidas / aba.linhas))
+    if compacto and memoria is None:
+        memoria = _compacto.MemoriaCarga()
+    return resumo, memoria
@@ -0,0 +1,232 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from analise import compacto as _compacto
+from analise.agregados import ResumoTabela
+from analise.cache import CacheResultados, impressao_digital
+from analise.leitura_csv import continuar_csv, resumir_csv
+from analise.leitura_xlsx import AbaXlsx, ler_metadados, resumir_aba_xlsx
+from analise.tarefas import TarefaCancelada
+
+# =====================
+# Motor de análise de planilhas
+# =====================
+class Relatorio:
+    """Resultado de uma análise: linhas do relatório + resumo mesclável do arquivo."""
+
+    def __init__(self, caminho, linhas, resumo=None, estado_csv=None):
+        self.caminho = caminho
+        self.linhas = linhas
+        self.resumo = resumo
+        self.estado_csv = estado_csv  # permite continuar um CSV que só cresce
+        self.do_cache = False
+
+    def para_dict(self):
+        return {'arquivo': self.caminho, 'do_cache': self.do_cache,
+                'resumo': self.resumo.para_dict() if self.resumo is not None else None,
+                'relatorio': self.linhas}
+
+    def linhas_exibicao(self):
+        if self.do_cache:
+            origem = '⚡ Resultado do cache (arquivo sem alterações).'
+        else:
+            origem = '🆕 Análise nova.'
+        return [origem] + self.linhas
+
+_cache = None
+
+def cache_padrao():
+    global _cache
+    if _cache is None:
+        _cache = CacheResultados()
+    return _cache
+
+def _sem_progresso(etapa, fracao):
+    pass
+
+def _nunca_cancelado():
+    return False
+
+def _checar(cancelado):
+    if cancelado():
+        raise TarefaCancelada()
+
+def analisar_com_cache(caminho, progresso=None, cancelado=None, cache=None, **opcoes):
+    """Como `analisar_arquivo`, mas reaproveita o resultado de um arquivo inalterado."""
+    progresso = progresso or _sem_progresso
+    cache = cache or cache_padrao()
+
+    progresso('Verificando cache', 0.0)
+    # só opções que mudam o resultado (e fora do padrão) entram na chave
+    chave = impressao_digital(caminho, {k: v for k, v in opcoes.items() if k != 'paralelo' and v})
+    relatorio = cache.obter(chave)
+    if relatorio is not None:
+        relatorio.do_cache = True
+        progresso('Concluído', 1.0)
+        return relatorio
+
+    relatorio = analisar_arquivo(caminho, progresso=progresso, cancelado=cancelado, **opcoes)
+    if relatorio.resumo is not None:  # formatos não suportados não vão para o cache
+        cache.guardar(chave, relatorio)
+    return relatorio
+
+def analisar_arquivo(caminho, progresso=None, cancelado=None, amostra_linhas=None, paralelo=True,
+                     compacto=False, colunas=None):
+    """Lê a planilha e devolve um `Relatorio`.
+
+    Pode rodar fora da thread do pygame: informa o avanço por etapas via
+    `progresso` e interrompe com `TarefaCancelada` quando `cancelado()`.
+    CSVs são lidos por completo em blocos; `amostra_linhas` limita a leitura
+    e marca o relatório como amostrado. Abas do Excel são resumidas em
+    paralelo num pool de processos quando `paralelo` é verdadeiro; as de
+    .xlsx são lidas em fluxo (ver analise.leitura_xlsx), com memória limitada.
+    `compacto` carrega com tipos enxutos (ver analise.compacto) e informa a
+    memória antes/depois; `colunas` restringe a leitura a essas colunas.
+    """
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+
+    ext = os.path.splitext(caminho)[1].lower()
+    progresso('Lendo arquivo', 0.0)
+    if ext in ('.xlsx', '.xls'):
+        if ext == '.xlsx':
+            abas = ler_metadados(caminho)   # nomes e dimensões sem ler células
+            descricoes = [aba.descricao() for aba in abas]
+        else:
+            with pd.ExcelFile(caminho) as xls:
+                abas = descricoes = list(xls.sheet_names)
+        linhas = [f'📄 Tipo: Excel ({ext})',
+                  f'📚 Abas: {len(abas)} -> {", ".join(map(str, descricoes[:8]))}'
+                  + ('...' if len(abas) > 8 else '')]
+        resultados = resumir_abas(caminho, abas, progresso=progresso, cancelado=cancelado,
+                                  paralelo=paralelo, compacto=compacto, colunas=colunas)
+        linhas += _linhas_pasta(resultados)
+        resumo = _total_pasta(resultados)
+
+    elif ext == '.csv':
+        resumo, memoria, estado = resumir_csv(caminho, progresso=progresso, cancelado=cancelado,
+                                              amostra_linhas=amostra_linhas, compacto=compacto, colunas=colunas)
+        progresso('Concluído', 1.0)
+        return Relatorio(caminho, _linhas_csv(resumo, memoria), resumo, estado)
+    else:
+        resumo = None
+        linhas = [f'Formato não suportado: {ext}', 'Suporte: .xlsx, .xls, .csv']
+
+    progresso('Concluído', 1.0)
+    return Relatorio(caminho, linhas, resumo)
+
+def atualizar_csv(anterior, progresso=None, cancelado=None):
+    """Reanálise incremental: lê só as linhas anexadas desde o `Relatorio` anterior.
+
+    Se o arquivo foi reescrito (encolheu ou mudou o início), analisa tudo de novo.
+    """
+    progresso = progresso or _sem_progresso
+    estado = anterior.estado_csv
+    continuacao = continuar_csv(anterior.caminho, estado, progresso=progresso, cancelado=cancelado)
+    if continuacao is None:
+        opcoes = {'compacto': estado.compacto, 'colunas': estado.colunas} if estado else {}
+        return analisar_arquivo(anterior.caminho, progresso=progresso, cancelado=cancelado, **opcoes)
+
+    resumo, memoria, novo_estado, novas = continuacao
+    progresso('Concluído', 1.0)
+    linhas = _linhas_csv(resumo, memoria)
+    linhas.insert(2, f'➕ Linhas novas desde a última leitura: {novas:,}'.replace(',', '.'))
+    return Relatorio(anterior.caminho, linhas, resumo, novo_estado)
+
+def _linhas_csv(resumo, memoria):
+    linhas = [f'📄 Tipo: CSV',
+              f'📦 Linhas lidas: {resumo.linhas:,}'.replace(',', '.')]
+    if memoria is not None:
+        linhas.append(memoria.linha_relatorio())
+    return linhas + resumo.linhas_relatorio()
+
+def resumir_abas(caminho, abas, progresso=None, cancelado=None, paralelo=True, compacto=False, colunas=None):
+    """Resume cada aba, em paralelo entre os núcleos; mantém a ordem de `abas`.
+
+    `abas` são nomes ou `AbaXlsx` (estes são lidos em fluxo).
+    """
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+
+    resultados = {}
+    if not paralelo or len(abas) < 2:
+        for i, aba in enumerate(abas):
+            _checar(cancelado)
+            inicio, peso = 0.95 * i / len(abas), 0.95 / len(abas)
+            progresso(f'Resumindo aba {_nome_aba(aba)}', inicio)
+            resultados[aba] = _resumir_aba(caminho, aba, compacto, colunas,
+                                           progresso=lambda etapa, f: progresso(etapa, inicio + peso * f),
+                                           cancelado=cancelado)
+        return [resultados[aba] for aba in abas]
+
+    executor = ProcessPoolExecutor(max_workers=min(len(abas), os.cpu_count() or 1))
+    try:
+        pendentes = {executor.submit(_resumir_aba, caminho, aba, compacto, colunas): aba for aba in abas}
+        progresso(f'Resumindo {len(abas)} abas em paralelo', 0.05)
+        while pendentes:
+            _checar(cancelado)
+            prontos, _ = wait(pendentes, timeout=0.1, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                aba = pendentes.pop(futuro)
+                resultados[aba] = futuro.result()
+            progresso(f'Abas resumidas: {len(resultados)}/{len(abas)}',
+                      0.05 + 0.9 * len(resultados) / len(abas))
+    finally:
+        # no cancelamento não espera as abas que ainda estão na fila
+        executor.shutdown(wait=not cancelado(), cancel_futures=True)
+    return [resultados[aba] for aba in abas]
+
+def _nome_aba(aba):
+    return aba.nome if isinstance(aba, AbaXlsx) else aba
+
+def _resumir_aba(caminho, aba, compacto=False, colunas=None, progresso=None, cancelado=None):
+    """Roda no processo filho: lê uma aba e devolve só o resumo (leve para serializar)."""
+    if isinstance(aba, AbaXlsx):
+        resumo, memoria = resumir_aba_xlsx(caminho, aba, compacto, colunas, progresso=progresso, cancelado=cancelado)
+        return aba.nome, resumo, memoria
+    memoria = None
+    if compacto:
+        categoricas, memoria = _compacto.preparar(
+            lambda n: pd.read_excel(caminho, sheet_name=aba, nrows=n, usecols=colunas))
+        df = pd.read_excel(caminho, sheet_name=aba, usecols=colunas,
+                           dtype={c: 'category' for c in categoricas} or None)
+        df = _compacto.compactar_df(df, categoricas)
+        memoria.somar(df)
+    else:
+        df = pd.read_excel(caminho, sheet_name=aba, usecols=colunas)
+    return aba, ResumoTabela().atualizar(df), memoria
+
+def _total_pasta(resultados):
+    total = ResumoTabela()
+    for _, resumo, _ in resultados:
+        total.mesclar(resumo)
+    return total
+
+def _linhas_pasta(resultados):
+    linhas = []
+    memoria_total = None
+    for aba, resumo, memoria in resultados:
+        linhas.append('')
+        linhas += resumo.linhas_relatorio(nome_aba=aba)
+        if memoria is not None:
+            linhas.append(memoria.linha_relatorio())
+            memoria_total = (memoria_total or _compacto.MemoriaCarga()).mesclar(memoria)
+    if len(resultados) > 1:
+        linhas += ['', f'📘 Total da pasta de trabalho ({len(resultados)} abas)']
+        linhas += _total_pasta(resultados).linhas_relatorio()
+        if memoria_total is not None:
+            linhas.append(memoria_total.linha_relatorio())
+    return linhas
+
+def sumarizar_df(df, nome_aba=None, progresso=None, cancelado=None):
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+
+    progresso('Tipos, nulos e sketches', 0.4)
+    _checar(cancelado)
+    resumo = ResumoTabela().atualizar(df)
+    progresso('Estatísticas numéricas', 0.7)
+    _checar(cancelado)
+    return resumo.linhas_relatorio(nome_aba=nome_aba)
@@ -0,0 +1,261 @@
+import os
+from collections import OrderedDict
+
+import pandas as pd
+
+from analise.agregados import formato_data, para_datas
+from analise.cache import impressao_digital
+from analise.leitura_csv import LINHAS_POR_BLOCO
+from analise.leitura_xlsx import iterar_lotes, ler_metadados
+from analise.tarefas import TarefaCancelada
+
+# =====================
+# Cubo de agregação (group-by / pivô)
+# =====================
+LIMITE_DIMENSAO = 1000       # texto com até isso de valores distintos vira dimensão
+FRACAO_DIMENSAO = 0.5        # ...e com no máximo metade de valores distintos no bloco
+LIMITE_PARCIAIS = 500_000    # linhas de cubos parciais acumuladas antes de consolidar
+MAX_FATIAS = 32              # fatias recentes guardadas no cubo
+LINHAS = 'linhas'
+ABA = 'aba'
+
+# dimensões derivadas do dia (calculadas na hora de fatiar, não aumentam o cubo)
+DERIVADAS = {
+    'mês': lambda dias: dias.dt.strftime('%Y-%m'),
+    'dia da semana': lambda dias: dias.dt.dayofweek.map(dict(enumerate(
+        ('1-seg', '2-ter', '3-qua', '4-qui', '5-sex', '6-sáb', '7-dom')))),
+}
+
+def _sem_progresso(etapa, fracao):
+    pass
+
+def _nunca_cancelado():
+    return False
+
+def _eh_texto(serie):
+    return (isinstance(serie.dtype, pd.CategoricalDtype) or serie.dtype == object
+            or pd.api.types.is_string_dtype(serie.dtype) or pd.api.types.is_bool_dtype(serie.dtype))
+
+
+class CuboAgregado:
+    """Contagem e somas por combinação de todas as dimensões, montado uma vez por arquivo.
+
+    Somas e contagens são aditivas: agrupar por qualquer subconjunto das
+    dimensões é um group-by sobre o cubo (bem menor que o arquivo), sem
+    reler os dados. A média sai de soma / contagem de não nulos.
+    """
+
+    def __init__(self, dimensoes, medidas, coluna_data=None, formato=None, por_aba=False):
+        self.dimensoes = list(dimensoes)   # colunas de texto (+ 'aba') (+ dia da coluna de data)
+        self.medidas = list(medidas)       # colunas numéricas
+        self.coluna_data = coluna_data
+        self.formato = formato
+        self.por_aba = por_aba
+        self.linhas_lidas = 0
+        self.tabela = None                 # índice: dimensões; colunas: linhas, soma:m, n:m
+        self._parciais = []
+        self._fatias = OrderedDict()
+        self._base = None                  # tabela com as dimensões como colunas (para fatiar)
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['_fatias'] = OrderedDict()  # fatias são recalculadas; não vão para o cache
+        estado['_base'] = None
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._fatias = OrderedDict()
+        self._base = None
+
+    @classmethod
+    def detectar(cls, df, por_aba=False):
+        """Escolhe dimensões, medidas e a coluna de data olhando o primeiro bloco."""
+        coluna_data, formato = None, None
+        for col in df.columns:
+            f = formato_data(df[col])
+            if f is not False:
+                coluna_data, formato = col, f
+                break
+        medidas = [c for c in df.select_dtypes(include='number').columns if c != coluna_data]
+        dimensoes = [ABA] if por_aba else []
+        for col in df.columns:
+            serie = df[col]
+            if col == coluna_data or not _eh_texto(serie):
+                continue
+            distintos = serie.nunique(dropna=True)
+            if distintos <= LIMITE_DIMENSAO and distintos <= max(1, FRACAO_DIMENSAO * serie.count()):
+                dimensoes.append(col)
+        if coluna_data is not None:
+            dimensoes.append(coluna_data)
+        return cls(dimensoes, medidas, coluna_data, formato, por_aba)
+
+    @property
+    def dimensoes_fatia(self):
+        """Dimensões oferecidas ao usuário: as do cubo e as derivadas da data."""
+        if self.coluna_data is None:
+            return list(self.dimensoes)
+        return list(self.dimensoes) + [f'{self.coluna_data}: {nome}' for nome in DERIVADAS]
+
+    # ---------------- Montagem ----------------
+    def atualizar(self, df, aba=None):
+        """Agrega um bloco (group-by por hash de todas as dimensões) e guarda o cubo parcial."""
+        if not len(df):
+            return self
+        colunas = {}
+        for dim in self.dimensoes:
+            if dim == ABA:
+                colunas[dim] = pd.Series(aba, index=df.index, dtype='object')
+            elif dim == self.coluna_data:
+                colunas[dim] = para_datas(df[dim], self.formato).dt.floor('D')
+            else:
+                serie = df[dim] if dim in df.columns else pd.Series(None, index=df.index, dtype='object')
+                colunas[dim] = serie.astype('object') if isinstance(serie.dtype, pd.CategoricalDtype) else serie
+        colunas[LINHAS] = 1
+        for m in self.medidas:
+            valores = pd.to_numeric(df[m], errors='coerce') if m in df.columns else pd.Series(float('nan'), index=df.index)
+            colunas[f'soma:{m}'] = valores.astype('float64')
+            colunas[f'n:{m}'] = valores.notna().astype('int64')
+        bloco = pd.DataFrame(colunas, index=df.index)
+        if self.dimensoes:
+            parcial = bloco.groupby(self.dimensoes, dropna=False, sort=False).sum()
+        else:
+            parcial = bloco.sum().to_frame().T
+        self._parciais.append(parcial)
+        self.linhas_lidas += len(df)
+        if sum(len(p) for p in self._parciais) >= LIMITE_PARCIAIS:
+            self._consolidar()
+        return self
+
+    def _consolidar(self):
+        partes = ([self.tabela] if self.tabela is not None else []) + self._parciais
+        self._parciais = []
+        if not partes:
+            return
+        juntas = pd.concat(partes)
+        if self.dimensoes:
+            self.tabela = juntas.groupby(level=list(range(len(self.dimensoes))), dropna=False, sort=False).sum()
+        else:
+            self.tabela = juntas.sum().to_frame().T
+        self._fatias.clear()
+        self._base = None
+
+    def concluir(self):
+        self._consolidar()
+        return self
+
+    @property
+    def combinacoes(self):
+        return 0 if self.tabela is None else len(self.tabela)
+
+    # ---------------- Fatias ----------------
+    def fatiar(self, dimensoes):
+        """Linhas, soma e média de cada medida agrupadas por `dimensoes` (lista de dimensoes_fatia)."""
+        chave = tuple(dimensoes)
+        fatia = self._fatias.get(chave)
+        if fatia is not None:
+            self._fatias.move_to_end(chave)
+            return fatia
+
+        if self.tabela is None:
+            return pd.DataFrame(columns=list(dimensoes) + [LINHAS])
+        if self._base is None:
+            self._base = self.tabela.reset_index() if self.dimensoes else self.tabela
+        base = self._base
+        chaves = []
+        for dim in dimensoes:
+            nome_derivada = dim[len(f'{self.coluna_data}: '):] if self.coluna_data else None
+            if dim not in base.columns and nome_derivada in DERIVADAS:
+                # calcula só sobre os dias distintos e espalha pelos códigos (strftime é lento)
+                codigos, dias = pd.factorize(base[self.coluna_data], use_na_sentinel=False)
+                derivada = DERIVADAS[nome_derivada](pd.Series(dias)).to_numpy()
+                base = base.assign(**{dim: derivada[codigos]})
+            chaves.append(dim)
+        valores = [LINHAS] + [c for m in self.medidas for c in (f'soma:{m}', f'n:{m}')]
+        if chaves:
+            agrupado = base.groupby(chaves, dropna=False)[valores].sum()
+        else:
+            agrupado = base[valores].sum().to_frame().T
+
+        fatia = pd.DataFrame({LINHAS: agrupado[LINHAS]})
+        for m in self.medidas:
+            n = agrupado[f'n:{m}']
+            fatia[f'soma de {m}'] = agrupado[f'soma:{m}']
+            fatia[f'média de {m}'] = agrupado[f'soma:{m}'] / n.where(n > 0)
+        fatia = fatia.reset_index() if chaves else fatia.reset_index(drop=True)
+
+        self._fatias[chave] = fatia
+        if len(self._fatias) > MAX_FATIAS:
+            self._fatias.popitem(last=False)
+        return fatia
+
+
+# =====================
+# Leitura em blocos e cache do cubo
+# =====================
+def _blocos(caminho, progresso):
+    """Gera (df, aba, fração lida) do arquivo em blocos de tamanho limitado."""
+    ext = os.path.splitext(caminho)[1].lower()
+    if ext == '.csv':
+        tamanho = os.path.getsize(caminho) or 1
+        with open(caminho, 'rb') as f:
+            with pd.read_csv(f, chunksize=LINHAS_POR_BLOCO) as leitor:
+                for df in leitor:
+                    yield df, None, min(1.0, f.tell() / tamanho)
+    elif ext == '.xlsx':
+        abas = ler_metadados(caminho)
+        for i, aba in enumerate(abas):
+            progresso(f'Lendo aba {aba.nome}', i / len(abas))
+            for df, lidas in iterar_lotes(caminho, aba):
+                yield df, aba.nome, (i + min(1.0, lidas / aba.linhas if aba.linhas else 0.0)) / len(abas)
+    elif ext == '.xls':
+        with pd.ExcelFile(caminho) as xls:
+            abas = list(xls.sheet_names)
+            for i, aba in enumerate(abas):
+                yield xls.parse(aba), aba, (i + 1) / len(abas)
+    else:
+        raise ValueError(f'Formato não suportado: {ext} (use .csv, .xlsx ou .xls)')
+
+def _quantas_abas(caminho):
+    ext = os.path.splitext(caminho)[1].lower()
+    if ext == '.xlsx':
+        return len(ler_metadados(caminho))
+    if ext == '.xls':
+        with pd.ExcelFile(caminho) as xls:
+            return len(xls.sheet_names)
+    return 1
+
+def montar_cubo(caminho, progresso=None, cancelado=None):
+    """Lê o arquivo uma vez, em blocos (memória limitada), e devolve o `CuboAgregado`."""
+    progresso = progresso or _sem_progresso
+    cancelado = cancelado or _nunca_cancelado
+
+    progresso('Lendo arquivo', 0.0)
+    por_aba = _quantas_abas(caminho) > 1
+    cubo = None
+    for df, aba, fracao in _blocos(caminho, progresso):
+        if cancelado():
+            raise TarefaCancelada()
+        if cubo is None:
+            cubo = CuboAgregado.detectar(df, por_aba)
+        cubo.atualizar(df, aba)
+        progresso('Agregando por dimensões', 0.95 * fracao)
+    if cubo is None:
+        cubo = CuboAgregado([], [])
+    progresso('Consolidando cubo', 0.97)
+    return cubo.concluir()
+
+def cubo_com_cache(caminho, progresso=None, cancelado=None, cache=None):
+    """Como `montar_cubo`, mas reaproveita o cubo de um arquivo inalterado."""
+    from analise.motor import cache_padrao
+    progresso = progresso or _sem_progresso
+    cache = cache or cache_padrao()
+
+    progresso('Verificando cache', 0.0)
+    chave = impressao_digital(caminho, {'cubo': True})
+    cubo = cache.obter(chave)
+    if cubo is None:
+        cubo = montar_cubo(caminho, progresso=progresso, cancelado=cancelado)
+        cache.guardar(chave, cubo)
+    progresso('Concluído', 1.0)
+    return cubo
@@ -0,0 +1,208 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# =====================
+# Sketches mescláveis (memória limitada)
+# =====================
+K_QUANTIS = 200     # KLL: maior k, menor erro (e mais memória)
+PRECISAO_HLL = 14   # HyperLogLog: 2^14 registradores = 16 KB por coluna
+BINS_HISTOGRAMA = 64
+
+
+class SketchQuantis:
+    """Quantis aproximados (KLL) com memória O(k · log n), mesclável.
+
+    Cada nível h guarda itens de peso 2^h; quando um nível enche, ele é
+    ordenado e metade dos itens (pares ou ímpares, ao acaso) sobe um nível.
+    """
+
+    def __init__(self, k=K_QUANTIS, semente=None):
+        self.k = k
+        self.n = 0
+        self.niveis = [np.empty(0)]
+        self._rng = np.random.default_rng(semente)
+
+    @property
+    def erro_rank(self):
+        """Erro normalizado de rank (~99% de confiança), fórmula empírica do KLL."""
+        return 2.296 / self.k ** 0.9723
+
+    def _capacidade(self, nivel):
+        profundidade = len(self.niveis) - 1 - nivel
+        return max(8, int(math.ceil(self.k * (2 / 3) ** profundidade)))
+
+    def atualizar(self, valores):
+        valores = np.asarray(valores, dtype='float64')
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return self
+        self.n += len(valores)
+        self.niveis[0] = np.concatenate((self.niveis[0], valores))
+        self._compactar()
+        return self
+
+    def mesclar(self, outro):
+        self.n += outro.n
+        while len(self.niveis) < len(outro.niveis):
+            self.niveis.append(np.empty(0))
+        for h, itens in enumerate(outro.niveis):
+            self.niveis[h] = np.concatenate((self.niveis[h], itens))
+        self._compactar()
+        return self
+
+    def _compactar(self):
+        h = 0
+        while h < len(self.niveis):
+            itens = self.niveis[h]
+            if len(itens) <= self._capacidade(h):
+                h += 1
+                continue
+            if h + 1 == len(self.niveis):
+                self.niveis.append(np.empty(0))
+            itens = np.sort(itens)
+            resto = itens[-1:] if len(itens) % 2 else itens[:0]
+            itens = itens[:len(itens) - len(resto)]
+            promovidos = itens[self._rng.integers(2)::2]
+            self.niveis[h + 1] = np.concatenate((self.niveis[h + 1], promovidos))
+            self.niveis[h] = resto
+            h = 0  # novos níveis mudam a capacidade dos de baixo
+
+    def quantis(self, qs):
+        if not self.n:
+            return [None] * len(qs)
+        valores = np.concatenate(self.niveis)
+        pesos = np.concatenate([np.full(len(itens), 2.0 ** h) for h, itens in enumerate(self.niveis)])
+        ordem = np.argsort(valores, kind='stable')
+        valores, acumulado = valores[ordem], np.cumsum(pesos[ordem])
+        alvo = np.asarray(qs) * acumulado[-1]
+        indices = np.minimum(np.searchsorted(acumulado, alvo, side='left'), len(valores) - 1)
+        return [float(v) for v in valores[indices]]
+
+
+class SketchDistintos:
+    """Contagem aproximada de valores distintos (HyperLogLog), mesclável."""
+
+    def __init__(self, precisao=PRECISAO_HLL):
+        self.precisao = precisao
+        self.registros = np.zeros(1 << precisao, dtype=np.uint8)
+
+    @property
+    def erro_relativo(self):
+        return 1.04 / math.sqrt(len(self.registros))
+
+    def atualizar(self, serie):
+        serie = serie.dropna()
+        if not len(serie):
+            return self
+        if pd.api.types.is_numeric_dtype(serie.dtype) and not pd.api.types.is_bool_dtype(serie.dtype):
+            serie = serie.astype('float64')  # 1 e 1.0 contam como o mesmo valor entre blocos
+        hashes = pd.util.hash_pandas_object(serie, index=False).to_numpy(dtype=np.uint64)
+        return self.atualizar_hashes(hashes)
+
+    def atualizar_hashes(self, hashes):
+        p = self.precisao
+        indices = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        resto = hashes & np.uint64((1 << (64 - p)) - 1)
+        # posição do primeiro bit 1 nos 64-p bits restantes (frexp dá o comprimento em bits)
+        _, comprimento = np.frexp(resto.astype(np.float64))
+        rank = np.where(resto == 0, 64 - p + 1, (64 - p) - comprimento + 1).astype(np.uint8)
+        np.maximum.at(self.registros, indices, rank)
+        return self
+
+    def mesclar(self, outro):
+        np.maximum(self.registros, outro.registros, out=self.registros)
+        return self
+
+    def estimativa(self):
+        m = len(self.registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        bruta = alfa * m * m / np.sum(np.exp2(-self.registros.astype(np.float64)))
+        vazios = int(np.count_nonzero(self.registros == 0))
+        if bruta <= 2.5 * m and vazios:
+            return int(round(m * math.log(m / vazios)))  # correção para poucos valores
+        return int(round(bruta))
+
+
+class Histograma:
+    """Histograma com número fixo de bins, mesclável; a largura dobra quando os dados não cabem.
+
+    Os bins ficam alinhados em múltiplos de `largura` (sempre potência de 2):
+    dobrar junta pares de bins vizinhos e dois histogramas sempre se alinham.
+    """
+
+    def __init__(self, n_bins=BINS_HISTOGRAMA):
+        self.n_bins = n_bins
+        self.largura = None
+        self.inicio = 0   # índice absoluto do 1º bin, em unidades de `largura`
+        self.contagens = np.zeros(n_bins, dtype=np.int64)
+
+    @property
+    def vazio(self):
+        return self.largura is None
+
+    def bordas(self):
+        return (self.inicio + np.arange(self.n_bins + 1)) * self.largura
+
+    def _ocupados(self):
+        """(índices absolutos, contagens) dos bins não vazios."""
+        i = np.flatnonzero(self.contagens)
+        return self.inicio + i, self.contagens[i]
+
+    def _cobrir(self, a, b):
+        """Dobra a largura e desloca a janela até os índices absolutos [a, b] caberem."""
+        ocupados, contagens = self._ocupados()
+        if len(ocupados):
+            a, b = min(a, int(ocupados[0])), max(b, int(ocupados[-1]))
+        fator = 1
+        while b // fator - a // fator >= self.n_bins:
+            fator *= 2
+        novo_inicio = a // fator
+        if fator == 1 and self.inicio <= a and b < self.inicio + self.n_bins:
+            return
+        self.contagens = np.bincount(ocupados // fator - novo_inicio, weights=contagens,
+                                     minlength=self.n_bins).astype(np.int64)
+        self.largura *= fator
+        self.inicio = novo_inicio
+
+    def _somar(self, indices, contagens=None):
+        self.contagens += np.bincount(indices - self.inicio, weights=contagens,
+                                      minlength=self.n_bins).astype(np.int64)
+
+    def atualizar(self, valores):
+        valores = np.asarray(valores, dtype='float64')
+        valores = valores[np.isfinite(valores)]
+        if not len(valores):
+            return self
+        minimo, maximo = float(valores.min()), float(valores.max())
+        if self.largura is None:
+            amplitude = (maximo - minimo) or abs(maximo) or 1.0
+            self.largura = 2.0 ** math.ceil(math.log2(amplitude / self.n_bins))
+            self.inicio = math.floor(minimo / self.largura)
+        self._cobrir(math.floor(minimo / self.largura), math.floor(maximo / self.largura))
+        self._somar(np.floor(valores / self.largura).astype(np.int64))
+        return self
+
+    def mesclar(self, outro):
+        if outro.vazio:
+            return self
+        if self.vazio:
+            self.largura, self.inicio = outro.largura, outro.inicio
+            self.contagens = outro.contagens.copy()
+            return self
+        if outro.largura > self.largura:
+            self._cobrir_fator(int(outro.largura / self.largura))
+        indices, contagens = outro._ocupados()
+        fator = int(self.largura / outro.largura)
+        self._cobrir(int(indices[0]) // fator, int(indices[-1]) // fator)
+        fator = int(self.largura / outro.largura)   # _cobrir pode ter dobrado a largura
+        self._somar(indices // fator, contagens)
+        return self
+
+    def _cobrir_fator(self, fator):
+        ocupados, contagens = self._ocupados()
+        self.inicio //= fator
+        self.contagens = np.bincount(ocupados // fator - self.inicio, weights=contagens,
+                                     minlength=self.n_bins).astype(np.int64)
+        self.largura *= fator
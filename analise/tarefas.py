@@ -0,0 +1,88 @@
+import threading
+import time
+
+# =====================
+# Tarefas em segundo plano
+# =====================
+class TarefaCancelada(Exception):
+    """Levantada pelo motor quando o usuário cancela a tarefa em andamento."""
+
+
+class Tarefa:
+    """Executa `funcao` numa thread separada, expondo progresso e cancelamento.
+
+    A função recebe os argumentos nomeados `progresso(etapa, fracao)` e
+    `cancelado()`; o loop do pygame apenas consulta o estado a cada quadro.
+    """
+
+    def __init__(self, funcao, *args, **kwargs):
+        self._funcao = funcao
+        self._args = args
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._cancelar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+
+        self.etapa = 'Aguardando'
+        self.fracao = 0.0
+        self.etapas = []  # [(etapa, inicio, fim)] em perf_counter, para o perfilador
+        self.resultado = None
+        self.erro = None
+        self.cancelada = False
+        self.concluida = False
+        self._liberar = None
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def cancelar(self):
+        self._cancelar.set()
+
+    def descartar(self, liberar):
+        """Cancela sem esperar; se ainda vier um resultado, `liberar(resultado)` o solta
+        (ex.: fecha uma conexão). Roda agora, se já terminou, ou na thread da tarefa."""
+        with self._lock:
+            self._cancelar.set()
+            if not self.concluida:
+                self._liberar = liberar
+                return
+        if self.resultado is not None:
+            liberar(self.resultado)
+
+    def em_andamento(self):
+        return self._thread.is_alive() and not self.concluida
+
+    def estado(self):
+        with self._lock:
+            return self.etapa, self.fracao
+
+    def _progresso(self, etapa, fracao):
+        agora = time.perf_counter()
+        with self._lock:
+            if etapa != self.etapa:
+                self._fechar_etapa(agora)
+                self.etapas.append((etapa, agora, agora))
+            self.etapa = etapa
+            self.fracao = max(0.0, min(1.0, fracao))
+
+    def _fechar_etapa(self, agora):
+        if self.etapas:
+            nome, inicio, _ = self.etapas[-1]
+            self.etapas[-1] = (nome, inicio, agora)
+
+    def _executar(self):
+        try:
+            self.resultado = self._funcao(*self._args, progresso=self._progresso,
+                                          cancelado=self._cancelar.is_set, **self._kwargs)
+        except TarefaCancelada:
+            self.cancelada = True
+        except Exception as e:
+            self.erro = e
+        finally:
+            with self._lock:
+                self._fechar_etapa(time.perf_counter())
+                self.concluida = True
+                liberar = self._liberar
+            if liberar is not None and self.resultado is not None:
+                liberar(self.resultado)
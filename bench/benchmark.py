@@ -0,0 +1,258 @@
+"""Benchmarks headless de renderização e de análise.
+
+Uso:
+    python bench/benchmark.py --saida bench.json
+    python bench/benchmark.py --linhas-csv 10000 1000000 10000000 --comparar bench_anterior.json
+
+Renderização roda com o driver de vídeo dummy do SDL (sem janela). A
+análise roda cada caso num processo filho, para medir o pico de memória
+(RSS) daquele caso isoladamente.
+"""
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import json
+import multiprocessing
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+TAMANHOS_JANELA = [(500, 600), (1024, 768), (1920, 1080)]
+LINHAS_RELATORIO = [0, 1_000, 20_000]
+
+# =====================
+# Dados sintéticos
+# =====================
+LOJAS = [f'LJ{i:02d}' for i in range(24)]
+PRODUTOS = ['Açaí 300ml', 'Açaí 500ml', 'Açaí 700ml', 'Gelato Pitanga', 'Gelato Cupuaçu',
+            'Gelato Chocolate', 'Suco Natural', 'Água', 'Granola extra', 'Leite Ninho extra']
+PAGAMENTOS = ['Pix', 'Crédito', 'Débito', 'Dinheiro', 'Vale-refeição']
+
+def _bloco_sintetico(n, inicio, semente):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(semente)
+    df = pd.DataFrame({
+        'data': pd.Timestamp('2024-01-01') + pd.to_timedelta((inicio + np.arange(n)) // 500, unit='D'),
+        'loja': rng.choice(LOJAS, n),
+        'produto': rng.choice(PRODUTOS, n),
+        'pagamento': rng.choice(PAGAMENTOS, n),
+        'quantidade': rng.integers(1, 6, n),
+        'valor': rng.gamma(4.0, 6.5, n).round(2),
+        'desconto': rng.random(n).round(2),
+    })
+    df.loc[rng.random(n) < 0.05, 'desconto'] = np.nan
+    return df
+
+def gerar_csv(pasta, linhas, bloco=500_000):
+    caminho = os.path.join(pasta, f'sintetico_{linhas}.csv')
+    if os.path.exists(caminho):
+        return caminho
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8', newline='') as f:
+        for i, inicio in enumerate(range(0, linhas, bloco)):
+            n = min(bloco, linhas - inicio)
+            _bloco_sintetico(n, inicio, i).to_csv(f, index=False, header=(i == 0))
+    os.replace(temporario, caminho)
+    return caminho
+
+def gerar_xlsx(pasta, linhas, linhas_por_aba=250_000):
+    import pandas as pd
+
+    caminho = os.path.join(pasta, f'sintetico_{linhas}.xlsx')
+    if os.path.exists(caminho):
+        return caminho
+    temporario = caminho + '.tmp.xlsx'
+    with pd.ExcelWriter(temporario) as writer:
+        for i, inicio in enumerate(range(0, linhas, linhas_por_aba)):
+            n = min(linhas_por_aba, linhas - inicio)
+            _bloco_sintetico(n, inicio, i).to_excel(writer, sheet_name=f'Loja {i + 1}', index=False)
+    os.replace(temporario, caminho)
+    return caminho
+
+# =====================
+# Renderização
+# =====================
+def _medir_quadros(desenhar, quadros, aquecimento=5):
+    for _ in range(aquecimento):
+        desenhar()
+    tempos = []
+    for _ in range(quadros):
+        t0 = time.perf_counter()
+        desenhar()
+        tempos.append((time.perf_counter() - t0) * 1000)
+    tempos.sort()
+    return {
+        'media_ms': round(statistics.fmean(tempos), 3),
+        'p50_ms': round(tempos[len(tempos) // 2], 3),
+        'p95_ms': round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))], 3),
+        'quadros': quadros,
+    }
+
+def bench_renderizacao(quadros):
+    import pygame
+
+    pygame.init()
+    import main
+    from components.ui_base import Botao
+    from screens.planilha import TelaPlanilha
+
+    resultados = []
+    for largura, altura in TAMANHOS_JANELA:
+        tela = pygame.display.set_mode((largura, altura), pygame.RESIZABLE)
+        janela = f'{largura}x{altura}'
+
+        menu = main.TelaMenu(tela)
+        menu.update(1 / 60)
+        resultados.append({'caso': 'TelaMenu.draw', 'janela': janela,
+                           **_medir_quadros(menu.draw, quadros)})
+
+        botao = menu.botoes[0]
+        resultados.append({'caso': 'Botao.desenhar', 'janela': janela,
+                           **_medir_quadros(lambda: botao.desenhar(tela, menu.fonte_botoes), quadros)})
+
+        for n in LINHAS_RELATORIO:
+            planilha = TelaPlanilha(tela, on_voltar=lambda: None)
+            planilha.resultado_linhas = [f'  • coluna_{i} -> min:{i * 0.5}, média:{i * 1.5}, max:{i * 3.0}'
+                                         for i in range(n)]
+            planilha.update(1 / 60)
+            resultados.append({'caso': 'TelaPlanilha.draw', 'janela': janela, 'linhas_relatorio': n,
+                               **_medir_quadros(planilha.draw, quadros)})
+    pygame.quit()
+    return resultados
+
+# =====================
+# Análise
+# =====================
+def _pico_rss_mb():
+    # no Linux, ru_maxrss herda o pico do processo pai através do fork/exec;
+    # VmHWM é do espaço de memória atual
+    try:
+        with open('/proc/self/status') as f:
+            for linha in f:
+                if linha.startswith('VmHWM:'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2**20
+        except Exception:
+            return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 2**20 if sys.platform == 'darwin' else pico / 1024
+
+def _caso_analise(caminho, fila):
+    """Roda no processo filho: só o motor (sem cache), para medir tempo e RSS."""
+    from analise import motor
+
+    t0 = time.perf_counter()
+    relatorio = motor.analisar_arquivo(caminho)
+    segundos = time.perf_counter() - t0
+    fila.put({'segundos': segundos, 'linhas_lidas': relatorio.resumo.linhas, 'pico_rss_mb': _pico_rss_mb()})
+
+def bench_analise(pasta, linhas_csv, linhas_xlsx):
+    contexto = multiprocessing.get_context('spawn')
+    casos = [('csv', n, gerar_csv) for n in linhas_csv] + [('xlsx', n, gerar_xlsx) for n in linhas_xlsx]
+    resultados = []
+    for formato, linhas, gerar in casos:
+        print(f'  gerando/analisando {formato} com {linhas:,} linhas...', flush=True)
+        caminho = gerar(pasta, linhas)
+        fila = contexto.Queue()
+        processo = contexto.Process(target=_caso_analise, args=(caminho, fila))
+        processo.start()
+        medida = fila.get()
+        processo.join()
+
+        mb = os.path.getsize(caminho) / 2**20
+        resultados.append({
+            'caso': 'analisar_arquivo', 'formato': formato, 'linhas': linhas,
+            'tamanho_mb': round(mb, 2),
+            'segundos': round(medida['segundos'], 3),
+            'linhas_por_s': round(medida['linhas_lidas'] / medida['segundos']),
+            'mb_por_s': round(mb / medida['segundos'], 2),
+            'pico_rss_mb': None if medida['pico_rss_mb'] is None else round(medida['pico_rss_mb'], 1),
+        })
+    return resultados
+
+# =====================
+# Saída / comparação
+# =====================
+def _versao():
+    try:
+        return subprocess.check_output(['git', 'describe', '--always', '--dirty'], cwd=RAIZ,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+def _chave(r):
+    return tuple((k, r[k]) for k in ('caso', 'janela', 'linhas_relatorio', 'formato', 'linhas') if k in r)
+
+def comparar(atual, anterior):
+    metricas = ('media_ms', 'p95_ms', 'segundos', 'pico_rss_mb')
+    base = {_chave(r): r for r in anterior.get('render', []) + anterior.get('analise', [])}
+    print(f'\nComparação com {anterior.get("versao")}:')
+    for r in atual['render'] + atual['analise']:
+        antes = base.get(_chave(r))
+        if not antes:
+            continue
+        for m in metricas:
+            if r.get(m) is not None and antes.get(m):
+                delta = (r[m] - antes[m]) / antes[m] * 100
+                rotulo = ' '.join(str(v) for _, v in _chave(r))
+                print(f'  {rotulo:<55} {m:<12} {antes[m]:>10} -> {r[m]:>10} ({delta:+.1f}%)')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--saida', default='bench.json', help='arquivo JSON de resultados')
+    parser.add_argument('--quadros', type=int, default=120, help='quadros medidos por caso de renderização')
+    parser.add_argument('--linhas-csv', type=int, nargs='*', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--linhas-xlsx', type=int, nargs='*', default=[10_000, 100_000])
+    parser.add_argument('--pasta-dados', default=os.path.join(tempfile.gettempdir(), 'maria_pitanga_bench'),
+                        help='onde os arquivos sintéticos são gerados (e reaproveitados)')
+    parser.add_argument('--sem-render', action='store_true')
+    parser.add_argument('--sem-analise', action='store_true')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior')
+    args = parser.parse_args()
+
+    os.makedirs(args.pasta_dados, exist_ok=True)
+    resultado = {
+        'versao': _versao(),
+        'quando': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'plataforma': platform.platform(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'render': [],
+        'analise': [],
+    }
+    if not args.sem_render:
+        print('Renderização...', flush=True)
+        resultado['render'] = bench_renderizacao(args.quadros)
+    if not args.sem_analise:
+        print('Análise...', flush=True)
+        resultado['analise'] = bench_analise(args.pasta_dados, args.linhas_csv, args.linhas_xlsx)
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f'Resultados em {args.saida}')
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            comparar(resultado, json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+
+# =====================
+# Imagem de fundo com pirâmide de escalas
+# =====================
+LADO_MINIMO_NIVEL = 128  # menor nível da pirâmide
+EVENTO_FUNDO_PRONTO = pygame.event.custom_type()  # acorda o loop ocioso
+
+class FundoImagem:
+    """Imagem de fundo decodificada uma vez, com níveis pré-reduzidos (1/2, 1/4...).
+
+    `obter(tamanho)` devolve na hora uma escala rápida do nível mais próximo;
+    a versão suavizada é feita depois por `refinar()`, uma vez por tamanho
+    final, e fica num cache pequeno.
+    """
+
+    def __init__(self, imagem, max_cache=4):
+        self.niveis = [imagem]
+        while min(self.niveis[-1].get_size()) // 2 >= LADO_MINIMO_NIVEL:
+            w, h = self.niveis[-1].get_size()
+            self.niveis.append(pygame.transform.smoothscale(self.niveis[-1], (w // 2, h // 2)))
+        self.max_cache = max_cache
+        self._finais = OrderedDict()
+        self._rapido = None      # (tamanho, superfície) da última escala rápida
+        self._pendente = None    # tamanho aguardando a escala suavizada
+
+    @classmethod
+    def carregar(cls, caminho, converter=True):
+        if not os.path.exists(caminho):
+            return None
+        try:
+            imagem = pygame.image.load(caminho)
+            return cls(imagem.convert() if converter else imagem)
+        except Exception as e:
+            print(f"Erro ao carregar a imagem: {e}")
+            return None
+
+    def converter(self):
+        """Converte os níveis para o formato da tela (precisa da janela, thread principal)."""
+        self.niveis = [nivel.convert() for nivel in self.niveis]
+        return self
+
+    def _nivel_para(self, tamanho):
+        """Menor nível que ainda cobre o tamanho pedido (evita ampliar)."""
+        w, h = tamanho
+        for nivel in reversed(self.niveis):
+            if nivel.get_width() >= w and nivel.get_height() >= h:
+                return nivel
+        return self.niveis[0]
+
+    def obter(self, tamanho):
+        final = self._finais.get(tamanho)
+        if final is not None:
+            self._finais.move_to_end(tamanho)
+            return final
+        if self._rapido is None or self._rapido[0] != tamanho:
+            self._rapido = (tamanho, pygame.transform.scale(self._nivel_para(tamanho), tamanho))
+        self._pendente = tamanho
+        return self._rapido[1]
+
+    def refinar(self):
+        """Faz a escala suavizada pendente; devolve True se há algo novo para desenhar."""
+        if self._pendente is None:
+            return False
+        tamanho, self._pendente = self._pendente, None
+        self._finais[tamanho] = pygame.transform.smoothscale(self._nivel_para(tamanho), tamanho)
+        if len(self._finais) > self.max_cache:
+            self._finais.popitem(last=False)
+        self._rapido = None
+        return True
+
+
+class CarregadorFundo:
+    """Decodifica a imagem e monta a pirâmide numa thread, fora do primeiro quadro."""
+
+    def __init__(self, caminho):
+        self._fundo = None
+        self._concluido = False
+        self._thread = threading.Thread(target=self._carregar, args=(caminho,), daemon=True)
+        self._thread.start()
+
+    def _carregar(self, caminho):
+        self._fundo = FundoImagem.carregar(caminho, converter=False)
+        self._concluido = True
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(EVENTO_FUNDO_PRONTO))
+
+    @property
+    def pronto(self):
+        return self._concluido
+
+    def obter(self):
+        """Na thread principal, depois de `pronto`: o fundo já convertido (ou None)."""
+        return self._fundo.converter() if self._fundo is not None else None
@@ -0,0 +1,209 @@
+import math
+
+import numpy as np
+import pygame
+
+from components.ui_base import COR_DESTAQUE
+
+# =====================
+# Gráficos rasterizados com numpy (histogramas e séries diárias)
+# =====================
+# Cada gráfico é um item do PainelRelatorio: os pixels são calculados em
+# arrays (sem uma chamada de desenho por ponto) e viram uma Surface via
+# pygame.surfarray, guardada até a largura da área mudar.
+ALTURA_GRAFICO = 120
+COR_FUNDO_GRAFICO = (250, 245, 251)
+COR_AREA = (222, 200, 228)
+
+PRE_SELECAO = 4   # séries maiores que PRE_SELECAO * n passam antes por min/máx por balde
+
+def _min_max(y, baldes):
+    """Índices do mínimo e do máximo de cada um de `baldes` trechos iguais (vetorizado)."""
+    tamanho = len(y) // baldes
+    blocos = y[:tamanho * baldes].reshape(baldes, tamanho)
+    base = np.arange(baldes) * tamanho
+    indices = np.concatenate((base + blocos.argmin(axis=1), base + blocos.argmax(axis=1),
+                              [0, len(y) - 1]))
+    if tamanho * baldes < len(y):  # sobra no fim
+        resto = y[tamanho * baldes:]
+        indices = np.append(indices, tamanho * baldes + np.array([resto.argmin(), resto.argmax()]))
+    indices = np.sort(indices)
+    return indices[np.append(True, np.diff(indices) > 0)]
+
+def lttb(x, y, n):
+    """Largest-Triangle-Three-Buckets: reduz a série a `n` pontos preservando picos e vales."""
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    if n >= len(x) or n < 3:
+        return x, y
+    if len(x) > PRE_SELECAO * n:
+        # milhões de pontos: min/máx de cada balde conserva os extremos e o LTTB roda em ~4n pontos
+        indices = _min_max(y, PRE_SELECAO * n // 2)
+        x, y = x[indices], y[indices]
+    total = len(x)
+    # n-2 baldes internos; o primeiro e o último ponto ficam sempre
+    bordas = (np.arange(n - 1) * ((total - 2) / (n - 2))).astype(np.int64) + 1
+    bordas[-1] = total - 1
+    tamanhos = np.diff(bordas)
+    medias_x = np.append(np.add.reduceat(x[:total - 1], bordas[:-1]) / tamanhos, x[-1])
+    medias_y = np.append(np.add.reduceat(y[:total - 1], bordas[:-1]) / tamanhos, y[-1])
+
+    # com a pré-seleção cada balde tem poucos pontos: laço em floats do Python é mais rápido que numpy
+    xs, ys = x.tolist(), y.tolist()
+    mx, my = medias_x.tolist(), medias_y.tolist()
+    escolhidos = [0]
+    a = 0
+    for i in range(n - 2):
+        ax, ay, bx, by = xs[a], ys[a], mx[i + 1], my[i + 1]
+        melhor, a_novo = -1.0, int(bordas[i])
+        for j in range(int(bordas[i]), int(bordas[i + 1])):
+            area = abs((ax - bx) * (ys[j] - ay) - (ax - xs[j]) * (by - ay))
+            if area > melhor:
+                melhor, a_novo = area, j
+        a = a_novo
+        escolhidos.append(a)
+    escolhidos.append(total - 1)
+    return x[escolhidos], y[escolhidos]
+
+def _tela(largura, altura):
+    pixels = np.empty((largura, altura, 3), dtype=np.uint8)
+    pixels[:] = COR_FUNDO_GRAFICO
+    return pixels
+
+def rasterizar_barras(contagens, largura, altura, cor=COR_DESTAQUE):
+    """Barras verticais, uma por bin, ocupando a largura toda (array (largura, altura, 3))."""
+    pixels = _tela(largura, altura)
+    contagens = np.asarray(contagens, dtype='float64')
+    if not len(contagens) or contagens.max() <= 0:
+        return pixels
+    bins = np.arange(largura) * len(contagens) // largura
+    topo = altura - np.ceil(contagens[bins] / contagens.max() * (altura - 2)).astype(np.int64)
+    linhas = np.arange(altura)[None, :]
+    pixels[linhas >= topo[:, None]] = cor
+    if largura >= 3 * len(contagens):
+        pixels[np.flatnonzero(np.diff(bins)) + 1] = COR_FUNDO_GRAFICO  # espaço entre as barras
+    return pixels
+
+def rasterizar_paleta(cores, fracoes, largura, altura):
+    """Faixa horizontal com cada cor ocupando a largura proporcional à sua fração."""
+    pixels = _tela(largura, altura)
+    if not len(cores):
+        return pixels
+    limites = np.rint(np.cumsum(fracoes) / np.sum(fracoes) * largura).astype(np.int64)
+    indices = np.minimum(np.searchsorted(limites, np.arange(largura), side='right'), len(cores) - 1)
+    pixels[:] = np.clip(np.rint(np.asarray(cores, dtype='float64')), 0, 255).astype(np.uint8)[indices][:, None, :]
+    return pixels
+
+def rasterizar_linha(x, y, largura, altura, cor=COR_DESTAQUE):
+    """Linha (com área preenchida) dos pontos (x, y), já reduzidos à largura em pixels."""
+    pixels = _tela(largura, altura)
+    x, y = lttb(x, y, largura)
+    if len(x) < 2 or x[-1] == x[0]:
+        return pixels
+    y_min, y_max = float(y.min()), float(y.max())
+    y_min -= 0.1 * (y_max - y_min)   # folga embaixo: o mínimo não cola na borda
+    escala = (altura - 3) / (y_max - y_min) if y_max > y_min else 0.0
+    px = (x - x[0]) / (x[-1] - x[0]) * (largura - 1)
+    py = (altura - 2) - (y - y_min) * escala
+
+    colunas = np.arange(largura)
+    meio = np.interp(colunas, px, py)
+    # cada coluna cobre do menor ao maior y dos pontos que caem nela e das vizinhas
+    baixo, cima = meio.copy(), meio.copy()
+    indices = np.clip(np.rint(px).astype(np.int64), 0, largura - 1)
+    np.minimum.at(cima, indices, py)
+    np.maximum.at(baixo, indices, py)
+    vizinho = np.append(meio[1:], meio[-1])
+    cima = np.floor(np.minimum(cima, vizinho))
+    baixo = np.ceil(np.maximum(baixo, vizinho))
+
+    linhas = np.arange(altura)[None, :]
+    pixels[linhas > meio[:, None]] = COR_AREA
+    pixels[(linhas >= cima[:, None] - 1) & (linhas <= baixo[:, None])] = cor
+    return pixels
+
+
+class Grafico:
+    """Item de altura fixa para o PainelRelatorio; a Surface é refeita só quando a largura muda."""
+
+    altura = ALTURA_GRAFICO
+
+    def __init__(self):
+        self._largura = None
+        self._surface = None
+
+    def superficie(self, largura):
+        if largura != self._largura:
+            pixels = self._rasterizar(max(1, largura), self.altura)
+            self._surface = pygame.surfarray.make_surface(pixels)
+            self._largura = largura
+        return self._surface
+
+    def _rasterizar(self, largura, altura):
+        raise NotImplementedError
+
+
+class GraficoHistograma(Grafico):
+    def __init__(self, contagens, cor=COR_DESTAQUE):
+        super().__init__()
+        self.contagens = contagens
+        self.cor = cor
+
+    def _rasterizar(self, largura, altura):
+        return rasterizar_barras(self.contagens, largura, altura, self.cor)
+
+
+class GraficoLinha(Grafico):
+    def __init__(self, x, y):
+        super().__init__()
+        self.x = x
+        self.y = y
+
+    def _rasterizar(self, largura, altura):
+        return rasterizar_linha(self.x, self.y, largura, altura)
+
+
+class GraficoPaleta(Grafico):
+    altura = ALTURA_GRAFICO // 3
+
+    def __init__(self, cores, fracoes):
+        super().__init__()
+        self.cores = cores
+        self.fracoes = fracoes
+
+    def _rasterizar(self, largura, altura):
+        return rasterizar_paleta(self.cores, self.fracoes, largura, altura)
+
+
+def _num(v):
+    v = float(v)
+    if math.isfinite(v) and v == int(v) and abs(v) < 1e15:
+        return f'{int(v):,}'.replace(',', '.')
+    return f'{v:.2f}'
+
+def _dia(d):
+    return np.datetime64(d, 'D').item().strftime('%d/%m/%Y')
+
+def graficos_do_resumo(resumo):
+    """Linhas de título + gráficos (histograma de cada numérica e séries diárias) de um ResumoTabela."""
+    if resumo is None:
+        return []
+    itens = []
+    numericas = [c for c in resumo.colunas.values() if c.numerica and not c.histograma.vazio]
+    if numericas:
+        itens += ['', '📶 Histogramas']
+    for c in numericas:
+        hist = c.histograma
+        ocupados = np.flatnonzero(hist.contagens)
+        bordas = hist.bordas()
+        itens += [f'  {c.nome}: {_num(bordas[ocupados[0]])} a {_num(bordas[ocupados[-1] + 1])}',
+                  GraficoHistograma(hist.contagens[ocupados[0]:ocupados[-1] + 1])]
+
+    serie = resumo.serie
+    if serie is not None and len(serie.dias) > 1:
+        itens += ['', f'📈 Por dia (coluna "{serie.coluna}")']
+        for nome, dias, valores in serie.series():
+            titulo = 'linhas por dia' if nome == '__linhas__' else f'soma diária de {nome}'
+            itens += [f'  {titulo}: {_dia(dias[0])} a {_dia(dias[-1])}, máx {_num(valores.max())}',
+                      GraficoLinha(dias.astype('datetime64[s]').astype('float64'), valores)]
+    return itens
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import pygame
+
+# =====================
+# Instrumentação / overlay de perfil
+# =====================
+TECLA_OVERLAY = pygame.K_F3   # liga/desliga a medição e o overlay
+TECLA_TRACE = pygame.K_F4     # grava o trace (formato Chrome / Perfetto)
+ORCAMENTO_MS = 1000 / 60
+
+_NULO = nullcontext()
+
+class Perfilador:
+    """Mede fases do quadro (eventos, update, draw...) e etapas das análises.
+
+    Desligado, `secao()` devolve um contexto nulo e não custa quase nada.
+    Ligado, guarda os últimos quadros para o overlay e os eventos para o
+    trace, que abre em chrome://tracing ou ui.perfetto.dev.
+    """
+
+    def __init__(self, max_quadros=240, max_eventos=200_000):
+        self.ativo = False
+        self.quadros = deque(maxlen=max_quadros)  # (total_ms, {seção: ms})
+        self.eventos = deque(maxlen=max_eventos)
+        self.ultima_tarefa = []                   # [(etapa, ms)] da última análise
+        self._quadro = None
+        self._inicio_quadro = 0.0
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def alternar(self):
+        self.ativo = not self.ativo
+        self.quadros.clear()
+
+    # ---------------- Medição ----------------
+    def iniciar_quadro(self):
+        if self.ativo:
+            self._quadro = {}
+            self._inicio_quadro = time.perf_counter()
+
+    def fim_quadro(self):
+        if self.ativo and self._quadro is not None:
+            total = (time.perf_counter() - self._inicio_quadro) * 1000
+            self.quadros.append((total, self._quadro))
+            self._evento('quadro', self._inicio_quadro, total / 1000, tid=0)
+        self._quadro = None
+
+    def secao(self, nome):
+        return self._medir(nome) if self.ativo else _NULO
+
+    @contextmanager
+    def _medir(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            if self._quadro is not None and threading.current_thread() is threading.main_thread():
+                self._quadro[nome] = self._quadro.get(nome, 0.0) + duracao * 1000
+            self._evento(nome, inicio, duracao)
+
+    def registrar_etapas(self, nome, etapas):
+        """Etapas de uma tarefa em segundo plano: [(etapa, inicio, fim)] em perf_counter."""
+        self.ultima_tarefa = [(etapa, (fim - inicio) * 1000) for etapa, inicio, fim in etapas]
+        if not self.ativo:
+            return
+        for etapa, inicio, fim in etapas:
+            self._evento(f'{nome}: {etapa}', inicio, fim - inicio, tid=2)
+
+    def _evento(self, nome, inicio, duracao, tid=None):
+        if tid is None:
+            tid = 1 if threading.current_thread() is threading.main_thread() else 2
+        with self._lock:
+            self.eventos.append({'name': nome, 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+                                 'ts': (inicio - self._t0) * 1e6, 'dur': duracao * 1e6})
+
+    def salvar_trace(self, caminho=None):
+        caminho = caminho or time.strftime('perfil_%Y%m%d_%H%M%S.json')
+        with self._lock:
+            eventos = list(self.eventos)
+        nomes_threads = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': nome}}
+                         for tid, nome in ((0, 'quadros'), (1, 'pygame'), (2, 'análise'))]
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': nomes_threads + eventos, 'displayTimeUnit': 'ms'}, f)
+        return caminho
+
+    # ---------------- Overlay ----------------
+    def secoes_mais_lentas(self, n=6):
+        somas = {}
+        for _, secoes in self.quadros:
+            for nome, ms in secoes.items():
+                somas[nome] = somas.get(nome, 0.0) + ms
+        qtd = max(1, len(self.quadros))
+        return sorted(((nome, ms / qtd) for nome, ms in somas.items()), key=lambda x: -x[1])[:n]
+
+    def desenhar(self, surface, fonte):
+        if not self.ativo:
+            return
+        linhas = []
+        if self.quadros:
+            tempos = sorted(t for t, _ in self.quadros)
+            linhas.append(f'quadro: p50 {tempos[len(tempos) // 2]:.1f} ms  max {tempos[-1]:.1f} ms')
+        linhas += [f'{nome:<12} {ms:6.2f} ms' for nome, ms in self.secoes_mais_lentas()]
+        if self.ultima_tarefa:
+            linhas.append('última análise:')
+            linhas += [f'  {etapa[:22]:<22} {ms:7.0f} ms' for etapa, ms in self.ultima_tarefa[-5:]]
+        linhas.append('F3 fecha · F4 grava trace')
+
+        lh = fonte.get_height()
+        altura_grafico = 48
+        largura = 300
+        painel = pygame.Rect(8, 8, largura, altura_grafico + 16 + lh * len(linhas))
+        fundo = pygame.Surface(painel.size, pygame.SRCALPHA)
+        fundo.fill((20, 10, 25, 200))
+        surface.blit(fundo, painel)
+
+        # gráfico do tempo de quadro: 2x o orçamento de 60 fps na altura toda
+        base = painel.y + 8 + altura_grafico
+        escala = altura_grafico / (2 * ORCAMENTO_MS)
+        quadros = list(self.quadros)[-(largura - 16):]
+        for i, (total, _) in enumerate(quadros):
+            h = min(altura_grafico, int(total * escala))
+            cor = (120, 220, 120) if total <= ORCAMENTO_MS else (240, 120, 90)
+            pygame.draw.line(surface, cor, (painel.x + 8 + i, base), (painel.x + 8 + i, base - h))
+        y_orcamento = base - int(ORCAMENTO_MS * escala)
+        pygame.draw.line(surface, (200, 200, 200), (painel.x + 8, y_orcamento), (painel.right - 8, y_orcamento))
+
+        y = base + 6
+        for linha in linhas:
+            surface.blit(fonte.render(linha, True, (240, 240, 240)), (painel.x + 8, y))
+            y += lh
+
+perfilador = Perfilador()
@@ -0,0 +1,123 @@
+import bisect
+from collections import OrderedDict
+from itertools import accumulate
+
+import pygame
+
+from components.perfil import perfilador
+from components.ui_base import MedidorTexto, wrap_text
+
+# =====================
+# Relatório rolável virtualizado
+# =====================
+class PainelRelatorio:
+    """Lista de linhas com rolagem que só renderiza o que está visível.
+
+    As linhas são quebradas na largura da área uma única vez (larguras
+    memoizadas) e as superfícies renderizadas ficam num cache LRU limitado,
+    descartado quando a fonte muda. Além de textos, aceita itens com
+    `altura` e `superficie(largura)` (ex.: components.graficos).
+    """
+
+    def __init__(self, cor_texto=(40, 40, 40), espaco=6, max_superficies=512):
+        self.cor_texto = cor_texto
+        self.espaco = espaco
+        self.max_superficies = max_superficies
+
+        self.linhas = []
+        self.scroll_y = 0
+        self.area = pygame.Rect(0, 0, 0, 0)
+        self.fonte = None
+
+        self._medidor = None
+        self._visuais = None
+        self._topos = None
+        self._superficies = OrderedDict()
+
+    # ---------------- Conteúdo/Layout ----------------
+    def definir_linhas(self, linhas):
+        self.linhas = list(linhas)
+        self._visuais = None
+        self._limitar_scroll()
+
+    def definir_layout(self, area, fonte):
+        if fonte is not self.fonte:
+            self.fonte = fonte
+            self._medidor = MedidorTexto(fonte)
+            self._superficies.clear()
+            self._visuais = None
+        if area.w != self.area.w:
+            self._visuais = None
+        self.area = pygame.Rect(area)
+        self._limitar_scroll()
+
+    @property
+    def altura_linha(self):
+        return self.fonte.get_height() + self.espaco
+
+    @property
+    def largura_util(self):
+        return max(40, self.area.w - 8)
+
+    def linhas_visuais(self):
+        if self._visuais is None:
+            largura = self.largura_util
+            self._visuais = []
+            for linha in self.linhas:
+                if isinstance(linha, str):
+                    self._visuais += wrap_text(None, linha, self.fonte, largura, self._medidor)
+                else:
+                    self._visuais.append(linha)
+            lh = self.altura_linha
+            alturas = (lh if isinstance(v, str) else v.altura + self.espaco for v in self._visuais)
+            self._topos = [0] + list(accumulate(alturas))  # y de cada item; o último é a altura total
+        return self._visuais
+
+    def altura_total(self):
+        self.linhas_visuais()
+        return self._topos[-1]
+
+    # ---------------- Rolagem ----------------
+    def rolar(self, dy):
+        self.scroll_y += dy
+        self._limitar_scroll()
+
+    def _limitar_scroll(self):
+        if self.fonte is None:
+            return
+        limite = -max(0, self.altura_total() - self.area.h)
+        self.scroll_y = max(min(self.scroll_y, 0), limite)
+
+    # ---------------- Desenho ----------------
+    def _superficie(self, texto):
+        surf = self._superficies.get(texto)
+        if surf is None:
+            surf = self.fonte.render(texto, True, self.cor_texto)
+            self._superficies[texto] = surf
+            if len(self._superficies) > self.max_superficies:
+                self._superficies.popitem(last=False)
+        else:
+            self._superficies.move_to_end(texto)
+        return surf
+
+    def desenhar(self, surface):
+        with perfilador.secao('relatorio'):
+            self._desenhar(surface)
+
+    def _desenhar(self, surface):
+        visuais = self.linhas_visuais()
+        topos = self._topos
+        # primeiro e último itens que cruzam a área (alturas variáveis: busca nos topos)
+        primeiro = max(0, bisect.bisect_right(topos, -self.scroll_y) - 1)
+        ultimo = min(len(visuais), bisect.bisect_left(topos, -self.scroll_y + self.area.h))
+
+        clip_old = surface.get_clip()
+        surface.set_clip(self.area)
+        for i in range(primeiro, ultimo):
+            item = visuais[i]
+            y = self.area.y + self.scroll_y + topos[i]
+            if isinstance(item, str):
+                surface.blit(self._superficie(item), (self.area.x, y))
+            else:
+                surface.blit(item.superficie(self.largura_util), (self.area.x, y))
+        surface.set_clip(clip_old)
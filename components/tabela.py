@@ -0,0 +1,155 @@
+from collections import OrderedDict
+
+import pygame
+
+from components.perfil import perfilador
+from components.ui_base import COR_DESTAQUE, COR_TEXTO_INVERSO, MedidorTexto, elide_text
+
+# =====================
+# Tabela rolável virtualizada (linhas sob demanda)
+# =====================
+LARGURA_MIN_COLUNA = 60
+LARGURA_MAX_COLUNA = 260
+LINHAS_AMOSTRA_LARGURA = 200   # linhas usadas para dimensionar as colunas
+
+class PainelTabela:
+    """Grade de células que só busca e renderiza as linhas visíveis.
+
+    `fonte_dados` responde a `colunas`, `total_linhas` e `linhas(inicio, fim)`
+    (ex.: analise.explorador.PaginasCSV). A rolagem vertical usa `scroll_y`
+    como o PainelRelatorio; o cabeçalho fica fixo e `scroll_x` desloca as
+    colunas. Textos de célula já cortados ficam num cache LRU de superfícies.
+    """
+
+    def __init__(self, cor_texto=(40, 40, 40), espaco=6, max_superficies=2048):
+        self.cor_texto = cor_texto
+        self.espaco = espaco
+        self.max_superficies = max_superficies
+
+        self.fonte_dados = None
+        self.scroll_y = 0
+        self.scroll_x = 0
+        self.area = pygame.Rect(0, 0, 0, 0)
+        self.fonte = None
+
+        self._medidor = None
+        self._larguras = None
+        self._superficies = OrderedDict()
+
+    # ---------------- Conteúdo/Layout ----------------
+    def definir_fonte_dados(self, fonte_dados):
+        self.fonte_dados = fonte_dados
+        self._larguras = None
+        self.scroll_y = self.scroll_x = 0
+
+    def definir_layout(self, area, fonte):
+        if fonte is not self.fonte:
+            self.fonte = fonte
+            self._medidor = MedidorTexto(fonte)
+            self._superficies.clear()
+            self._larguras = None
+        self.area = pygame.Rect(area)
+        self._limitar_scroll()
+
+    @property
+    def altura_linha(self):
+        return self.fonte.get_height() + self.espaco
+
+    def larguras(self):
+        """Largura de cada coluna (a primeira é o número da linha), pelo cabeçalho e uma amostra."""
+        if self._larguras is None:
+            medir = self._medidor.largura
+            dados = self.fonte_dados
+            amostra = dados.linhas(0, LINHAS_AMOSTRA_LARGURA)
+            pad = 2 * self.espaco
+            self._larguras = [medir(f'{dados.total_linhas:,}') + pad]
+            for i, nome in enumerate(dados.colunas):
+                maior = max([medir(nome)] + [medir(l[i]) for l in amostra if i < len(l)])
+                self._larguras.append(max(LARGURA_MIN_COLUNA, min(LARGURA_MAX_COLUNA, maior + pad)))
+        return self._larguras
+
+    # ---------------- Rolagem ----------------
+    def rolar(self, dy):
+        self.scroll_y += dy
+        self._limitar_scroll()
+
+    def rolar_horizontal(self, dx):
+        self.scroll_x += dx
+        self._limitar_scroll()
+
+    def _limitar_scroll(self):
+        if self.fonte is None or self.fonte_dados is None:
+            return
+        lh = self.altura_linha
+        limite = -max(0, self.fonte_dados.total_linhas * lh - (self.area.h - lh))
+        self.scroll_y = max(min(self.scroll_y, 0), limite)
+        limite_x = -max(0, sum(self.larguras()) - self.area.w)
+        self.scroll_x = max(min(self.scroll_x, 0), limite_x)
+
+    # ---------------- Desenho ----------------
+    def _superficie(self, texto, largura, cor):
+        chave = (texto, largura, cor)
+        surf = self._superficies.get(chave)
+        if surf is None:
+            texto = elide_text(self.fonte, texto, largura - 2 * self.espaco, self._medidor)
+            surf = self.fonte.render(texto, True, cor)
+            self._superficies[chave] = surf
+            if len(self._superficies) > self.max_superficies:
+                self._superficies.popitem(last=False)
+        else:
+            self._superficies.move_to_end(chave)
+        return surf
+
+    def desenhar(self, surface):
+        if self.fonte_dados is None:
+            return
+        with perfilador.secao('tabela'):
+            self._desenhar(surface)
+
+    def _colunas_visiveis(self):
+        """[(indice, x, largura)] das colunas que cruzam a área (o nº da linha fica fixo)."""
+        larguras = self.larguras()
+        visiveis = [(0, self.area.x, larguras[0])]
+        x = self.area.x + larguras[0] + self.scroll_x
+        for i, w in enumerate(larguras[1:], start=1):
+            if x + w > self.area.x + larguras[0] and x < self.area.right:
+                visiveis.append((i, x, w))
+            x += w
+        return visiveis
+
+    def _desenhar(self, surface):
+        lh = self.altura_linha
+        corpo_h = self.area.h - lh
+        primeiro = max(0, int(-self.scroll_y // lh))
+        ultimo = primeiro + corpo_h // lh + 2
+        linhas = self.fonte_dados.linhas(primeiro, ultimo)
+        colunas = self._colunas_visiveis()
+        largura_num = colunas[0][2]
+
+        clip_old = surface.get_clip()
+        # corpo: só as linhas e colunas visíveis, recortadas abaixo do cabeçalho
+        corpo = pygame.Rect(self.area.x, self.area.y + lh, self.area.w, corpo_h)
+        y = corpo.y + self.scroll_y + primeiro * lh
+        listra = (244, 238, 246)
+        for n, linha in enumerate(linhas, start=primeiro):
+            surface.set_clip(corpo)
+            if n % 2:
+                surface.fill(listra, (self.area.x, y, self.area.w, lh))
+            for i, x, w in colunas[1:]:
+                if i - 1 < len(linha):
+                    surface.set_clip(corpo.clip((max(x, corpo.x + largura_num), y, w, lh)))
+                    surface.blit(self._superficie(linha[i - 1], w, self.cor_texto), (x + self.espaco, y))
+            surface.set_clip(corpo)
+            surface.blit(self._superficie(f'{n + 1:,}'.replace(',', '.'), largura_num, COR_DESTAQUE),
+                         (self.area.x + self.espaco, y))
+            y += lh
+
+        # cabeçalho fixo
+        topo = pygame.Rect(self.area.x, self.area.y, self.area.w, lh)
+        surface.set_clip(topo)
+        surface.fill(COR_DESTAQUE, topo)
+        for i, x, w in colunas[1:]:
+            surface.set_clip(topo.clip((max(x, topo.x + largura_num), topo.y, w, lh)))
+            surface.blit(self._superficie(self.fonte_dados.colunas[i - 1], w, COR_TEXTO_INVERSO),
+                         (x + self.espaco, topo.y + self.espaco // 2))
+        surface.set_clip(clip_old)
@@ -0,0 +1,222 @@
+import math
+import pygame
+
+from components.ui_base import (
+    COR_FUNDO_BASE, COR_DESTAQUE, COR_TEXTO,
+    ajustar_claridade, draw_rounded_rect, draw_card, draw_vignette,
+    wrap_text, elide_text, MedidorTexto, obter_fonte
+)
+from components.perfil import perfilador
+
+COR_TITULO = (87, 11, 98)
+
+# =====================
+# Base das telas de análise
+# =====================
+class TelaAnalise:
+    """Título, grade de botões, legenda de até 2 linhas e um card com o painel ativo.
+
+    A subclasse cria `self.botoes` e define `texto_legenda()`; `_paineis()`
+    (todos os painéis do card) e `_painel()` (o visível) valem
+    `self.relatorio` por padrão. Com `self.tarefa` rodando, desenha a barra
+    de progresso no pé do card.
+    """
+
+    COLUNAS_LARGO = 3       # botões por linha a partir de 980 px
+    LARGURA_MEDIA = 440     # a partir daqui, 2 colunas; abaixo, 1
+    ROLAR_COM_JK = True     # j/k rolam o painel (desligue se a tela tem campo de texto)
+
+    def __init__(self, surface, on_voltar, titulo):
+        self.surface = surface
+        self.on_voltar = on_voltar
+        self.titulo = titulo
+        self.tarefa = None
+        self.botoes = []
+
+        # Layout vars
+        self.fonte_botoes = None
+        self.fonte_titulo = None
+        self.fonte_relatorio = None
+        self.margin = 16
+        self.btn_h = 48
+
+        self.btn_rects = []
+        self.legend_lines = []
+        self.legend_surfs = []
+        self.legend_pos = (0, 0)
+        self.card_rect = None
+        self.area_relatorio = None
+
+    def texto_legenda(self):
+        return ''
+
+    def _paineis(self):
+        return [self.relatorio]
+
+    def _painel(self):
+        return self.relatorio
+
+    # ---------------- UI/Layout ----------------
+    def _btn_columns(self, w):
+        """Decide colunas dos botões por largura da janela."""
+        if w >= 980:                   # largo: tudo em linha (ou quase)
+            return self.COLUNAS_LARGO
+        if w >= self.LARGURA_MEDIA:    # médio: 2 colunas
+            return 2
+        return 1                       # estreito: 1 coluna
+
+    def recalcular_layout(self):
+        w, h = self.surface.get_size()
+
+        # Margens e métricas responsivas
+        self.margin = margin = max(16, int(min(w, h) * 0.04))
+        self.fonte_titulo = obter_fonte('Arial', max(20, int(h * 0.05)), bold=True)
+
+        # Botões: grade centralizada logo abaixo do título
+        cols = self._btn_columns(w)
+        gap_h = max(10, int(h * 0.015))
+        gap_w = max(10, int(w * 0.02))
+        self.btn_h = btn_h = max(48, int(h * 0.085))
+        self.fonte_botoes = obter_fonte('Arial', max(16, int(btn_h * 0.42)), bold=True)
+
+        avail_w = w - 2 * margin - (cols - 1) * gap_w
+        btn_w = max(120, min(280, int(avail_w / cols)))
+
+        titulo_h = self.fonte_titulo.get_height()
+        y_start = margin - 4 + titulo_h + max(6, int(h * 0.01))
+
+        self.btn_rects = []
+        rows = math.ceil(len(self.botoes) / cols)
+        row_w = cols * btn_w + (cols - 1) * gap_w
+        x0 = (w - row_w) // 2
+        for i, b in enumerate(self.botoes):
+            r, c = divmod(i, cols)
+            rect = pygame.Rect(x0 + c * (btn_w + gap_w), y_start + r * (btn_h + gap_h), btn_w, btn_h)
+            self.btn_rects.append(rect)
+            b.rect = rect
+
+        # Legenda: da borda esquerda à direita da grade, até 2 linhas (corta com …)
+        legend_y = y_start + rows * (btn_h + gap_h)
+        self.fonte_relatorio = obter_fonte('Consolas, Menlo, Courier New, monospace', max(14, int(h * 0.022)))
+        if self.btn_rects:
+            left = min(r.x for r in self.btn_rects)
+            right = max(r.right for r in self.btn_rects)
+        else:
+            left, right = margin, w - margin
+        leg_max_w = max(160, right - left)
+        medidor = MedidorTexto(self.fonte_relatorio)
+        lines = wrap_text(self.surface, self.texto_legenda(), self.fonte_relatorio, leg_max_w, medidor)
+        if len(lines) > 2:
+            lines = lines[:2]
+            lines[-1] = elide_text(self.fonte_relatorio, lines[-1], leg_max_w, medidor)
+        self.legend_lines = lines
+        self.legend_surfs = [self.fonte_relatorio.render(ln, True, COR_TEXTO) for ln in lines]
+        self.legend_pos = (left, legend_y)
+
+        # Card do painel
+        legend_height = len(self.legend_lines) * (self.fonte_relatorio.get_height() + 2)
+        card_y = self._layout_abaixo_da_legenda(legend_y + legend_height)
+        self.card_rect = pygame.Rect(margin, card_y, w - 2 * margin, max(140, h - card_y - margin))
+        pad = max(14, int(min(w, h) * 0.02))
+        self.area_relatorio = self.card_rect.inflate(-2 * pad, -2 * pad)
+
+        # os painéis requebram as linhas e limitam o scroll se área/fonte mudaram
+        for painel in self._paineis():
+            painel.definir_layout(self.area_relatorio, self.fonte_relatorio)
+
+    def _layout_abaixo_da_legenda(self, y):
+        """Posiciona o que fica entre a legenda e o card; devolve o topo do card."""
+        return y + 10
+
+    def handle_event(self, event):
+        if event.type == pygame.VIDEORESIZE:
+            self.recalcular_layout()
+        elif event.type == pygame.MOUSEWHEEL:
+            self._painel().rolar(event.y * 26)
+            if event.x and hasattr(self._painel(), 'rolar_horizontal'):
+                self._painel().rolar_horizontal(-event.x * 26)
+        elif event.type == pygame.KEYDOWN:
+            self._rolar_por_tecla(event.key)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for b in self.botoes: b.pressed = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            for b in self.botoes:
+                if b.pressed:
+                    b.pressed = False
+                    b.checar_clique(event.pos)
+
+    def _rolar_por_tecla(self, tecla):
+        painel = self._painel()
+        acima, abaixo = (pygame.K_UP, pygame.K_k), (pygame.K_DOWN, pygame.K_j)
+        if not self.ROLAR_COM_JK:
+            acima, abaixo = acima[:1], abaixo[:1]
+        if tecla in (pygame.K_LEFT, pygame.K_RIGHT) and hasattr(painel, 'rolar_horizontal'):
+            painel.rolar_horizontal(80 if tecla == pygame.K_LEFT else -80)
+        elif tecla == pygame.K_HOME:
+            painel.scroll_y = 0
+            painel.rolar(0)
+        elif tecla == pygame.K_END:
+            painel.rolar(-float('inf'))
+        elif tecla in acima:
+            painel.rolar(20)
+        elif tecla in abaixo:
+            painel.rolar(-20)
+        elif tecla == pygame.K_PAGEUP:
+            painel.rolar(self.area_relatorio.h // 1.5)
+        elif tecla == pygame.K_PAGEDOWN:
+            painel.rolar(-self.area_relatorio.h // 1.5)
+
+    def update(self, dt):
+        mouse_pos = pygame.mouse.get_pos()
+        for b in self.botoes:
+            b.atualizar_hover(mouse_pos)
+            b.atualizar(dt)
+        self._acompanhar_tarefa()
+
+    def _acompanhar_tarefa(self):
+        pass
+
+    def animando(self):
+        # com uma tarefa rodando o progresso precisa ser redesenhado
+        return self.tarefa is not None or any(b.animando for b in self.botoes)
+
+    # ---------------- Desenho ----------------
+    def draw(self):
+        self._desenhar_cabecalho()
+        self._desenhar_card()
+
+    def _desenhar_cabecalho(self):
+        """Fundo, título, botões e legenda."""
+        self.surface.fill(COR_FUNDO_BASE)
+        draw_vignette(self.surface)
+
+        titulo_render = self.fonte_titulo.render(self.titulo, True, COR_TITULO)
+        titulo_x = (self.surface.get_width() - titulo_render.get_width()) // 2
+        self.surface.blit(titulo_render, (titulo_x, self.margin - 4))
+
+        with perfilador.secao('botoes'):
+            for b in self.botoes:
+                b.desenhar(self.surface, self.fonte_botoes)
+
+        x_leg, y_leg = self.legend_pos
+        for i, render in enumerate(self.legend_surfs):
+            self.surface.blit(render, (x_leg, y_leg + i * (self.fonte_relatorio.get_height() + 2)))
+
+    def _desenhar_card(self):
+        """Card, painel visível (com clip + scroll) e a barra de progresso da tarefa."""
+        draw_card(self.surface, self.card_rect, ajustar_claridade(COR_DESTAQUE, 1.4), radius=24)
+        self._desenhar_painel()
+        pygame.draw.rect(self.surface, ajustar_claridade(COR_TEXTO, 1.2),
+                         self.area_relatorio, width=2, border_radius=10)
+
+        if self.tarefa is not None:
+            _, fracao = self.tarefa.estado()
+            barra = pygame.Rect(self.area_relatorio.x, self.area_relatorio.bottom - 8,
+                                self.area_relatorio.w, 6)
+            draw_rounded_rect(self.surface, barra, (225, 215, 230), radius=3)
+            barra.w = int(barra.w * fracao)
+            if barra.w > 0:
+                draw_rounded_rect(self.surface, barra, COR_DESTAQUE, radius=3)
+
+    def _desenhar_painel(self):
+        self._painel().desenhar(self.surface)
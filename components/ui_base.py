@@ -1,5 +1,13 @@
+import bisect
+import math
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import accumulate
+
 import pygame
 
+from components.perfil import perfilador
+
 # =====================
 # Tema / Cores
 # =====================
@@ -19,13 +27,66 @@ def lerp_color(c1, c2, t):
 def draw_rounded_rect(surface, rect, color, radius=16, width=0):
     pygame.draw.rect(surface, color, rect, width=width, border_radius=radius)
 
-def draw_shadow(surface, rect, radius=18, offset=(0, 6), alpha=60):
-    shadow_surf = pygame.Surface((rect.width + 40, rect.height + 40), pygame.SRCALPHA)
+# =====================
+# Fontes (SysFont varre as fontes do sistema; guarde por tamanho)
+# =====================
+@lru_cache(maxsize=64)
+def obter_fonte(nome, tamanho, bold=False):
+    return pygame.font.SysFont(nome, tamanho, bold=bold)
+
+# =====================
+# Camadas estáticas (vinheta, card, sombras)
+# =====================
+class CacheCamadas:
+    """Superfícies estáticas renderizadas uma vez por tamanho e estilo.
+
+    A chave inclui o tamanho, então um resize só gera de novo as camadas
+    cujo tamanho mudou (ex.: a vinheta); as demais (sombra de botões do
+    mesmo tamanho) continuam valendo. O total fica limitado em bytes (LRU).
+    """
+
+    def __init__(self, limite_bytes=64 * 1024 * 1024):
+        self.limite_bytes = limite_bytes
+        self._camadas = OrderedDict()
+        self._bytes = 0
+
+    def obter(self, tipo, tamanho, estilo, criar):
+        chave = (tipo, tamanho, estilo)
+        camada = self._camadas.get(chave)
+        if camada is not None:
+            self._camadas.move_to_end(chave)
+            return camada
+
+        camada = criar(tamanho, *estilo)
+        self._camadas[chave] = camada
+        self._bytes += self._tamanho_bytes(camada)
+        while self._bytes > self.limite_bytes and len(self._camadas) > 1:
+            _, antiga = self._camadas.popitem(last=False)
+            self._bytes -= self._tamanho_bytes(antiga)
+        return camada
+
+    def invalidar(self, tipo=None):
+        for chave in [c for c in self._camadas if tipo is None or c[0] == tipo]:
+            self._bytes -= self._tamanho_bytes(self._camadas.pop(chave))
+
+    @staticmethod
+    def _tamanho_bytes(camada):
+        return camada.get_width() * camada.get_height() * camada.get_bytesize()
+
+camadas = CacheCamadas()
+
+def _criar_sombra(tamanho, radius, alpha):
+    w, h = tamanho
+    shadow_surf = pygame.Surface((w + 40, h + 40), pygame.SRCALPHA)
     pygame.draw.rect(shadow_surf, (0, 0, 0, alpha), shadow_surf.get_rect(), border_radius=radius+8)
+    return shadow_surf
+
+def draw_shadow(surface, rect, radius=18, offset=(0, 6), alpha=60):
+    shadow_surf = camadas.obter('sombra', rect.size, (radius, alpha), _criar_sombra)
     surface.blit(shadow_surf, (rect.x - 20 + offset[0], rect.y - 20 + offset[1]))
 
-def draw_vignette(surface):
-    w, h = surface.get_size()
+def _criar_vinheta(tamanho):
+    w, h = tamanho
     vignette = pygame.Surface((w, h), pygame.SRCALPHA)
     for i in range(40):
         alpha = int(80 * (i / 40))
@@ -35,11 +96,109 @@ def draw_vignette(surface):
             width=1,
             border_radius=max(6, int(min(w, h) * 0.02))
         )
-    surface.blit(vignette, (0, 0))
+    return vignette
+
+def draw_vignette(surface):
+    with perfilador.secao('vinheta'):
+        surface.blit(camadas.obter('vinheta', surface.get_size(), (), _criar_vinheta), (0, 0))
+
+def _criar_card(tamanho, cor_borda, radius, alpha_topo, alpha_base):
+    w, h = tamanho
+    # gradiente vertical numa coluna de 1px, esticada para a largura do card
+    coluna = pygame.Surface((1, h), pygame.SRCALPHA)
+    for i in range(h):
+        alpha = int(lerp(alpha_topo, alpha_base, i / max(1, h - 1)))
+        coluna.set_at((0, i), (255, 255, 255, alpha))
+    card_surf = pygame.transform.scale(coluna, (w, h))
+
+    mask = pygame.Surface((w, h), pygame.SRCALPHA)
+    draw_rounded_rect(mask, mask.get_rect(), (255, 255, 255, 0), radius=radius)
+    card_surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+    pygame.draw.rect(card_surf, cor_borda, card_surf.get_rect(), width=2, border_radius=radius)
+    return card_surf
+
+def draw_card(surface, rect, cor_borda, radius=24, alpha_topo=90, alpha_base=140):
+    """Card translúcido com gradiente, sombra e borda (tudo vindo do cache de camadas)."""
+    with perfilador.secao('card'):
+        draw_shadow(surface, rect, radius=radius + 4, offset=(0, 10), alpha=90)
+        card_surf = camadas.obter('card', rect.size, (cor_borda, radius, alpha_topo, alpha_base), _criar_card)
+        surface.blit(card_surf, rect)
+
+# =====================
+# Texto: medição memoizada, quebra e elipse
+# =====================
+class MedidorTexto:
+    """Memoiza larguras de texto de uma fonte; `font.size` é caro em prefixos crescentes."""
+
+    def __init__(self, fonte, limite=4096):
+        self.fonte = fonte
+        self.limite = limite
+        self._larguras = {}
+        self.espaco = self.largura(' ')
+
+    def largura(self, texto):
+        w = self._larguras.get(texto)
+        if w is None:
+            if len(self._larguras) >= self.limite:
+                self._larguras.clear()
+            w = self._larguras[texto] = self.fonte.size(texto)[0]
+        return w
+
+    def avancos(self, texto):
+        """Larguras acumuladas de cada prefixo numa só chamada, ou None se faltar glifo."""
+        metricas = self.fonte.metrics(texto)
+        if not metricas or any(m is None for m in metricas):
+            return None
+        return list(accumulate(m[4] for m in metricas))
+
+def wrap_text(surface, text, font, max_width, medidor=None):
+    """Quebra de linha por palavras (uma palavra maior que a largura fica sozinha)."""
+    if not text:
+        return [""]
+    medidor = medidor or MedidorTexto(font)
+    if medidor.largura(text) <= max_width:
+        return [text]
+    lines, cur, cur_w = [], "", 0
+    for w in text.split(" "):
+        if not w:
+            continue
+        ww = medidor.largura(w)
+        novo_w = cur_w + medidor.espaco + ww if cur else ww
+        if novo_w <= max_width:
+            cur = f'{cur} {w}' if cur else w
+            cur_w = novo_w
+        else:
+            if cur: lines.append(cur)
+            cur, cur_w = w, ww
+    if cur: lines.append(cur)
+    return lines
+
+def elide_text(font, text, max_width, medidor=None):
+    """Corta com '…' se passar do tamanho."""
+    medidor = medidor or MedidorTexto(font)
+    if medidor.largura(text) <= max_width:
+        return text
+    ell = "…"
+    avancos = medidor.avancos(text)
+    if avancos is not None:
+        # maior prefixo que, somado à elipse, ainda cabe
+        n = bisect.bisect_right(avancos, max_width - medidor.largura(ell))
+        return text[:n] + ell
+    # busca binária no tamanho
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if medidor.largura(text[:mid] + ell) <= max_width:
+            lo = mid + 1
+        else:
+            hi = mid
+    return text[:max(0, lo - 1)] + ell
 
 # =====================
 # Botão com animação
 # =====================
+VELOCIDADE_HOVER = 11.9  # ≈ 0.18 por quadro a 60 fps, agora independente do fps
+
 class Botao:
     def __init__(self, texto, acao):
         self.texto = texto
@@ -49,9 +208,17 @@ class Botao:
         self.pressed = False
         self.hover_t = 0.0  # 0 -> normal, 1 -> destaque
 
-    def desenhar(self, superficie, fonte):
+    @property
+    def animando(self):
+        return abs(self.hover_t - (1.0 if self.hover else 0.0)) > 0.002
+
+    def atualizar(self, dt):
         alvo = 1.0 if self.hover else 0.0
-        self.hover_t = lerp(self.hover_t, alvo, 0.18)
+        self.hover_t = lerp(self.hover_t, alvo, 1.0 - math.exp(-VELOCIDADE_HOVER * dt))
+        if not self.animando:
+            self.hover_t = alvo
+
+    def desenhar(self, superficie, fonte):
         cor_fundo = lerp_color(COR_FUNDO_BASE, COR_DESTAQUE, self.hover_t)
         cor_borda = lerp_color(COR_DESTAQUE, ajustar_claridade(COR_DESTAQUE, 1.4), self.hover_t)
         cor_texto = lerp_color(COR_TEXTO, COR_TEXTO_INVERSO, self.hover_t)
@@ -77,6 +244,56 @@ class Botao:
     def atualizar_hover(self, pos):
         self.hover = self.rect.collidepoint(pos)
 
+# =====================
+# Campo de texto (uma linha)
+# =====================
+class CampoTexto:
+    """Caixa de texto alimentada por eventos TEXTINPUT; chama `ao_mudar(texto)` a cada edição."""
+
+    def __init__(self, dica, ao_mudar):
+        self.dica = dica
+        self.ao_mudar = ao_mudar
+        self.texto = ''
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    def definir_texto(self, texto):
+        if texto != self.texto:
+            self.texto = texto
+            self.ao_mudar(texto)
+
+    def handle_event(self, event):
+        """Trata digitação, Backspace (Ctrl apaga a palavra) e Esc (limpa); devolve True se consumiu."""
+        if event.type == pygame.TEXTINPUT:
+            self.definir_texto(self.texto + event.text)
+            return True
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_BACKSPACE:
+                if event.mod & pygame.KMOD_CTRL:
+                    self.definir_texto(self.texto.rstrip().rpartition(' ')[0])
+                else:
+                    self.definir_texto(self.texto[:-1])
+                return True
+            if event.key == pygame.K_ESCAPE and self.texto:
+                self.definir_texto('')
+                return True
+        return False
+
+    def desenhar(self, superficie, fonte):
+        draw_rounded_rect(superficie, self.rect, COR_FUNDO_BASE, radius=12)
+        pygame.draw.rect(superficie, COR_DESTAQUE, self.rect, width=2, border_radius=12)
+        pad = max(8, self.rect.h // 4)
+        area = self.rect.inflate(-2 * pad, 0)
+        if self.texto:
+            # mostra o fim do texto (onde se digita) quando não cabe
+            texto = self.texto
+            while len(texto) > 1 and fonte.size(texto + '|')[0] > area.w:
+                texto = texto[max(1, len(texto) // 8):]
+            render = fonte.render(texto + '|', True, COR_TEXTO)
+        else:
+            render = fonte.render(self.dica, True, (160, 140, 165))
+        superficie.blit(render, (area.x, area.centery - render.get_height() // 2),
+                        pygame.Rect(0, 0, area.w, render.get_height()))
+
 # =====================
 # Layout responsivo + card translúcido
 # =====================
@@ -96,7 +313,7 @@ def calcular_layout(superficie, n_botoes):
     card_rect = pygame.Rect(x_card, y_card, largura_card, altura_card)
 
     tamanho_fonte = max(18, int(altura_botao * 0.44))
-    fonte_botoes = pygame.font.SysFont('Arial', tamanho_fonte, bold=True)
-    fonte_titulo = pygame.font.SysFont('Arial', max(22, int(altura * 0.05)), bold=True)
+    fonte_botoes = obter_fonte('Arial', tamanho_fonte, bold=True)
+    fonte_titulo = obter_fonte('Arial', max(22, int(altura * 0.05)), bold=True)
 
     return card_rect, largura_botao, altura_botao, espacamento, padding_vertical, fonte_botoes, fonte_titulo
@@ -1,59 +1,133 @@
+import time
+T_INICIO = time.perf_counter()  # referência do relatório de inicialização
+
 import pygame
 import sys
 import os
+import json
+import multiprocessing
 
 from components.ui_base import (
     COR_FUNDO_BASE, COR_DESTAQUE, ajustar_claridade,
-    draw_rounded_rect, draw_shadow, draw_vignette,
+    draw_card, draw_vignette,
     Botao, calcular_layout
 )
+from components.fundo import CarregadorFundo
+from components.perfil import perfilador, TECLA_OVERLAY, TECLA_TRACE
+from components.ui_base import obter_fonte
 
-# Importa a tela de planilha
-from screens.planilha import TelaPlanilha
-
-pygame.init()
+# As telas de análise (pandas, tkinter, motores de análise) só são importadas
+# quando abertas pela primeira vez, nos métodos go_* da TelaMenu.
 
 LARGURA_INICIAL, ALTURA_INICIAL = 500, 600
-tela = pygame.display.set_mode((LARGURA_INICIAL, ALTURA_INICIAL), pygame.RESIZABLE)
-pygame.display.set_caption('Maria Pitanga - Açaí e Gelatos')
 
-# Carrega fundo (opcional)
+# Fundo (opcional)
 ARQ_IMAGEM = 'img.png'
 BASE_DIR = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
 CAMINHO_IMAGEM = os.path.join(BASE_DIR, ARQ_IMAGEM)
 
-bg_image = None
-if os.path.exists(CAMINHO_IMAGEM):
-    try:
-        bg_image = pygame.image.load(CAMINHO_IMAGEM).convert()
-    except Exception as e:
-        print(f"Erro ao carregar a imagem: {e}")
+fundo = None
+
+# =====================
+# Relatório de inicialização
+# =====================
+marcos_inicio = []
 
-def escalar_fundo(img, tamanho):
-    if not img:
-        return None
-    largura, altura = tamanho
-    return pygame.transform.smoothscale(img, (largura, altura))
+def marcar(nome):
+    marcos_inicio.append((nome, (time.perf_counter() - T_INICIO) * 1000))
 
-bg_escalado = escalar_fundo(bg_image, tela.get_size())
+def relatorio_inicio():
+    """Imprime o tempo até o primeiro quadro; com MP_RELATORIO_INICIO, grava em JSON lines."""
+    print('⏱️ Inicialização: ' + ', '.join(f'{nome} {ms:.0f} ms' for nome, ms in marcos_inicio))
+    destino = os.environ.get('MP_RELATORIO_INICIO')
+    if destino:
+        registro = {'quando': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'marcos_ms': {nome: round(ms, 1) for nome, ms in marcos_inicio}}
+        with open(destino, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro) + '\n')
 
 # =====================
 # Gerenciador de telas
 # =====================
+ESPERA_MAXIMA_MS = 1000  # mesmo ocioso, acorda de vez em quando
+ATRASO_RESIZE_MS = 150   # só o tamanho final de um arrasto refaz o layout
+
 class ScreenManager:
-    def __init__(self):
+    """Pilha de telas. No modo por eventos só redesenha quando algo mudou:
+    houve entrada/resize (tela suja) ou a tela ativa está animando."""
+
+    def __init__(self, modo_eventos=True):
         self.stack = []
+        self.modo_eventos = modo_eventos
+        self.sujo = True
+
+        # resize com debounce: durante o arrasto mostra o último quadro escalado
+        self.resize_pendente = None
+        self.resize_prazo = 0
+        self.quadro_anterior = None
 
     def push(self, screen):
         self.stack.append(screen)
+        self.invalidar()
 
     def pop(self):
         if self.stack:
             self.stack.pop()
+        self.invalidar()
 
     def current(self):
         return self.stack[-1] if self.stack else None
 
+    def invalidar(self):
+        self.sujo = True
+
+    def animando(self):
+        scr = self.current()
+        return bool(scr and scr.animando())
+
+    def precisa_desenhar(self):
+        return (not self.modo_eventos or self.sujo or self.animando()
+                or self.resize_pendente is not None)
+
+    # ---------------- Resize ----------------
+    def agendar_resize(self, tamanho):
+        self.resize_pendente = tamanho
+        self.resize_prazo = pygame.time.get_ticks() + ATRASO_RESIZE_MS
+
+    def resize_concluido(self):
+        """Devolve o tamanho final quando o arrasto parou há ATRASO_RESIZE_MS."""
+        if self.resize_pendente is None or pygame.time.get_ticks() < self.resize_prazo:
+            return None
+        tamanho, self.resize_pendente = self.resize_pendente, None
+        return tamanho
+
+    def repassar_resize(self, tamanho):
+        # todas as telas da pilha recebem, não só a ativa (o menu volta já ajustado)
+        evento = pygame.event.Event(pygame.VIDEORESIZE, size=tamanho, w=tamanho[0], h=tamanho[1])
+        for scr in self.stack:
+            scr.handle_event(evento)
+        self.invalidar()
+
+    def guardar_quadro(self, tela):
+        if self.quadro_anterior is None or self.quadro_anterior.get_size() != tela.get_size():
+            self.quadro_anterior = tela.copy()
+        else:
+            self.quadro_anterior.blit(tela, (0, 0))
+
+    def desenhar_quadro_escalado(self, tela):
+        if self.quadro_anterior is not None:
+            pygame.transform.scale(self.quadro_anterior, tela.get_size(), tela)
+
+    def proximos_eventos(self, clock):
+        """Devolve (dt, eventos); bloqueia em event.wait quando nada está animando."""
+        if self.precisa_desenhar():
+            dt = clock.tick(60) / 1000.0
+            return dt, pygame.event.get()
+        evento = pygame.event.wait(ESPERA_MAXIMA_MS)
+        clock.tick()  # o tempo ocioso não entra no dt das animações
+        eventos = [evento] if evento.type != pygame.NOEVENT else []
+        return 0.0, eventos + pygame.event.get()
+
 manager = ScreenManager()
 
 # =====================
@@ -66,15 +140,28 @@ class TelaMenu:
 
         self.botoes = [
             Botao('Análise de Planilha', self.go_planilha),
-            Botao('Análise de Documentos', lambda: print('Análise de Documentos iniciada!')),
-            Botao('Análise de Imagem', lambda: print('Análise de Imagem iniciada!')),
-            Botao('Análise de Dados', lambda: print('Análise de Dados iniciada!')),
+            Botao('Análise de Documentos', self.go_documentos),
+            Botao('Análise de Imagem', self.go_imagem),
+            Botao('Análise de Dados', self.go_dados),
         ]
         self.recalcular_layout()
 
     def go_planilha(self):
+        from screens.planilha import TelaPlanilha
         manager.push(TelaPlanilha(self.surface, on_voltar=manager.pop))
 
+    def go_dados(self):
+        from screens.dados import TelaDados
+        manager.push(TelaDados(self.surface, on_voltar=manager.pop))
+
+    def go_documentos(self):
+        from screens.documentos import TelaDocumentos
+        manager.push(TelaDocumentos(self.surface, on_voltar=manager.pop))
+
+    def go_imagem(self):
+        from screens.imagem import TelaImagem
+        manager.push(TelaImagem(self.surface, on_voltar=manager.pop))
+
     def recalcular_layout(self):
         (self.card_rect, self.largura_botao, self.altura_botao,
          self.espacamento, self.padding_vertical,
@@ -103,29 +190,23 @@ class TelaMenu:
         mouse_pos = pygame.mouse.get_pos()
         for botao in self.botoes:
             botao.atualizar_hover(mouse_pos)
+            botao.atualizar(dt)
+
+    def animando(self):
+        return any(b.animando for b in self.botoes)
 
     def draw(self):
         # fundo
-        if bg_escalado is not None:
-            self.surface.blit(bg_escalado, (0, 0))
-        else:
-            self.surface.fill(COR_FUNDO_BASE)
+        with perfilador.secao('fundo'):
+            if fundo is not None:
+                self.surface.blit(fundo.obter(self.surface.get_size()), (0, 0))
+            else:
+                self.surface.fill(COR_FUNDO_BASE)
 
         draw_vignette(self.surface)
 
         # Card translúcido
-        card_surf = pygame.Surface(self.card_rect.size, pygame.SRCALPHA)
-        for i in range(self.card_rect.height):
-            import components.ui_base as ui_base
-            alpha = int(ui_base.lerp(90, 140, i / max(1, self.card_rect.height - 1)))
-            pygame.draw.rect(card_surf, (255, 255, 255, alpha), (0, i, self.card_rect.width, 1))
-        mask = pygame.Surface(self.card_rect.size, pygame.SRCALPHA)
-        draw_rounded_rect(mask, mask.get_rect(), (255, 255, 255, 0), radius=24)
-        card_surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-
-        draw_shadow(self.surface, self.card_rect, radius=28, offset=(0, 10), alpha=90)
-        self.surface.blit(card_surf, self.card_rect)
-        pygame.draw.rect(self.surface, ajustar_claridade(COR_DESTAQUE, 1.4), self.card_rect, width=2, border_radius=24)
+        draw_card(self.surface, self.card_rect, ajustar_claridade(COR_DESTAQUE, 1.4), radius=24)
 
         titulo_render = self.fonte_titulo.render(self.titulo, True, (255, 255, 255))
         self.surface.blit(
@@ -134,36 +215,96 @@ class TelaMenu:
              self.card_rect.y - max(8, titulo_render.get_height()) - 8),
         )
 
-        for botao in self.botoes:
-            botao.desenhar(self.surface, self.fonte_botoes)
+        with perfilador.secao('botoes'):
+            for botao in self.botoes:
+                botao.desenhar(self.surface, self.fonte_botoes)
 
 # =====================
 # Loop principal
 # =====================
-clock = pygame.time.Clock()
-manager.push(TelaMenu(tela))
-
-rodando = True
-while rodando:
-    dt = clock.tick(60) / 1000.0
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            rodando = False
-        elif event.type == pygame.VIDEORESIZE:
-            tela = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-            bg_escalado = escalar_fundo(bg_image, (event.w, event.h))
-        # repassa evento à tela ativa
+def main():
+    global fundo
+
+    marcar('imports')
+    pygame.init()
+    tela = pygame.display.set_mode((LARGURA_INICIAL, ALTURA_INICIAL), pygame.RESIZABLE)
+    pygame.display.set_caption('Maria Pitanga - Açaí e Gelatos')
+    marcar('janela')
+
+    # o fundo é decodificado numa thread; o primeiro quadro sai com a cor base
+    carregador = CarregadorFundo(CAMINHO_IMAGEM)
+
+    clock = pygame.time.Clock()
+    manager.push(TelaMenu(tela))
+    primeiro_quadro = True
+
+    rodando = True
+    while rodando:
+        dt, eventos = manager.proximos_eventos(clock)
+        perfilador.iniciar_quadro()
+        with perfilador.secao('eventos'):
+            for event in eventos:
+                manager.invalidar()
+                if event.type == pygame.QUIT:
+                    rodando = False
+                elif event.type == pygame.VIDEORESIZE:
+                    manager.agendar_resize((event.w, event.h))
+                    continue  # as telas só recebem o tamanho final
+                elif event.type == pygame.KEYDOWN and event.key == TECLA_OVERLAY:
+                    perfilador.alternar()
+                    continue
+                elif event.type == pygame.KEYDOWN and event.key == TECLA_TRACE:
+                    print(f'Trace gravado em {perfilador.salvar_trace()}')
+                    continue
+                # repassa evento à tela ativa
+                scr = manager.current()
+                if scr:
+                    scr.handle_event(event)
+
+        tamanho = manager.resize_concluido()
+        if tamanho:
+            tela = pygame.display.set_mode(tamanho, pygame.RESIZABLE)
+            manager.repassar_resize(tamanho)
+
+        # atualiza e desenha tela ativa
         scr = manager.current()
         if scr:
-            scr.handle_event(event)
+            # avaliado antes do update: o quadro em que uma animação termina também é desenhado
+            desenhar = manager.precisa_desenhar()
+            with perfilador.secao('update'):
+                scr.update(dt)
+            if desenhar or manager.precisa_desenhar():
+                with perfilador.secao('draw'):
+                    if manager.resize_pendente is not None:
+                        manager.desenhar_quadro_escalado(tela)
+                    else:
+                        scr.draw()
+                        manager.guardar_quadro(tela)
+                # fora do quadro guardado, para não aparecer escalado no resize
+                perfilador.desenhar(tela, obter_fonte('Consolas, Menlo, Courier New, monospace', 13))
+                with perfilador.secao('flip'):
+                    pygame.display.flip()
+                manager.sujo = False
+                if primeiro_quadro:
+                    primeiro_quadro = False
+                    marcar('primeiro quadro')
+
+        if carregador is not None and carregador.pronto:
+            fundo, carregador = carregador.obter(), None
+            manager.invalidar()
+            marcar('fundo carregado')
+            relatorio_inicio()
 
-    # atualiza e desenha tela ativa
-    scr = manager.current()
-    if scr:
-        scr.update(dt)
-        scr.draw()
+        # fundo: o quadro acima usou a escala rápida; suaviza uma vez e redesenha
+        if fundo is not None and manager.resize_pendente is None and fundo.refinar():
+            manager.invalidar()
+        perfilador.fim_quadro()
 
-    pygame.display.flip()
+    pygame.quit()
+    sys.exit()
 
-pygame.quit()
-sys.exit()
+# A análise de abas usa processos filhos; no Windows (spawn) eles reimportam
+# este módulo, então a janela só pode abrir no processo principal.
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
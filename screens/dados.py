@@ -0,0 +1,196 @@
+import os
+import math
+import threading
+
+from components.ui_base import Botao
+from components.tela_base import TelaAnalise
+from components.relatorio import PainelRelatorio
+from components.tabela import PainelTabela
+from components.perfil import perfilador
+from analise.tarefas import Tarefa
+
+def _precarregar_pivot():
+    import analise.pivot  # noqa: F401  (pandas leva ~1 s; melhor antes do clique)
+
+def _montar_cubo(caminho, **kwargs):
+    # roda na thread da tarefa: o import do pandas nunca trava o loop do pygame
+    from analise import pivot
+    return pivot.cubo_com_cache(caminho, **kwargs)
+
+def _fmt_celula(valor):
+    if valor is None or (isinstance(valor, float) and math.isnan(valor)):
+        return '—'
+    if isinstance(valor, float):
+        return f'{valor:,.2f}'.replace(',', '_').replace('.', ',').replace('_', '.')
+    if isinstance(valor, int):
+        return f'{valor:,}'.replace(',', '.')
+    if hasattr(valor, 'strftime'):
+        try:
+            return valor.strftime('%d/%m/%Y')
+        except ValueError:  # NaT
+            return '—'
+    return str(valor)
+
+
+class TabelaFatia:
+    """Fonte de dados do PainelTabela sobre uma fatia do cubo (um DataFrame pequeno)."""
+
+    def __init__(self, df):
+        self.df = df
+        self.colunas = [str(c) for c in df.columns]
+        self.total_linhas = len(df)
+
+    def linhas(self, inicio, fim):
+        trecho = self.df.iloc[max(0, inicio):fim]
+        return [[_fmt_celula(v) for v in linha] for linha in trecho.itertuples(index=False)]
+
+
+class TelaDados(TelaAnalise):
+    def __init__(self, surface, on_voltar):
+        super().__init__(surface, on_voltar, 'Análise de Dados')
+
+        self.arquivo = None
+        self.cubo = None
+        self.dimensao = None      # agrupar por...
+        self.dimensao_2 = None    # ...e por (opcional)
+        self.ordem = None         # coluna de valor para ordenar (None = pelas dimensões)
+        self.mensagens = PainelRelatorio()
+        self.tabela = PainelTabela()
+
+        # Botões
+        self.bt_escolher = Botao('Escolher Arquivo', self.escolher_arquivo)
+        self.bt_cancelar = Botao('Cancelar', self.cancelar)
+        self.bt_dimensao = Botao('Agrupar por: —', self.proxima_dimensao)
+        self.bt_dimensao_2 = Botao('E por: —', self.proxima_dimensao_2)
+        self.bt_ordem = Botao('Ordenar: dimensões', self.proxima_ordem)
+        self.bt_voltar = Botao('← Voltar', self.voltar)
+        self.botoes = [self.bt_escolher, self.bt_cancelar, self.bt_dimensao,
+                       self.bt_dimensao_2, self.bt_ordem, self.bt_voltar]
+
+        self.mensagens.definir_linhas(['Escolha uma planilha (.csv, .xlsx ou .xls) com as vendas.',
+                                       'O arquivo é lido uma vez; trocar o agrupamento não relê os dados.'])
+        self.recalcular_layout()
+        threading.Thread(target=_precarregar_pivot, daemon=True).start()
+
+    # ---------------- UI/Layout ----------------
+    def texto_legenda(self):
+        """Arquivo e tamanho do cubo."""
+        texto = f'Arquivo: {os.path.basename(self.arquivo) if self.arquivo else "nenhum selecionado"}'
+        if self.cubo is not None:
+            texto += (f' | {self.cubo.linhas_lidas:,} linhas -> {self.cubo.combinacoes:,} combinações'
+                      .replace(',', '.'))
+        return texto
+
+    def _paineis(self):
+        return [self.mensagens, self.tabela]
+
+    def _painel(self):
+        """Tabela da fatia quando o cubo existe; senão as mensagens."""
+        return self.tabela if self.cubo is not None and self.tarefa is None else self.mensagens
+
+    def _acompanhar_tarefa(self):
+        if self.tarefa is None:
+            return
+        if not self.tarefa.concluida:
+            etapa, fracao = self.tarefa.estado()
+            linhas = [f'⏳ {etapa}... {int(fracao * 100)}%', 'Clique em "Cancelar" para interromper.']
+            if linhas != self.mensagens.linhas:
+                self.mensagens.definir_linhas(linhas)
+            return
+
+        tarefa, self.tarefa = self.tarefa, None
+        perfilador.registrar_etapas('cubo', tarefa.etapas)
+        if tarefa.cancelada:
+            self.mensagens.definir_linhas(['⛔ Leitura cancelada.'])
+        elif tarefa.erro is not None:
+            self.mensagens.definir_linhas([f'Erro ao agregar: {tarefa.erro}'])
+        else:
+            self.cubo = tarefa.resultado
+            opcoes = self.cubo.dimensoes_fatia
+            self.dimensao = opcoes[0] if opcoes else None
+            self.dimensao_2 = None
+            self.ordem = None
+            if self.cubo.linhas_lidas == 0:
+                self.mensagens.definir_linhas(['O arquivo não tem linhas de dados.'])
+                self.cubo = None
+            self._atualizar_fatia()
+            self.recalcular_layout()  # legenda com linhas e combinações
+
+    # ---------------- Fatias ----------------
+    def _atualizar_fatia(self):
+        """Refaz a tabela a partir do cubo (group-by sobre o cubo, sem reler o arquivo)."""
+        self.bt_dimensao.texto = f'Agrupar por: {self.dimensao or "—"}'
+        self.bt_dimensao_2.texto = f'E por: {self.dimensao_2 or "—"}'
+        self.bt_ordem.texto = f'Ordenar: {self.ordem or "dimensões"}'
+        if self.cubo is None:
+            return
+        dimensoes = [d for d in (self.dimensao, self.dimensao_2) if d]
+        fatia = self.cubo.fatiar(dimensoes)
+        if self.ordem is not None and self.ordem in fatia.columns:
+            fatia = fatia.sort_values(self.ordem, ascending=False, kind='stable')
+        self.tabela.definir_fonte_dados(TabelaFatia(fatia))
+        self.tabela.definir_layout(self.area_relatorio, self.fonte_relatorio)
+
+    def _proxima(self, atual, opcoes):
+        if not opcoes:
+            return None
+        i = opcoes.index(atual) if atual in opcoes else -1
+        return opcoes[(i + 1) % len(opcoes)]
+
+    def proxima_dimensao(self):
+        if self.cubo is None:
+            return
+        self.dimensao = self._proxima(self.dimensao, self.cubo.dimensoes_fatia)
+        if self.dimensao_2 == self.dimensao:
+            self.dimensao_2 = None
+        self._atualizar_fatia()
+
+    def proxima_dimensao_2(self):
+        if self.cubo is None:
+            return
+        opcoes = [None] + [d for d in self.cubo.dimensoes_fatia if d != self.dimensao]
+        self.dimensao_2 = self._proxima(self.dimensao_2, opcoes)
+        self._atualizar_fatia()
+
+    def proxima_ordem(self):
+        if self.cubo is None:
+            return
+        valores = ['linhas'] + [f'soma de {m}' for m in self.cubo.medidas] + [f'média de {m}' for m in self.cubo.medidas]
+        self.ordem = self._proxima(self.ordem, [None] + valores)
+        self._atualizar_fatia()
+
+    # ---------------- Ações ----------------
+    def escolher_arquivo(self):
+        try:
+            from tkinter import Tk, filedialog
+            root = Tk(); root.withdraw(); root.wm_attributes('-topmost', 1)
+            caminho = filedialog.askopenfilename(
+                title='Selecione a planilha de vendas',
+                filetypes=[('Planilhas', '*.xlsx *.xls *.csv'), ('Todos', '*.*')]
+            )
+            root.destroy()
+        except Exception as e:
+            self.mensagens.definir_linhas([f'Erro ao abrir seletor de arquivos: {e}'])
+            return
+        if caminho:
+            self.abrir(caminho)
+
+    def abrir(self, caminho):
+        """Lê o arquivo em segundo plano e monta o cubo de agregados (ou pega do cache)."""
+        if self.tarefa is not None:
+            self.tarefa.cancelar()  # descarta a leitura do arquivo anterior
+        self.arquivo = caminho
+        self.cubo = None
+        self.tabela.definir_fonte_dados(None)
+        self.tarefa = Tarefa(_montar_cubo, caminho).iniciar()
+        self.mensagens.definir_linhas(['⏳ Lendo arquivo... 0%'])
+        self._atualizar_fatia()
+        self.recalcular_layout()
+
+    def cancelar(self):
+        if self.tarefa is not None:
+            self.tarefa.cancelar()
+
+    def voltar(self):
+        self.cancelar()
+        self.on_voltar()
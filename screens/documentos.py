@@ -0,0 +1,245 @@
+import os
+import time
+from collections import OrderedDict
+import pygame
+
+from components.ui_base import Botao, CampoTexto, obter_fonte
+from components.tela_base import TelaAnalise
+from components.relatorio import PainelRelatorio
+from components.perfil import perfilador
+from analise.tarefas import Tarefa, TarefaCancelada
+
+MAX_TRECHOS = 10          # resultados do topo que ganham uma linha de trecho (lida do arquivo)
+MAX_TRECHOS_CACHE = 512   # trechos guardados por (arquivo, mtime, termos)
+ATRASO_BUSCA_MS = 150     # a consulta espera a digitação parar por este tempo
+
+def _indexar(pasta, **kwargs):
+    # roda na thread da tarefa: listar e tokenizar nunca trava o loop do pygame
+    from analise.documentos import indexar_pasta
+    return indexar_pasta(pasta, **kwargs)
+
+def _ler_trechos(pendentes, progresso=None, cancelado=None):
+    # roda na thread da tarefa: cada trecho lê até 1 MiB do arquivo
+    from analise.documentos import trecho
+    achados = {}
+    for i, (chave, caminho, termos) in enumerate(pendentes):
+        if cancelado():
+            raise TarefaCancelada()
+        progresso('Lendo trechos', i / len(pendentes))
+        achados[chave] = trecho(caminho, termos)
+    return achados
+
+def _chave_trecho(resultado):
+    return resultado.caminho, resultado.mtime_ns, tuple(resultado.termos)
+
+def _fechar_resultado(resultado):
+    indice, _ = resultado
+    indice.fechar()
+
+
+class TelaDocumentos(TelaAnalise):
+    COLUNAS_LARGO = 4
+    ROLAR_COM_JK = False   # j/k ficam para a digitação
+
+    def __init__(self, surface, on_voltar):
+        super().__init__(surface, on_voltar, 'Análise de Documentos')
+
+        self.pasta = None
+        self.indice = None
+        self.contagens = None
+        self.relatorio = PainelRelatorio()
+        self.campo = CampoTexto('Buscar nos documentos...', self.buscar)
+        self._busca_pendente = None   # texto ainda não consultado (debounce)
+        self._prazo_busca = 0
+        self._consulta = None         # (texto, termos, ms, resultados) da última busca
+        self._trechos = OrderedDict()
+        self.tarefa_trechos = None
+
+        # Botões
+        self.bt_escolher = Botao('Escolher Pasta', self.escolher_pasta)
+        self.bt_atualizar = Botao('Atualizar Índice', self.atualizar_indice)
+        self.bt_cancelar = Botao('Cancelar', self.cancelar)
+        self.bt_voltar = Botao('← Voltar', self.voltar)
+        self.botoes = [self.bt_escolher, self.bt_atualizar, self.bt_cancelar, self.bt_voltar]
+        self.fonte_campo = None
+
+        self.relatorio.definir_linhas(['Escolha a pasta com os documentos (.txt, .csv, .md, ...).',
+                                       'A primeira indexação lê tudo; depois só os arquivos alterados.'])
+        self.recalcular_layout()
+        pygame.key.start_text_input()
+
+    # ---------------- UI/Layout ----------------
+    def texto_legenda(self):
+        """Pasta e documentos indexados."""
+        texto = f'Pasta: {self.pasta if self.pasta else "nenhuma selecionada"}'
+        if self.indice is not None and self.tarefa is None:
+            texto += f' | {self.indice.total_documentos:,} documentos indexados'.replace(',', '.')
+        return texto
+
+    def _layout_abaixo_da_legenda(self, y):
+        # campo de busca entre a legenda e o card
+        w = self.surface.get_width()
+        campo_h = max(36, int(self.btn_h * 0.75))
+        self.fonte_campo = obter_fonte('Arial', max(15, int(campo_h * 0.45)))
+        self.campo.rect = pygame.Rect(self.margin, y + 8, w - 2 * self.margin, campo_h)
+        pygame.key.set_text_input_rect(self.campo.rect)
+        return self.campo.rect.bottom + 10
+
+    def handle_event(self, event):
+        if event.type == pygame.VIDEORESIZE or not self.campo.handle_event(event):
+            super().handle_event(event)
+
+    def _acompanhar_tarefa(self):
+        if self.tarefa is None:
+            return
+        if not self.tarefa.concluida:
+            etapa, fracao = self.tarefa.estado()
+            linhas = [f'⏳ {etapa}... {int(fracao * 100)}%', 'Clique em "Cancelar" para interromper.']
+            if linhas != self.relatorio.linhas:
+                self.relatorio.definir_linhas(linhas)
+            return
+
+        tarefa, self.tarefa = self.tarefa, None
+        perfilador.registrar_etapas('indice', tarefa.etapas)
+        if tarefa.cancelada:
+            # o que já foi gravado continua no índice; "Atualizar Índice" termina o resto
+            self.relatorio.definir_linhas(['⛔ Indexação cancelada.'])
+        elif tarefa.erro is not None:
+            self.relatorio.definir_linhas([f'Erro ao indexar: {tarefa.erro}'])
+        else:
+            self.indice, self.contagens = tarefa.resultado
+            self._trechos.clear()
+            self._consultar(self.campo.texto)
+        self.recalcular_layout()  # legenda com o total de documentos
+
+    def update(self, dt):
+        super().update(dt)
+        if self._busca_pendente is not None and pygame.time.get_ticks() >= self._prazo_busca:
+            self._consultar(self._busca_pendente)
+        self._acompanhar_trechos()
+
+    def animando(self):
+        return (super().animando() or self._busca_pendente is not None
+                or self.tarefa_trechos is not None)
+
+    def _acompanhar_trechos(self):
+        if self.tarefa_trechos is None or not self.tarefa_trechos.concluida:
+            return
+        tarefa, self.tarefa_trechos = self.tarefa_trechos, None
+        if tarefa.resultado:
+            self._trechos.update(tarefa.resultado)
+            while len(self._trechos) > MAX_TRECHOS_CACHE:
+                self._trechos.popitem(last=False)
+            self._mostrar_resultados()
+
+    def draw(self):
+        self._desenhar_cabecalho()
+        self.campo.desenhar(self.surface, self.fonte_campo)
+        self._desenhar_card()
+
+    # ---------------- Busca ----------------
+    def buscar(self, texto):
+        """Chamado a cada tecla: só agenda a consulta para quando a digitação parar."""
+        self._busca_pendente = texto
+        self._prazo_busca = pygame.time.get_ticks() + ATRASO_BUSCA_MS
+
+    def _consultar(self, texto):
+        """BM25 no índice (poucos milissegundos); os trechos são lidos numa Tarefa."""
+        self._busca_pendente = None
+        if self.indice is None or self.tarefa is not None:
+            return
+        from analise.documentos import tokenizar
+        termos = tokenizar(texto)
+        if not termos:
+            self._consulta = None
+            novos, removidos, inalterados = self.contagens
+            self.relatorio.definir_linhas([
+                f'✅ Índice atualizado: {novos} novos ou alterados, {removidos} removidos, {inalterados} sem mudança.',
+                'Digite no campo acima para buscar (acentos e maiúsculas não importam).'])
+            return
+
+        with perfilador.secao('busca'):
+            inicio = time.perf_counter()
+            resultados = self.indice.buscar(texto)
+            self._consulta = (texto, termos, (time.perf_counter() - inicio) * 1000, resultados)
+            self._mostrar_resultados()
+
+        self._cancelar_trechos()  # trechos de uma consulta que já mudou
+        pendentes = [(_chave_trecho(r), r.caminho, r.termos) for r in resultados[:MAX_TRECHOS]
+                     if _chave_trecho(r) not in self._trechos]
+        if pendentes:
+            self.tarefa_trechos = Tarefa(_ler_trechos, pendentes).iniciar()
+
+    def _cancelar_trechos(self):
+        if self.tarefa_trechos is not None:
+            self.tarefa_trechos.cancelar()
+            self.tarefa_trechos = None
+
+    def _mostrar_resultados(self):
+        """Lista da última consulta, com os trechos já lidos (os outros entram quando chegarem)."""
+        if self._consulta is None:
+            return
+        texto, termos, ms, resultados = self._consulta
+        linhas = [f'🔎 {len(resultados)} documento(s) em {ms:.1f} ms' if resultados
+                  else f'🔎 Nenhum documento com "{texto.strip()}".']
+        for i, r in enumerate(resultados, start=1):
+            nome = os.path.relpath(r.caminho, self.indice.pasta)
+            faltam = [t for t in dict.fromkeys(termos) if t not in r.termos]
+            linhas.append(f'{i}. {nome}  ({r.pontuacao:.2f})' + (f'  sem: {", ".join(faltam)}' if faltam else ''))
+            if i <= MAX_TRECHOS:
+                achado = self._trechos.get(_chave_trecho(r))
+                if achado:
+                    self._trechos.move_to_end(_chave_trecho(r))
+                    linhas.append(f'    {achado}')
+        self.relatorio.definir_linhas(linhas)
+
+    # ---------------- Ações ----------------
+    def escolher_pasta(self):
+        try:
+            from tkinter import Tk, filedialog
+            root = Tk(); root.withdraw(); root.wm_attributes('-topmost', 1)
+            pasta = filedialog.askdirectory(title='Selecione a pasta dos documentos')
+            root.destroy()
+        except Exception as e:
+            self.relatorio.definir_linhas([f'Erro ao abrir seletor de pastas: {e}'])
+            return
+        if pasta:
+            self.abrir(pasta)
+
+    def abrir(self, pasta):
+        """Abre o índice da pasta e atualiza em segundo plano só o que mudou desde a última vez."""
+        self._descartar_tarefa()  # indexação da pasta anterior
+        self._cancelar_trechos()
+        self._fechar_indice()
+        self.pasta = pasta
+        self.atualizar_indice()
+
+    def atualizar_indice(self):
+        if self.pasta is None or self.tarefa is not None:
+            return
+        self._fechar_indice()
+        self.tarefa = Tarefa(_indexar, self.pasta).iniciar()
+        self.relatorio.definir_linhas(['⏳ Listando arquivos... 0%'])
+        self.recalcular_layout()
+
+    def _fechar_indice(self):
+        if self.indice is not None:
+            self.indice.fechar()
+            self.indice = None
+
+    def _descartar_tarefa(self):
+        # a indexação pode terminar depois do cancelamento: o índice que ela devolver é fechado
+        if self.tarefa is not None:
+            self.tarefa.descartar(_fechar_resultado)
+            self.tarefa = None
+
+    def cancelar(self):
+        if self.tarefa is not None:
+            self.tarefa.cancelar()
+
+    def voltar(self):
+        self._descartar_tarefa()
+        self._cancelar_trechos()
+        self._fechar_indice()
+        pygame.key.stop_text_input()
+        self.on_voltar()
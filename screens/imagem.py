@@ -0,0 +1,136 @@
+import os
+import pygame
+
+from components.ui_base import Botao
+from components.tela_base import TelaAnalise
+from components.relatorio import PainelRelatorio
+from components.graficos import GraficoHistograma, GraficoPaleta
+from components.perfil import perfilador
+from analise.tarefas import Tarefa
+
+CORES_CANAIS = ((200, 40, 40), (40, 150, 60), (40, 80, 200))
+
+def _analisar(caminho, **kwargs):
+    # roda na thread da tarefa: carregar e varrer a imagem nunca trava o loop do pygame
+    from analise.imagem import analisar_imagem
+    return analisar_imagem(caminho, **kwargs)
+
+
+class ItemMiniatura:
+    """Miniatura da imagem como item do PainelRelatorio (reduzida se a área for estreita)."""
+
+    def __init__(self, surface):
+        self.original = surface
+        self._largura = None
+        self._surface = surface
+
+    @property
+    def altura(self):
+        return self._surface.get_height()
+
+    def superficie(self, largura):
+        if largura != self._largura:
+            w, h = self.original.get_size()
+            if w > largura > 0:
+                self._surface = pygame.transform.smoothscale(self.original, (largura, max(1, h * largura // w)))
+            else:
+                self._surface = self.original
+            self._largura = largura
+        return self._surface
+
+
+def itens_relatorio(analise):
+    """Miniatura, linhas de texto, paleta de cores dominantes e histogramas da análise."""
+    itens = []
+    if analise.miniatura is not None:
+        itens += [ItemMiniatura(analise.miniatura), '']
+    itens += analise.linhas_relatorio()
+    if len(analise.cores):
+        itens.append(GraficoPaleta(analise.cores, analise.fracoes))
+    itens += ['', '📶 Histogramas']
+    for nome, contagens, cor in zip(('vermelho', 'verde', 'azul'), analise.estat.hist, CORES_CANAIS):
+        itens += [f'  canal {nome} (0-255)', GraficoHistograma(contagens, cor)]
+    itens += ['  luminância (0-255)', GraficoHistograma(analise.estat.hist_luma)]
+    return itens
+
+
+class TelaImagem(TelaAnalise):
+    def __init__(self, surface, on_voltar):
+        super().__init__(surface, on_voltar, 'Análise de Imagem')
+
+        self.arquivo = None
+        self.analise = None
+        self.relatorio = PainelRelatorio()
+
+        # Botões
+        self.bt_escolher = Botao('Escolher Imagem', self.escolher_arquivo)
+        self.bt_cancelar = Botao('Cancelar', self.cancelar)
+        self.bt_voltar = Botao('← Voltar', self.voltar)
+        self.botoes = [self.bt_escolher, self.bt_cancelar, self.bt_voltar]
+
+        self.relatorio.definir_linhas(['Escolha uma imagem (.png, .jpg, .bmp, ...).',
+                                       'Fotos grandes são analisadas em blocos, sem travar a janela.'])
+        self.recalcular_layout()
+
+    # ---------------- UI/Layout ----------------
+    def texto_legenda(self):
+        """Arquivo e dimensões."""
+        texto = f'Arquivo: {os.path.basename(self.arquivo) if self.arquivo else "nenhum selecionado"}'
+        if self.analise is not None:
+            texto += ' | {} x {} px'.format(*self.analise.tamanho)
+        return texto
+
+    def _acompanhar_tarefa(self):
+        if self.tarefa is None:
+            return
+        if not self.tarefa.concluida:
+            etapa, fracao = self.tarefa.estado()
+            linhas = [f'⏳ {etapa}... {int(fracao * 100)}%', 'Clique em "Cancelar" para interromper.']
+            if linhas != self.relatorio.linhas:
+                self.relatorio.definir_linhas(linhas)
+            return
+
+        tarefa, self.tarefa = self.tarefa, None
+        perfilador.registrar_etapas('imagem', tarefa.etapas)
+        if tarefa.cancelada:
+            self.relatorio.definir_linhas(['⛔ Análise cancelada.'])
+        elif tarefa.erro is not None:
+            self.relatorio.definir_linhas([f'Erro ao analisar a imagem: {tarefa.erro}'])
+        else:
+            self.analise = tarefa.resultado
+            self.relatorio.definir_linhas(itens_relatorio(self.analise))
+            self.recalcular_layout()  # legenda com as dimensões
+
+    # ---------------- Ações ----------------
+    def escolher_arquivo(self):
+        try:
+            from tkinter import Tk, filedialog
+            root = Tk(); root.withdraw(); root.wm_attributes('-topmost', 1)
+            caminho = filedialog.askopenfilename(
+                title='Selecione a imagem',
+                filetypes=[('Imagens', '*.png *.jpg *.jpeg *.bmp *.gif *.tga *.webp'), ('Todos', '*.*')]
+            )
+            root.destroy()
+        except Exception as e:
+            self.relatorio.definir_linhas([f'Erro ao abrir seletor de arquivos: {e}'])
+            return
+        if caminho:
+            self.abrir(caminho)
+
+    def abrir(self, caminho):
+        """Analisa a imagem em segundo plano (blocos num pool de threads)."""
+        if self.tarefa is not None:
+            self.tarefa.cancelar()  # descarta a análise da imagem anterior
+        self.arquivo = caminho
+        self.analise = None
+        self.tarefa = Tarefa(_analisar, caminho).iniciar()
+        self.relatorio.definir_linhas(['⏳ Carregando imagem... 0%'])
+        self.recalcular_layout()
+
+    def cancelar(self):
+        if self.tarefa is not None:
+            self.tarefa.cancelar()
+
+    def voltar(self):
+        self.cancelar()
+        self.on_voltar()
@@ -1,260 +1,205 @@
 import os
-import math
+import threading
 import pygame
-import pandas as pd
-from tkinter import Tk, filedialog
-
-from components.ui_base import (
-    COR_FUNDO_BASE, COR_DESTAQUE, COR_TEXTO,
-    ajustar_claridade, draw_rounded_rect, draw_shadow, draw_vignette,
-    Botao
-)
-
-def wrap_text(surface, text, font, max_width):
-    """Quebra de linha com elipse final se ultrapassar muitas linhas."""
-    if not text:
-        return [""]
-    words = text.split(" ")
-    lines, cur = [], ""
-    for w in words:
-        test = (cur + " " + w).strip()
-        if font.size(test)[0] <= max_width:
-            cur = test
-        else:
-            if cur: lines.append(cur)
-            cur = w
-    if cur: lines.append(cur)
-    return lines
-
-def elide_text(font, text, max_width):
-    """Corta com '…' se passar do tamanho."""
-    if font.size(text)[0] <= max_width:
-        return text
-    ell = "…"
-    # busca binária no tamanho
-    lo, hi = 0, len(text)
-    while lo < hi:
-        mid = (lo + hi) // 2
-        t = text[:mid] + ell
-        if font.size(t)[0] <= max_width:
-            lo = mid + 1
-        else:
-            hi = mid
-    return text[:max(0, lo - 1)] + ell
 
-class TelaPlanilha:
+from components.ui_base import Botao
+from components.tela_base import TelaAnalise
+from components.graficos import graficos_do_resumo
+from components.relatorio import PainelRelatorio
+from components.tabela import PainelTabela
+from components.perfil import perfilador
+from analise.tarefas import Tarefa
+
+def _precarregar_motor():
+    import analise.motor  # noqa: F401  (pandas leva ~1 s; melhor antes do clique)
+
+def _analisar(caminho, **kwargs):
+    # roda na thread da tarefa: o import do motor nunca trava o loop do pygame
+    from analise import motor
+    return motor.analisar_com_cache(caminho, **kwargs)
+
+def _comparar(caminhos, **kwargs):
+    from analise.comparacao import comparar_arquivos
+    return comparar_arquivos(caminhos, **kwargs)
+
+def _atualizar(anterior, **kwargs):
+    from analise import motor
+    return motor.atualizar_csv(anterior, **kwargs)
+
+def _indexar(caminho, **kwargs):
+    from analise.explorador import PaginasCSV, indexar_csv
+    return PaginasCSV(indexar_csv(caminho, **kwargs))
+
+EVENTO_VIGIA = pygame.event.custom_type()
+INTERVALO_VIGIA_MS = 2000
+
+class TelaPlanilha(TelaAnalise):
+    LARGURA_MEDIA = 680   # 7 botões: abaixo disso, 2 colunas ficam apertadas
+
     def __init__(self, surface, on_voltar):
-        self.surface = surface
-        self.on_voltar = on_voltar
+        super().__init__(surface, on_voltar, 'Análise de Planilha')
 
-        self.titulo = 'Análise de Planilha'
         self.arquivo = None
-        self.resultado_linhas = []
-        self.scroll_y = 0
+        self.arquivos = []             # com 2 ou mais, "Analisar" compara os arquivos
+        self.relatorios = {}           # caminho -> último Relatorio (base da reanálise incremental)
+        self.relatorio = PainelRelatorio()
+        self.compacto = False
+        self.acompanhar = False
+        self._assinatura_vigia = None
+        self._incremental = False
+        self.tabela = PainelTabela()
+        self.modo_tabela = False
+        self.tarefa_indice = None
 
         # Botões
         self.bt_escolher = Botao('Escolher Planilha', self.escolher_arquivo)
         self.bt_analisar = Botao('Analisar', self.analisar)
-        self.bt_voltar   = Botao('← Voltar', self.on_voltar)
-        self.botoes = [self.bt_escolher, self.bt_analisar, self.bt_voltar]
+        self.bt_cancelar = Botao('Cancelar', self.cancelar)
+        self.bt_compacto = Botao('Modo compacto: não', self.alternar_compacto)
+        self.bt_acompanhar = Botao('Acompanhar: não', self.alternar_acompanhar)
+        self.bt_tabela = Botao('Ver dados', self.alternar_tabela)
+        self.bt_voltar   = Botao('← Voltar', self.voltar)
+        self.botoes = [self.bt_escolher, self.bt_analisar, self.bt_cancelar,
+                       self.bt_compacto, self.bt_acompanhar, self.bt_tabela, self.bt_voltar]
 
-        # Layout vars
-        self.fonte_botoes = None
-        self.fonte_titulo = None
-        self.fonte_relatorio = None
+        self.recalcular_layout()
+        threading.Thread(target=_precarregar_motor, daemon=True).start()
 
-        self.btn_rects = []
-        self.legend_lines = []
-        self.legend_pos = (0, 0)
-        self.card_rect = None
-        self.area_relatorio = None
+    # o texto do relatório vive no painel virtualizado
+    @property
+    def resultado_linhas(self):
+        return self.relatorio.linhas
 
-        self.recalcular_layout()
+    @resultado_linhas.setter
+    def resultado_linhas(self, linhas):
+        self.relatorio.definir_linhas(linhas)
+
+    @property
+    def scroll_y(self):
+        return self.relatorio.scroll_y
+
+    @scroll_y.setter
+    def scroll_y(self, valor):
+        self.relatorio.scroll_y = valor
+        self.relatorio.rolar(0)
 
     # ---------------- UI/Layout ----------------
-    def _btn_columns(self, w):
-        """Decide colunas dos botões por largura da janela."""
-        if w >= 980:    # largo: 3 em linha
-            return 3
-        if w >= 680:    # médio: 2 colunas
-            return 2
-        return 1        # estreito: 1 coluna
-
-    def recalcular_layout(self):
-        w, h = self.surface.get_size()
-
-        # Margens e métricas responsivas
-        margin = max(16, int(min(w, h) * 0.04))
-        # Título
-        self.fonte_titulo = pygame.font.SysFont('Arial', max(20, int(h * 0.05)), bold=True)
+    def texto_legenda(self):
+        if len(self.arquivos) > 1:
+            return f'Arquivos ({len(self.arquivos)}): ' + ', '.join(os.path.basename(a) for a in self.arquivos)
+        return f'Arquivo: {os.path.basename(self.arquivo) if self.arquivo else "nenhum selecionado"}'
 
-        # Botões
-        cols = self._btn_columns(w)
-        gap_h = max(10, int(h * 0.015))
-        gap_w = max(10, int(w * 0.02))
-        btn_h = max(48, int(h * 0.085))
-        self.fonte_botoes = pygame.font.SysFont('Arial', max(16, int(btn_h * 0.42)), bold=True)
-
-        # Tentativa de largura base por coluna
-        avail_w = w - 2 * margin - (cols - 1) * gap_w
-        btn_w = max(120, min(280, int(avail_w / cols)))
-
-        # Linha(s) de botões — pode virar grid 2x2 no médio/pequeno
-        titulo_h = self.fonte_titulo.get_height()
-        y_start = margin - 4 + titulo_h + max(6, int(h * 0.01))
-
-        self.btn_rects = []
-        rows = math.ceil(len(self.botoes) / cols)
-        for i, b in enumerate(self.botoes):
-            r = i // cols
-            c = i % cols
-            # centraliza a grade
-            row_w = cols * btn_w + (cols - 1) * gap_w
-            x0 = (w - row_w) // 2
-            x = x0 + c * (btn_w + gap_w)
-            y = y_start + r * (btn_h + gap_h)
-            rect = pygame.Rect(x, y, btn_w, btn_h)
-            self.btn_rects.append(rect)
-            b.rect = rect
-
-        # Legenda (logo abaixo dos botões)
-        legend_y = y_start + rows * (btn_h + gap_h)
-        self.fonte_relatorio = pygame.font.SysFont('Consolas, Menlo, Courier New, monospace', max(14, int(h * 0.022)))
-        leg_text = f'Arquivo: {os.path.basename(self.arquivo) if self.arquivo else "nenhum selecionado"}'
-
-        # largura da legenda: da borda esquerda até a borda direita da grade
-        if self.btn_rects:
-            left = min(r.x for r in self.btn_rects)
-            right = max(r.right for r in self.btn_rects)
-        else:
-            left, right = margin, w - margin
-        leg_max_w = max(160, right - left)
-
-        # quebrar em até 2 linhas; se ainda passar, corta com …
-        lines = wrap_text(self.surface, leg_text, self.fonte_relatorio, leg_max_w)
-        if len(lines) > 2:
-            lines = lines[:2]
-            lines[-1] = elide_text(self.fonte_relatorio, lines[-1], leg_max_w)
-        self.legend_lines = lines
-        self.legend_pos = (left, legend_y)
-
-        # Card do relatório
-        legend_height = len(self.legend_lines) * (self.fonte_relatorio.get_height() + 2)
-        card_y = legend_y + legend_height + 10
-        card_h = h - card_y - margin
-        self.card_rect = pygame.Rect(margin, card_y, w - 2 * margin, max(140, card_h))
-
-        pad = max(14, int(min(w, h) * 0.02))
-        self.area_relatorio = pygame.Rect(
-            self.card_rect.x + pad,
-            self.card_rect.y + pad,
-            self.card_rect.w - 2 * pad,
-            self.card_rect.h - 2 * pad
-        )
-
-        # reset de scroll se área mudou muito
-        self.scroll_y = min(0, self.scroll_y)
+    def _paineis(self):
+        return [self.relatorio, self.tabela]
+
+    def _painel(self):
+        """Painel na área do card: a tabela de linhas ou o relatório."""
+        return self.tabela if self.modo_tabela else self.relatorio
 
     def handle_event(self, event):
-        if event.type == pygame.VIDEORESIZE:
-            self.recalcular_layout()
-        elif event.type == pygame.MOUSEWHEEL:
-            self._scroll(event.y * 26)
-        elif event.type == pygame.KEYDOWN:
-            if event.key in (pygame.K_UP, pygame.K_k):
-                self._scroll(20)
-            elif event.key in (pygame.K_DOWN, pygame.K_j):
-                self._scroll(-20)
-            elif event.key == pygame.K_PAGEUP:
-                self._scroll(self.area_relatorio.h // 1.5)
-            elif event.key == pygame.K_PAGEDOWN:
-                self._scroll(-self.area_relatorio.h // 1.5)
-        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            for b in self.botoes: b.pressed = True
-        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-            for b in self.botoes:
-                if b.pressed:
-                    b.pressed = False
-                    b.checar_clique(event.pos)
-
-    def _scroll(self, dy):
-        self.scroll_y += dy
-        limite = -max(0, len(self.resultado_linhas)* (self.fonte_relatorio.get_height()+6) - self.area_relatorio.h)
-        self.scroll_y = max(min(self.scroll_y, 0), limite)
+        if event.type == EVENTO_VIGIA:
+            self._verificar_arquivo()
+        else:
+            super().handle_event(event)
 
     def update(self, dt):
-        mouse_pos = pygame.mouse.get_pos()
-        for b in self.botoes:
-            b.atualizar_hover(mouse_pos)
+        super().update(dt)
+        self._acompanhar_indice()
 
-    def draw(self):
-        import components.ui_base as ui_base
+    def animando(self):
+        return super().animando() or self.tarefa_indice is not None
 
-        self.surface.fill(COR_FUNDO_BASE)
-        draw_vignette(self.surface)
+    def _acompanhar_tarefa(self):
+        if self.tarefa is None:
+            return
+        if not self.tarefa.concluida:
+            if self._incremental:
+                return  # o relatório anterior continua visível; só a barra de progresso anda
+            etapa, fracao = self.tarefa.estado()
+            linhas = [f'⏳ {etapa}... {int(fracao * 100)}%',
+                      'Clique em "Cancelar" para interromper.']
+            if linhas != self.resultado_linhas:
+                self.resultado_linhas = linhas
+            return
 
-        # Título
-        titulo_render = self.fonte_titulo.render(self.titulo, True, (87, 11, 98))
-        titulo_x = (self.surface.get_width() - titulo_render.get_width()) // 2
-        margin = max(16, int(min(*self.surface.get_size()) * 0.04))
-        self.surface.blit(titulo_render, (titulo_x, margin - 4))
+        tarefa, self.tarefa = self.tarefa, None
+        perfilador.registrar_etapas('analisar', tarefa.etapas)
+        if tarefa.cancelada:
+            self.resultado_linhas = ['⛔ Análise cancelada.']
+        elif tarefa.erro is not None:
+            self.resultado_linhas = [f'Erro na análise: {tarefa.erro}']
+        elif hasattr(tarefa.resultado, 'relatorios'):
+            # comparação: diferenças + total combinado, com os gráficos do total
+            for r in tarefa.resultado.relatorios:
+                if r.resumo is not None:   # arquivos com erro são relidos na próxima vez
+                    self.relatorios[r.caminho] = r
+            self.resultado_linhas = (tarefa.resultado.linhas_relatorio()
+                                     + graficos_do_resumo(tarefa.resultado.total))
+        else:
+            self.relatorios[tarefa.resultado.caminho] = tarefa.resultado
+            # texto do relatório + histogramas e séries diárias (itens de altura variável)
+            self.resultado_linhas = (tarefa.resultado.linhas_exibicao()
+                                     + graficos_do_resumo(tarefa.resultado.resumo))
+            if self.modo_tabela:
+                self._carregar_tabela()  # o arquivo pode ter mudado: refaz o índice se preciso
+            if tarefa.resultado.estado_csv is not None:
+                return  # atualização incremental: mantém a posição de leitura do usuário
+        self.scroll_y = 0
 
-        # Botões
-        for b in self.botoes:
-            b.desenhar(self.surface, self.fonte_botoes)
-
-        # Legenda (2 linhas no máx)
-        x_leg, y_leg = self.legend_pos
-        for i, ln in enumerate(self.legend_lines):
-            render = self.fonte_relatorio.render(ln, True, COR_TEXTO)
-            self.surface.blit(render, (x_leg, y_leg + i * (self.fonte_relatorio.get_height() + 2)))
-
-        # Card do relatório
-        card_surf = pygame.Surface(self.card_rect.size, pygame.SRCALPHA)
-        for i in range(self.card_rect.height):
-            alpha = int(ui_base.lerp(90, 140, i / max(1, self.card_rect.height - 1)))
-            pygame.draw.rect(card_surf, (255, 255, 255, alpha), (0, i, self.card_rect.width, 1))
-        mask = pygame.Surface(self.card_rect.size, pygame.SRCALPHA)
-        draw_rounded_rect(mask, mask.get_rect(), (255, 255, 255, 0), radius=24)
-        card_surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-        draw_shadow(self.surface, self.card_rect, radius=28, offset=(0, 10), alpha=90)
-        self.surface.blit(card_surf, self.card_rect)
-        pygame.draw.rect(self.surface, ajustar_claridade(COR_DESTAQUE, 1.4),
-                         self.card_rect, width=2, border_radius=24)
-
-        # Texto do relatório com clip + scroll
-        clip_old = self.surface.get_clip()
-        self.surface.set_clip(self.area_relatorio)
-
-        y_texto = self.area_relatorio.y + self.scroll_y
-        lh = self.fonte_relatorio.get_height() + 6
-        for linha in self.resultado_linhas:
-            render = self.fonte_relatorio.render(linha, True, (40, 40, 40))
-            self.surface.blit(render, (self.area_relatorio.x, y_texto))
-            y_texto += lh
-
-        self.surface.set_clip(clip_old)
-        pygame.draw.rect(self.surface, ajustar_claridade(COR_TEXTO, 1.2),
-                         self.area_relatorio, width=2, border_radius=10)
+    def _acompanhar_indice(self):
+        if self.tarefa_indice is None or not self.tarefa_indice.concluida:
+            return
+        tarefa, self.tarefa_indice = self.tarefa_indice, None
+        perfilador.registrar_etapas('indexar', tarefa.etapas)
+        if tarefa.resultado is not None:
+            self.tabela.definir_fonte_dados(tarefa.resultado)
+            self.tabela.definir_layout(self.area_relatorio, self.fonte_relatorio)
+        else:
+            if tarefa.erro is not None:
+                self.resultado_linhas = [f'Erro ao indexar as linhas: {tarefa.erro}']
+            self._sair_tabela()
+
+    def _desenhar_painel(self):
+        # relatório ou tabela de linhas (com o progresso do índice enquanto ele é montado)
+        if not self.modo_tabela:
+            self.relatorio.desenhar(self.surface)
+        elif self.tarefa_indice is not None:
+            etapa, fracao = self.tarefa_indice.estado()
+            aviso = self.fonte_relatorio.render(f'⏳ {etapa}... {int(fracao * 100)}%', True, (40, 40, 40))
+            self.surface.blit(aviso, aviso.get_rect(center=self.area_relatorio.center))
+        else:
+            self.tabela.desenhar(self.surface)
 
     # ---------------- Ações ----------------
     def escolher_arquivo(self):
         try:
+            from tkinter import Tk, filedialog
             root = Tk(); root.withdraw(); root.wm_attributes('-topmost', 1)
-            caminho = filedialog.askopenfilename(
-                title='Selecione a planilha',
+            # várias de uma vez (Ctrl/Shift) para comparar
+            caminhos = list(filedialog.askopenfilenames(
+                title='Selecione a planilha (ou várias para comparar)',
                 filetypes=[('Planilhas', '*.xlsx *.xls *.csv'), ('Todos', '*.*')]
-            )
+            ))
             root.destroy()
         except Exception as e:
             self.resultado_linhas = [f'Erro ao abrir seletor de arquivos: {e}']
             return
 
-        if caminho:
-            self.arquivo = caminho
-            base = os.path.basename(self.arquivo)
-            self.resultado_linhas = [f'Arquivo selecionado: {base}',
-                                     'Clique em "Analisar" para continuar.']
+        if caminhos:
+            if self.tarefa is not None:
+                self.tarefa.cancelar()  # descarta a análise do arquivo anterior
+                self.tarefa = None
+            self._sair_tabela()
+            self.tabela.definir_fonte_dados(None)
+            self.arquivos = caminhos
+            self.arquivo = caminhos[0]   # "Ver dados" mostra o primeiro
+            self._assinatura_vigia = None
+            if len(caminhos) > 1:
+                self.resultado_linhas = [f'{len(caminhos)} arquivos selecionados (A = {os.path.basename(self.arquivo)}).',
+                                         'Clique em "Analisar" para comparar.']
+            else:
+                self.resultado_linhas = [f'Arquivo selecionado: {os.path.basename(self.arquivo)}',
+                                         'Clique em "Analisar" para continuar.']
             self.scroll_y = 0
             self.recalcular_layout()  # atualiza legenda com nome novo
 
@@ -262,60 +207,102 @@ class TelaPlanilha:
         if not self.arquivo:
             self.resultado_linhas = ['Nenhum arquivo selecionado. Clique em "Escolher Planilha" primeiro.']
             return
-
-        try:
-            ext = os.path.splitext(self.arquivo)[1].lower()
-            if ext in ('.xlsx', '.xls'):
-                xls = pd.ExcelFile(self.arquivo)
-                linhas = [f'📄 Tipo: Excel ({ext})',
-                          f'📚 Abas: {len(xls.sheet_names)} -> {", ".join(xls.sheet_names[:8])}'
-                          + ('...' if len(xls.sheet_names) > 8 else '')]
-                df = xls.parse(xls.sheet_names[0])
-                linhas += self._sumarizar_df(df, nome_aba=xls.sheet_names[0])
-
-            elif ext == '.csv':
-                df = pd.read_csv(self.arquivo, nrows=50000)
-                linhas = [f'📄 Tipo: CSV',
-                          f'📦 Linhas lidas (amostra ou total): {len(df):,}'.replace(',', '.')]
-                linhas += self._sumarizar_df(df)
-            else:
-                linhas = [f'Formato não suportado: {ext}', 'Suporte: .xlsx, .xls, .csv']
-
-            self.resultado_linhas = linhas
+        if self.tarefa is not None:
+            return  # já existe uma análise rodando
+
+        # leitura + sumarização rodam fora da thread do pygame
+        self._assinatura_vigia = self._assinatura_arquivo()
+        if len(self.arquivos) > 1:
+            # cada arquivo num worker; o que já foi resumido nesta sessão não é relido
+            self._incremental = False
+            self.tarefa = Tarefa(_comparar, self.arquivos, anteriores=dict(self.relatorios),
+                                 compacto=self.compacto).iniciar()
+            self.resultado_linhas = ['⏳ Analisando arquivos... 0%']
             self.scroll_y = 0
+            return
+        anterior = self.relatorios.get(self.arquivo)  # também o resumido numa comparação
+        if (anterior is not None and anterior.caminho == self.arquivo
+                and anterior.estado_csv is not None and anterior.estado_csv.compacto == self.compacto):
+            # CSV já analisado: lê só as linhas anexadas desde então
+            self.tarefa = Tarefa(_atualizar, anterior).iniciar()
+            self._incremental = True
+            return
+        self._incremental = False
+        self.tarefa = Tarefa(_analisar, self.arquivo, compacto=self.compacto).iniciar()
+        self.resultado_linhas = ['⏳ Lendo arquivo... 0%']
+        self.scroll_y = 0
 
-        except Exception as e:
-            self.resultado_linhas = [f'Erro na análise: {e}']
+    def alternar_acompanhar(self):
+        # reanalisa sozinho quando o arquivo muda (timer acorda o loop ocioso)
+        self.acompanhar = not self.acompanhar
+        self.bt_acompanhar.texto = f'Acompanhar: {"sim" if self.acompanhar else "não"}'
+        pygame.time.set_timer(EVENTO_VIGIA, INTERVALO_VIGIA_MS if self.acompanhar else 0)
+
+    def _assinatura_arquivo(self):
+        assinaturas = []
+        for caminho in self.arquivos or [self.arquivo]:
+            try:
+                st = os.stat(caminho)
+                assinaturas.append((st.st_size, st.st_mtime_ns))
+            except (OSError, TypeError):
+                assinaturas.append(None)
+        return tuple(assinaturas)
+
+    def _verificar_arquivo(self):
+        if not self.acompanhar or not self.arquivo or self.tarefa is not None:
+            return
+        if self._assinatura_arquivo() != self._assinatura_vigia:
+            self.analisar()
+
+    def alternar_compacto(self):
+        # tipos enxutos (categorias, inteiros reduzidos) + memória antes/depois no relatório
+        self.compacto = not self.compacto
+        self.bt_compacto.texto = f'Modo compacto: {"sim" if self.compacto else "não"}'
+
+    def alternar_tabela(self):
+        # alterna entre o relatório e as linhas do arquivo (CSV paginado sob demanda)
+        if self.modo_tabela:
+            self._sair_tabela()
+            return
+        if not self.arquivo:
+            self.resultado_linhas = ['Nenhum arquivo selecionado. Clique em "Escolher Planilha" primeiro.']
+            return
+        if os.path.splitext(self.arquivo)[1].lower() != '.csv':
+            self.resultado_linhas = ['A visualização de linhas está disponível só para arquivos .csv.']
+            return
+        self.modo_tabela = True
+        self.bt_tabela.texto = 'Ver relatório'
+        self._carregar_tabela()
+
+    def _carregar_tabela(self):
+        """Monta o índice de linhas em segundo plano, a menos que o atual ainda valha."""
+        paginas = self.tabela.fonte_dados
+        if self.tarefa_indice is not None or (paginas is not None and paginas.indice.continua_valido()):
+            return
+        self.tabela.definir_fonte_dados(None)
+        self.tarefa_indice = Tarefa(_indexar, self.arquivo).iniciar()
+
+    def _sair_tabela(self):
+        if self.tarefa_indice is not None:
+            self.tarefa_indice.cancelar()
+            self.tarefa_indice = None
+        self.modo_tabela = False
+        self.bt_tabela.texto = 'Ver dados'
+
+    def cancelar(self):
+        if self.tarefa is not None:
+            self.tarefa.cancelar()
+        if self.tarefa_indice is not None:
+            self._sair_tabela()
+
+    def voltar(self):
+        self.cancelar()
+        self._sair_tabela()
+        if self.acompanhar:
+            self.alternar_acompanhar()
+        self.on_voltar()
 
     # ---------------- Helpers ----------------
     def _sumarizar_df(self, df, nome_aba=None):
-        linhas = []
-        if nome_aba:
-            linhas.append(f'🗂️  Aba analisada: {nome_aba}')
-        linhas.append(f'🔢 Dimensão: {df.shape[0]:,} linhas x {df.shape[1]:,} colunas'.replace(',', '.'))
-
-        cols = list(map(str, df.columns.tolist()))
-        linhas.append('🧾 Colunas: ' + (', '.join(cols[:8]) + ('...' if len(cols) > 8 else '')))
-
-        tipos = df.dtypes.astype(str).to_dict()
-        linhas.append('🔠 Tipos (amostra): ' + ', '.join([f'{k}:{v}' for k, v in list(tipos.items())[:8]])
-                      + ('...' if len(tipos) > 8 else ''))
-
-        nulos = df.isna().sum().sort_values(ascending=False)
-        top_nulos = [(c, int(n)) for c, n in nulos.head(8).items() if n > 0]
-        if top_nulos:
-            linhas.append('⚠️ Nulos (top 8): ' + ', '.join([f'{c}:{n}' for c, n in top_nulos]))
-        else:
-            linhas.append('✅ Sem valores nulos.')
-
-        num_cols = df.select_dtypes(include='number')
-        if not num_cols.empty:
-            linhas.append('📊 Numéricas (amostra):')
-            desc = num_cols.describe().round(2).to_dict()
-            mostradas = 0
-            for col, stats in desc.items():
-                if mostradas >= 5: break
-                linhas.append(f'  • {col} -> min:{stats.get("min")}, média:{stats.get("mean")}, '
-                              f'mediana:{num_cols[col].median():.2f}, max:{stats.get("max")}')
-                mostradas += 1
-        return linhas
+        from analise import motor
+        return motor.sumarizar_df(df, nome_aba=nome_aba)
@@ -0,0 +1,66 @@
+import csv
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analisar_lote
+from analise.agregados import EstatColuna
+
+
+@pytest.fixture
+def pasta_dados(tmp_path):
+    pasta = tmp_path / 'dados'
+    (pasta / 'loja1').mkdir(parents=True)
+    (pasta / 'loja2').mkdir()
+    rng = np.random.default_rng(0)
+    for loja in ('loja1', 'loja2'):
+        pd.DataFrame({'produto': rng.choice(['a', 'b', 'c'], 300),
+                      'valor': rng.normal(100, 15, 300).round(2),
+                      'obs': [None if i % 3 else 'x' for i in range(300)]}).to_csv(pasta / loja / 'vendas.csv', index=False)
+    (pasta / 'loja2' / 'quebrado.xlsx').write_bytes(b'isto nao e um zip')
+    return pasta
+
+def _rodar(pasta, saida, formato):
+    return analisar_lote.main([str(pasta), '--recursivo', '--saida', str(saida), '--formato', formato,
+                               '--processos', '2', '--sem-cache'])
+
+def test_formato_csv_ida_e_volta(pasta_dados, tmp_path):
+    saida = tmp_path / 'resumos'
+    assert _rodar(pasta_dados, saida, 'csv') == 1   # o .xlsx quebrado conta como falha
+
+    with open(saida / 'indice.csv', encoding='utf-8') as f:
+        indice = {os.path.basename(os.path.dirname(e['arquivo'])) + '/' + os.path.basename(e['arquivo']): e
+                  for e in csv.DictReader(f)}
+    assert indice['loja2/quebrado.xlsx']['status'] == 'erro'
+    assert indice['loja1/vendas.csv']['status'] == 'ok'
+
+    for loja in ('loja1', 'loja2'):
+        original = pd.read_csv(pasta_dados / loja / 'vendas.csv')
+        entrada = indice[f'{loja}/vendas.csv']
+        assert entrada['status'] == 'ok'
+        assert int(entrada['linhas']) == len(original)
+        with open(entrada['saida'], encoding='utf-8') as f:
+            leitor = csv.DictReader(f)
+            assert leitor.fieldnames == list(EstatColuna('', 'object').para_dict())
+            colunas = {c['nome']: c for c in leitor}
+        assert list(colunas) == list(original.columns)
+        assert int(colunas['obs']['nulos']) == original['obs'].isna().sum()
+        assert float(colunas['valor']['max']) == original['valor'].max()
+        assert float(colunas['valor']['media']) == pytest.approx(original['valor'].mean())
+        assert int(colunas['produto']['distintos_aprox']) == 3
+        assert float(colunas['valor']['p50']) == pytest.approx(original['valor'].median(), rel=0.02)
+
+def test_formato_json(pasta_dados, tmp_path):
+    saida = tmp_path / 'resumos'
+    _rodar(pasta_dados, saida, 'json')
+    with open(saida / 'indice.json', encoding='utf-8') as f:
+        indice = json.load(f)
+    ok = [e for e in indice if e['status'] == 'ok']
+    assert len(ok) == 2
+    with open(ok[0]['saida'], encoding='utf-8') as f:
+        resumo = json.load(f)['resumo']
+    assert resumo['linhas'] == 300
+    assert [c['nome'] for c in resumo['colunas']] == ['produto', 'valor', 'obs']
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise import motor
+from analise.cache import CacheResultados
+from analise.comparacao import Comparacao, comparar_arquivos
+from analise.tarefas import TarefaCancelada
+
+
+@pytest.fixture(autouse=True)
+def cache_temporario(tmp_path, monkeypatch):
+    monkeypatch.setattr(motor, '_cache', CacheResultados(str(tmp_path / 'cache')))
+
+@pytest.fixture
+def arquivos(tmp_path):
+    rng = np.random.default_rng(5)
+    a = tmp_path / 'jan.csv'
+    b = tmp_path / 'fev.csv'
+    pd.DataFrame({'loja': rng.choice(['x', 'y'], 400), 'valor': rng.normal(100, 10, 400)}).to_csv(a, index=False)
+    pd.DataFrame({'loja': rng.choice(['x', 'y'], 600), 'valor': rng.normal(120, 10, 600),
+                  'desconto': [None] * 600}).to_csv(b, index=False)
+    ruim = tmp_path / 'quebrado.xlsx'
+    ruim.write_bytes(b'isto nao e um zip')
+    return str(a), str(b), str(ruim)
+
+def test_comparacao_e_total(arquivos):
+    a, b, _ = arquivos
+    comparacao = comparar_arquivos([a, b], trabalhadores=2)
+    assert [r.caminho for r in comparacao.relatorios] == [a, b]
+    assert comparacao.total.linhas == 1000
+    texto = '\n'.join(comparacao.linhas_relatorio())
+    assert 'Linhas: A 400 | B 600 (+50.0%)' in texto
+    assert 'Só em B: desconto' in texto
+
+def test_arquivo_com_erro_vira_linha_de_erro(arquivos):
+    a, b, ruim = arquivos
+    comparacao = comparar_arquivos([a, ruim, b], trabalhadores=3)
+    falho = comparacao.relatorios[1]
+    assert falho.caminho == ruim and falho.resumo is None
+    assert falho.linhas[0].startswith('Erro: BadZipFile')
+    assert comparacao.total.linhas == 1000
+    linhas = comparacao.linhas_relatorio()
+    assert any(l.startswith('  B = quebrado.xlsx — Erro: BadZipFile') for l in linhas)
+    assert any(l.startswith('🔢 Linhas: A 400 | C 600') for l in linhas)
+
+def test_so_um_arquivo_valido(arquivos):
+    a, _, ruim = arquivos
+    linhas = comparar_arquivos([a, ruim]).linhas_relatorio()
+    assert linhas[-1] == 'São precisos ao menos dois arquivos com resumo para comparar.'
+
+def test_anteriores_nao_sao_relidos(arquivos):
+    a, b, _ = arquivos
+    primeira = comparar_arquivos([a, b])
+    anteriores = {r.caminho: r for r in primeira.relatorios}
+    with open(b, 'a', encoding='utf-8') as f:
+        f.write('x,1.5,\n')
+    segunda = comparar_arquivos([a, b], anteriores=anteriores)
+    assert segunda.total.linhas == 1001
+    assert any('Linhas novas desde a última leitura: 1' in l for l in segunda.relatorios[1].linhas)
+
+def test_cancelamento(arquivos):
+    with pytest.raises(TarefaCancelada):
+        comparar_arquivos(list(arquivos[:2]), cancelado=lambda: True)
+
+def test_comparacao_sem_arquivos_validos():
+    vazio = motor.Relatorio('x.csv', ['Erro: OSError: sumiu'])
+    assert Comparacao([vazio]).total.linhas == 0
@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from analise import documentos
+from analise.documentos import IndiceDocumentos, normalizar, tokenizar, trecho
+
+
+def _escrever(pasta, nome, texto):
+    caminho = os.path.join(pasta, nome)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(texto)
+    return caminho
+
+@pytest.fixture
+def pasta(tmp_path):
+    p = str(tmp_path / 'docs')
+    _escrever(p, 'feijao.txt', 'Feijão, feijão e mais feijão. Receita de feijoada com feijão preto.')
+    _escrever(p, 'arroz.txt', 'Arroz branco com um pouco de feijão por cima. ' + 'arroz soltinho ' * 20)
+    _escrever(p, 'sub/carnes.md', 'Churrasco: picanha, fraldinha e linguiça.')
+    _escrever(p, 'relatorio.csv', 'produto,qtd\nfeijao,10\narroz,30\n')
+    _escrever(p, 'imagem.png', 'feijão feijão feijão')   # extensão fora de EXTENSOES_DOC
+    return p
+
+@pytest.fixture
+def indice(pasta, tmp_path):
+    i = IndiceDocumentos(pasta, banco=str(tmp_path / 'indice.sqlite'))
+    yield i
+    i.fechar()
+
+def _nomes(resultados):
+    return [os.path.basename(r.caminho) for r in resultados]
+
+def test_normalizacao():
+    assert normalizar('FEIJÃO Ação') == 'feijao acao'
+    assert tokenizar('Relatório: 2024, o x e ÁGUA!') == ['relatorio', '2024', 'agua']
+
+def test_bm25_poe_o_mais_relevante_primeiro(indice):
+    assert indice.atualizar() == (4, 0, 0)
+    resultados = indice.buscar('feijão')
+    assert _nomes(resultados) == ['feijao.txt', 'relatorio.csv', 'arroz.txt']
+    pontos = [r.pontuacao for r in resultados]
+    assert pontos == sorted(pontos, reverse=True)
+    assert indice.buscar('picanha')[0].termos == ['picanha']
+    assert indice.buscar('inexistente') == []
+
+def test_varios_termos_somam(indice):
+    indice.atualizar()
+    resultados = indice.buscar('arroz feijao')
+    assert _nomes(resultados)[0] == 'arroz.txt'
+    assert resultados[0].termos == ['arroz', 'feijao']
+    assert 'carnes.md' not in _nomes(resultados)
+
+def test_acentos_e_maiusculas_nao_importam(indice):
+    indice.atualizar()
+    assert _nomes(indice.buscar('FEIJAO')) == _nomes(indice.buscar('feijão'))
+    assert _nomes(indice.buscar('linguica')) == ['carnes.md']
+
+def test_atualizacao_incremental(indice, pasta):
+    indice.atualizar()
+    assert indice.atualizar() == (0, 0, 4)
+    caminho = os.path.join(pasta, 'arroz.txt')
+    assert indice.buscar('arroz')[0].mtime_ns == os.stat(caminho).st_mtime_ns
+
+    _escrever(pasta, 'arroz.txt', 'Agora só picanha.')
+    os.utime(caminho, ns=(1, 1))   # mtime diferente mesmo em sistemas de arquivos com pouca resolução
+    _escrever(pasta, 'novo.txt', 'Picanha na brasa.')
+    assert indice.atualizar() == (2, 0, 3)
+    assert indice.total_documentos == 5
+    assert 'arroz.txt' not in _nomes(indice.buscar('arroz'))
+    assert sorted(_nomes(indice.buscar('picanha'))) == ['arroz.txt', 'carnes.md', 'novo.txt']
+    assert [r.mtime_ns for r in indice.buscar('agora')] == [1]   # a chave do cache de trechos muda
+
+def test_apagados_saem_da_busca(indice, pasta):
+    indice.atualizar()
+    os.remove(os.path.join(pasta, 'feijao.txt'))
+    assert indice.atualizar() == (0, 1, 3)
+    assert 'feijao.txt' not in _nomes(indice.buscar('feijao'))
+    assert indice.buscar('feijoada') == []
+
+def test_compactacao_mantem_os_resultados(indice, pasta, monkeypatch):
+    monkeypatch.setattr(documentos, 'ARQUIVOS_POR_LOTE', 1)   # um segmento por documento
+    monkeypatch.setattr(documentos, 'DOCS_POR_SEGMENTO', 1)
+    indice.atualizar()
+    caminho = _escrever(pasta, 'feijao.txt', 'Feijão de novo, agora com arroz.')
+    os.utime(caminho, ns=(1, 1))
+    indice.atualizar()
+    assert indice.total_segmentos == 5
+    antes = [(r.caminho, round(r.pontuacao, 9), r.termos) for r in indice.buscar('feijao arroz')]
+
+    indice.compactar()
+    assert indice.total_segmentos == 1
+    depois = [(r.caminho, round(r.pontuacao, 9), r.termos) for r in indice.buscar('feijao arroz')]
+    assert depois == antes
+
+def test_indice_persiste_entre_aberturas(pasta, tmp_path):
+    banco = str(tmp_path / 'persistente.sqlite')
+    primeiro = IndiceDocumentos(pasta, banco=banco)
+    primeiro.atualizar()
+    primeiro.fechar()
+    segundo = IndiceDocumentos(pasta, banco=banco)
+    try:
+        assert segundo.atualizar() == (0, 0, 4)
+        assert _nomes(segundo.buscar('feijao'))[0] == 'feijao.txt'
+    finally:
+        segundo.fechar()
+
+def test_trecho(pasta):
+    caminho = os.path.join(pasta, 'arroz.txt')
+    assert trecho(caminho, ['feijao']).startswith('Arroz branco com um pouco de feijão')
+    assert trecho(caminho, ['picanha']) == ''
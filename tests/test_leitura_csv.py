@@ -0,0 +1,90 @@
+import pytest
+
+from analise.leitura_csv import continuar_csv, resumir_csv
+
+CABECALHO = 'data,loja,valor,obs\n'
+
+def _linhas(inicio, fim):
+    return ''.join(f'2024-01-{i % 28 + 1:02d},L{i % 5},{i * 1.5},{"" if i % 4 else "x"}\n'
+                   for i in range(inicio, fim))
+
+def _comparaveis(resumo):
+    """Campos que não dependem de como as linhas foram divididas em blocos."""
+    campos = ('nome', 'tipo', 'linhas', 'nulos', 'numericos', 'min', 'max', 'distintos_aprox')
+    return resumo.linhas, [{k: c[k] for k in campos} for c in resumo.para_dict()['colunas']]
+
+def _medias(resumo):
+    return [c['media'] for c in resumo.para_dict()['colunas']]
+
+@pytest.fixture
+def log(tmp_path):
+    caminho = tmp_path / 'log.csv'
+    caminho.write_text(CABECALHO + _linhas(0, 1000), encoding='utf-8')
+    return caminho
+
+def _anexar(caminho, texto):
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write(texto)
+
+def test_continuacao_igual_a_releitura_completa(log):
+    _, _, estado = resumir_csv(str(log))
+    _anexar(log, _linhas(1000, 1600))
+
+    resumo, _, novo_estado, novas = continuar_csv(str(log), estado)
+    completo, _, estado_completo = resumir_csv(str(log))
+    assert novas == 600
+    assert novo_estado.offset == estado_completo.offset == log.stat().st_size
+    assert _comparaveis(resumo) == _comparaveis(completo)
+    assert _medias(resumo) == pytest.approx(_medias(completo))
+
+def test_linha_incompleta_entra_no_relatorio_mas_nao_no_estado(log):
+    _anexar(log, '2024-02-01,L1,9')          # linha ainda sendo gravada
+    resumo, _, estado = resumir_csv(str(log))
+    assert resumo.linhas == 1001
+    assert estado.resumo.linhas == 1000
+
+    _anexar(log, '9999.5,x\n' + _linhas(1000, 1010))
+    resumo, _, estado, novas = continuar_csv(str(log), estado)
+    assert novas == 11
+    assert resumo.linhas == estado.resumo.linhas == 1011
+    assert resumo.colunas['valor'].maximo == 99999.5
+
+def test_continuacao_sem_linhas_novas(log):
+    _, _, estado = resumir_csv(str(log))
+    resumo, _, _, novas = continuar_csv(str(log), estado)
+    assert novas == 0
+    assert resumo.linhas == 1000
+
+def test_cabecalho_alterado_invalida_o_estado(log):
+    _, _, estado = resumir_csv(str(log))
+    log.write_text(CABECALHO.replace('valor', 'preco') + _linhas(0, 1200), encoding='utf-8')
+    assert continuar_csv(str(log), estado) is None
+
+def test_arquivo_encolhido_invalida_o_estado(log):
+    _, _, estado = resumir_csv(str(log))
+    log.write_text(CABECALHO + _linhas(0, 10), encoding='utf-8')
+    assert continuar_csv(str(log), estado) is None
+
+def test_continuacao_compacta_preserva_as_opcoes(log):
+    _, memoria, estado = resumir_csv(str(log), compacto=True, colunas=['loja', 'valor'])
+    assert estado.compacto and memoria is not None
+    _anexar(log, _linhas(1000, 1100))
+    resumo, memoria, novo_estado, novas = continuar_csv(str(log), estado)
+    assert novas == 100
+    assert list(resumo.colunas) == ['loja', 'valor']
+    assert novo_estado.categoricas == estado.categoricas
+    assert memoria is not None
+
+def test_log_pequeno_continua_incremental(tmp_path):
+    # abaixo de BYTES_ASSINATURA o prefixo assinado cresce a cada leitura
+    caminho = tmp_path / 'pequeno.csv'
+    caminho.write_text(CABECALHO + _linhas(0, 3), encoding='utf-8')
+    _, _, estado = resumir_csv(str(caminho))
+    for inicio in (3, 6, 9):
+        _anexar(caminho, _linhas(inicio, inicio + 3))
+        continuacao = continuar_csv(str(caminho), estado)
+        assert continuacao is not None
+        resumo, _, estado, novas = continuacao
+        assert novas == 3
+    assert caminho.stat().st_size < 4096
+    assert resumo.linhas == 12
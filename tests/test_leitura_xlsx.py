@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import openpyxl
+import pandas as pd
+import pytest
+from openpyxl.styles import PatternFill
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+
+from analise.leitura_xlsx import iterar_lotes, ler_metadados, resumir_aba_xlsx
+
+
+def _gravar(caminho, linhas, data1904=False, estilizar_fim=0, saltos=()):
+    """Pasta com uma aba 'dados'; `saltos` são linhas (1-based) que não entram no XML."""
+    wb = openpyxl.Workbook()
+    if data1904:
+        wb.epoch = CALENDAR_MAC_1904
+    ws = wb.active
+    ws.title = 'dados'
+    numero = 1
+    for linha in linhas:
+        while numero in saltos:
+            numero += 1
+        for col, valor in enumerate(linha, 1):
+            if valor is not None:
+                ws.cell(row=numero, column=col, value=valor)
+        numero += 1
+    amarelo = PatternFill('solid', fgColor='FFFF00')
+    for r in range(numero, numero + estilizar_fim):   # linhas vazias só com formatação
+        for c in range(1, 4):
+            ws.cell(row=r, column=c).fill = amarelo
+    wb.save(caminho)
+    return str(caminho)
+
+def _ler(caminho, **kwargs):
+    lotes = [df for df, _ in iterar_lotes(caminho, 'dados', **kwargs)]
+    return lotes, pd.concat(lotes, ignore_index=True)
+
+def _valores(df):
+    # os tipos de cada lote são acertados na mescla do resumo; aqui só os valores contam
+    return df.astype(object).where(df.notna(), None)
+
+def _igual_ao_pandas(caminho, df):
+    esperado = pd.read_excel(caminho, sheet_name='dados')
+    pd.testing.assert_frame_equal(_valores(df), _valores(esperado), check_dtype=False)
+
+LINHAS = [['id', 'nome', 'valor', 'quando', 'ativo']] + [
+    [i, f'item {i}' if i % 7 else None, i * 2.5 if i % 5 else None, datetime(2024, 1, 1 + i % 28, 12, 30), i % 2 == 0]
+    for i in range(1, 60)
+]
+
+def test_paridade_com_read_excel(tmp_path):
+    caminho = _gravar(tmp_path / 'simples.xlsx', LINHAS)
+    lotes, df = _ler(caminho, linhas_por_lote=16)
+    assert [len(l) for l in lotes] == [16, 16, 16, 11]
+    _igual_ao_pandas(caminho, df)
+
+def test_linhas_vazias_no_meio_contam_e_as_do_fim_nao(tmp_path):
+    caminho = _gravar(tmp_path / 'esparsa.xlsx', LINHAS, estilizar_fim=25, saltos=set(range(10, 22)) | {40})
+    assert ler_metadados(caminho)[0].linhas > len(LINHAS) + 13   # a dimensão inclui as linhas formatadas
+    _, df = _ler(caminho)
+    assert len(df) == len(LINHAS) - 1 + 13
+    _igual_ao_pandas(caminho, df)
+
+def test_lacunas_respeitam_o_tamanho_do_lote(tmp_path):
+    caminho = _gravar(tmp_path / 'lacuna.xlsx', LINHAS[:5], saltos=set(range(4, 40)))
+    lotes, df = _ler(caminho, linhas_por_lote=8)
+    assert max(len(l) for l in lotes) <= 8
+    assert len(df) == 4 + 36
+    _igual_ao_pandas(caminho, df)
+
+def test_data1904(tmp_path):
+    caminho = _gravar(tmp_path / 'mac.xlsx', LINHAS[:10], data1904=True)
+    _, df = _ler(caminho)
+    assert df['quando'].iloc[0] == datetime(2024, 1, 2, 12, 30)
+    _igual_ao_pandas(caminho, df)
+
+def test_resumo_da_aba(tmp_path):
+    caminho = _gravar(tmp_path / 'resumo.xlsx', LINHAS, estilizar_fim=10)
+    resumo, _ = resumir_aba_xlsx(caminho, 'dados')
+    esperado = pd.read_excel(caminho, sheet_name='dados')
+    assert resumo.linhas == len(esperado)
+    assert resumo.colunas['valor'].nulos == esperado['valor'].isna().sum()
+    assert resumo.colunas['valor'].soma == pytest.approx(esperado['valor'].sum())
+
+def test_colunas_selecionadas(tmp_path):
+    caminho = _gravar(tmp_path / 'colunas.xlsx', LINHAS)
+    _, df = _ler(caminho, colunas=['valor', 'id'])
+    assert list(df.columns) == ['valor', 'id']
+    with pytest.raises(ValueError):
+        _ler(caminho, colunas=['inexistente'])
@@ -0,0 +1,110 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise import pivot
+from analise.pivot import ABA, LINHAS, CuboAgregado, montar_cubo
+
+
+@pytest.fixture
+def vendas():
+    rng = np.random.default_rng(3)
+    n = 2000
+    df = pd.DataFrame({
+        'data': pd.date_range('2024-01-01', periods=n, freq='7h').strftime('%Y-%m-%d %H:%M'),
+        'loja': rng.choice(['centro', 'norte', 'sul'], n),
+        'produto': rng.choice(['a', 'b', 'c', 'd'], n),
+        'qtd': rng.integers(1, 10, n),
+        'preco': rng.normal(50, 10, n).round(2),
+    })
+    df.loc[::17, 'preco'] = np.nan
+    df.loc[::23, 'loja'] = None
+    return df
+
+@pytest.fixture
+def consolidar_sempre(monkeypatch):
+    monkeypatch.setattr(pivot, 'LIMITE_PARCIAIS', 50)
+
+def _cubo_em_blocos(df, tamanho=150):
+    cubo = None
+    for inicio in range(0, len(df), tamanho):
+        bloco = df.iloc[inicio:inicio + tamanho]
+        if cubo is None:
+            cubo = CuboAgregado.detectar(bloco)
+        cubo.atualizar(bloco)
+    return cubo.concluir()
+
+def _esperado(df, chaves):
+    grupos = df.groupby(chaves, dropna=False)
+    esperado = pd.DataFrame({LINHAS: grupos.size()})
+    for m in ('qtd', 'preco'):
+        esperado[f'soma de {m}'] = grupos[m].sum()
+        esperado[f'média de {m}'] = grupos[m].mean()
+    return esperado
+
+def _ordenar(df, chaves):
+    df = df.astype({c: object for c in chaves})
+    df[chaves] = df[chaves].where(df[chaves].notna(), '(vazio)')   # None e NaN juntos, como no cubo
+    return df.sort_values(chaves, ignore_index=True)
+
+def _conferir(fatia, esperado, chaves):
+    pd.testing.assert_frame_equal(_ordenar(fatia, chaves), _ordenar(esperado.reset_index(), chaves),
+                                  check_dtype=False)
+
+def test_deteccao(vendas):
+    cubo = CuboAgregado.detectar(vendas)
+    assert cubo.coluna_data == 'data'
+    assert cubo.dimensoes == ['loja', 'produto', 'data']
+    assert cubo.medidas == ['qtd', 'preco']
+
+@pytest.mark.parametrize('chaves', [['loja'], ['produto'], ['loja', 'produto']])
+def test_fatias_iguais_ao_groupby(vendas, consolidar_sempre, chaves):
+    cubo = _cubo_em_blocos(vendas)
+    assert cubo.linhas_lidas == len(vendas)
+    assert not cubo._parciais
+    _conferir(cubo.fatiar(chaves), _esperado(vendas, chaves), chaves)
+
+def test_consolidacao_nao_muda_o_resultado(vendas, consolidar_sempre, monkeypatch):
+    consolidado = _cubo_em_blocos(vendas, tamanho=40)
+    monkeypatch.setattr(pivot, 'LIMITE_PARCIAIS', 10**9)
+    de_uma_vez = _cubo_em_blocos(vendas, tamanho=40)
+    assert consolidado.combinacoes == de_uma_vez.combinacoes
+    pd.testing.assert_frame_equal(consolidado.fatiar(['loja', 'produto']).sort_values(['loja', 'produto'], ignore_index=True),
+                                  de_uma_vez.fatiar(['loja', 'produto']).sort_values(['loja', 'produto'], ignore_index=True))
+
+def test_total_e_dimensao_derivada(vendas, consolidar_sempre):
+    cubo = _cubo_em_blocos(vendas)
+    total = cubo.fatiar([])
+    assert total[LINHAS].iloc[0] == len(vendas)
+    assert total['soma de qtd'].iloc[0] == vendas['qtd'].sum()
+    assert total['média de preco'].iloc[0] == pytest.approx(vendas['preco'].mean())
+
+    com_mes = vendas.assign(**{'data: mês': pd.to_datetime(vendas['data']).dt.strftime('%Y-%m')})
+    _conferir(cubo.fatiar(['data: mês']), _esperado(com_mes, ['data: mês']), ['data: mês'])
+
+def test_cubo_em_cache_recalcula_fatias(vendas):
+    cubo = _cubo_em_blocos(vendas)
+    antes = cubo.fatiar(['produto'])
+    copia = pickle.loads(pickle.dumps(cubo))
+    assert not copia._fatias
+    pd.testing.assert_frame_equal(copia.fatiar(['produto']), antes)
+
+def test_montar_cubo_csv_em_blocos(vendas, tmp_path, consolidar_sempre, monkeypatch):
+    monkeypatch.setattr(pivot, 'LINHAS_POR_BLOCO', 128)
+    caminho = tmp_path / 'vendas.csv'
+    vendas.to_csv(caminho, index=False)
+    cubo = montar_cubo(str(caminho))
+    assert cubo.linhas_lidas == len(vendas)
+    _conferir(cubo.fatiar(['loja', 'produto']), _esperado(vendas, ['loja', 'produto']), ['loja', 'produto'])
+
+def test_montar_cubo_xlsx_com_abas(vendas, tmp_path, consolidar_sempre):
+    caminho = tmp_path / 'vendas.xlsx'
+    with pd.ExcelWriter(caminho) as escritor:
+        vendas.iloc[:800].to_excel(escritor, sheet_name='jan', index=False)
+        vendas.iloc[800:].to_excel(escritor, sheet_name='fev', index=False)
+    cubo = montar_cubo(str(caminho))
+    assert cubo.dimensoes[0] == ABA
+    por_aba = cubo.fatiar([ABA]).set_index(ABA)[LINHAS]
+    assert por_aba.to_dict() == {'jan': 800, 'fev': len(vendas) - 800}
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from analise.sketches import Histograma, SketchDistintos, SketchQuantis
+
+
+def _blocos(valores, n):
+    return np.array_split(valores, n)
+
+def test_histograma_mesclado_e_exato():
+    rng = np.random.default_rng(1)
+    # blocos com escalas diferentes forçam larguras diferentes antes da mescla
+    valores = np.concatenate((rng.normal(0, 1, 5000), rng.normal(500, 80, 5000), rng.uniform(-3, 3, 200)))
+    total = Histograma()
+    for bloco in _blocos(valores, 7):
+        total.mesclar(Histograma().atualizar(bloco))
+
+    assert total.contagens.sum() == len(valores)
+    esperado, _ = np.histogram(valores, bins=total.bordas())
+    assert np.array_equal(total.contagens, esperado)
+
+def test_histograma_mescla_igual_a_atualizacao_direta():
+    valores = np.arange(1000, dtype='float64')
+    direto = Histograma().atualizar(valores)
+    mesclado = Histograma().atualizar(valores[:500]).mesclar(Histograma().atualizar(valores[500:]))
+    assert mesclado.largura == direto.largura
+    assert np.array_equal(mesclado.bordas(), direto.bordas())
+    assert np.array_equal(mesclado.contagens, direto.contagens)
+
+def test_kll_erro_de_rank_perto_de_1_por_cento():
+    rng = np.random.default_rng(2)
+    valores = rng.lognormal(3, 1.2, 200_000)
+    sketch = SketchQuantis(semente=0)
+    for i, bloco in enumerate(_blocos(valores, 8)):
+        sketch.mesclar(SketchQuantis(semente=i + 1).atualizar(bloco))
+
+    assert sketch.n == len(valores)
+    assert sketch.erro_rank < 0.015
+    ordenados = np.sort(valores)
+    qs = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+    for q, v in zip(qs, sketch.quantis(qs)):
+        rank = np.searchsorted(ordenados, v, side='right') / len(valores)
+        assert abs(rank - q) <= sketch.erro_rank, (q, rank)
+
+def test_kll_vazio_e_ignora_nan():
+    assert SketchQuantis().quantis((0.5, 0.9)) == [None, None]
+    sketch = SketchQuantis().atualizar([np.nan, 1.0, 2.0, 3.0])
+    assert sketch.n == 3
+    assert sketch.quantis((0.5,)) == [2.0]
+
+def test_hll_dentro_dos_limites():
+    a, b = SketchDistintos(), SketchDistintos()
+    a.atualizar(pd.Series(np.arange(0, 60_000)))
+    b.atualizar(pd.Series(np.arange(40_000, 100_000)))   # 20 mil em comum
+    estimativa = a.mesclar(b).estimativa()
+    assert abs(estimativa - 100_000) / 100_000 <= 3 * a.erro_relativo
+
+def test_hll_poucos_valores_e_tipos_misturados():
+    sketch = SketchDistintos()
+    sketch.atualizar(pd.Series([1, 2, 3, 3, None]))
+    sketch.atualizar(pd.Series([1.0, 2.0, 4.0]))   # 1 e 1.0 são o mesmo valor
+    sketch.atualizar(pd.Series(['a', 'b', 'a']))
+    assert sketch.estimativa() == 6
@@ -0,0 +1,56 @@
+import threading
+
+from analise.tarefas import Tarefa, TarefaCancelada
+
+
+def _esperar(tarefa):
+    tarefa._thread.join(timeout=5)
+    assert tarefa.concluida
+
+def test_resultado_e_progresso():
+    def soma(a, b, progresso, cancelado):
+        progresso('Somando', 0.5)
+        return a + b
+    tarefa = Tarefa(soma, 2, 3).iniciar()
+    _esperar(tarefa)
+    assert tarefa.resultado == 5 and tarefa.erro is None
+    assert [e[0] for e in tarefa.etapas] == ['Somando']
+
+def test_cancelamento_e_erro():
+    def cancelavel(progresso, cancelado):
+        while not cancelado():
+            pass
+        raise TarefaCancelada()
+    tarefa = Tarefa(cancelavel).iniciar()
+    tarefa.cancelar()
+    _esperar(tarefa)
+    assert tarefa.cancelada and tarefa.resultado is None
+
+    tarefa = Tarefa(lambda progresso, cancelado: 1 / 0).iniciar()
+    _esperar(tarefa)
+    assert isinstance(tarefa.erro, ZeroDivisionError)
+
+def test_descartar_libera_o_resultado_que_chega_depois():
+    liberar = threading.Event()
+    liberados = []
+    def ignora_cancelamento(progresso, cancelado):
+        liberar.wait(5)
+        return 'conexao'
+    tarefa = Tarefa(ignora_cancelamento).iniciar()
+    tarefa.descartar(liberados.append)
+    assert liberados == []
+    liberar.set()
+    _esperar(tarefa)
+    assert liberados == ['conexao']
+
+def test_descartar_tarefa_ja_concluida():
+    liberados = []
+    tarefa = Tarefa(lambda progresso, cancelado: 'conexao').iniciar()
+    _esperar(tarefa)
+    tarefa.descartar(liberados.append)
+    assert liberados == ['conexao']
+
+    cancelada = Tarefa(lambda progresso, cancelado: None).iniciar()
+    _esperar(cancelada)
+    cancelada.descartar(liberados.append)
+    assert liberados == ['conexao']